@@ -0,0 +1,152 @@
+"""Throughput/latency benchmarks of linodeClient against the in-process mock API.
+
+    python benchmarks/bench_client.py --latency 0.005 --instances 2000
+    python benchmarks/bench_client.py --json > baseline.json
+    python benchmarks/bench_client.py --baseline baseline.json --tolerance 0.2
+
+With `--baseline`, exits non-zero if any scenario's calls/sec dropped (or
+p95 latency grew) by more than the tolerance.
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from mylinode_api import linodeClient
+from mylinode_api.mock import MockLinodeAPI
+
+
+def percentile(sortedValues, p):
+    if not sortedValues:
+        return 0.0
+    k = (len(sortedValues) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(sortedValues) - 1)
+    return sortedValues[low] + (sortedValues[high] - sortedValues[low]) * (k - low)
+
+
+def measure(name, calls, operation, counter=None):
+    """Run `operation(i)` for every i in range(calls) and collect the metrics.
+
+    The calls are timed in a first pass without tracemalloc, whose
+    bookkeeping slows Python down several times; a second, traced pass
+    measures the allocations.
+
+    Args:
+        counter: Callable returning a running count (for example of API
+        requests); its increase over the timed pass is reported (optional).
+    """
+    latencies = []
+    before = counter() if counter is not None else None
+    start = time.perf_counter()
+    for i in range(calls):
+        t = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    after = counter() if counter is not None else None
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    startBlocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    for i in range(calls):
+        operation(i)
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retainedBlocks = sum(stat.count for stat in snapshot.statistics("filename")) - startBlocks
+    latencies.sort()
+    result = {
+        "scenario": name,
+        "calls": calls,
+        "seconds": elapsed,
+        "calls_per_sec": calls / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_kib": peak / 1024,
+        "retained_blocks": retainedBlocks,
+    }
+    if counter is not None:
+        result["api_requests"] = after - before
+    return result
+
+
+def run(args):
+    api = MockLinodeAPI(latency=args.latency, jitter=args.jitter, seed=1)
+    ids = api.addInstances(args.instances)
+    client = linodeClient("bench-token", poolSize=args.workers, catalogTTL=3600)
+    client.transport.rateLimiter = None
+    api.mount(client)
+    results = []
+    results.append(measure("findLinode", args.calls, lambda i: client.findLinode(ids[i % len(ids)])))
+    results.append(measure("findLinode asModel", args.calls, lambda i: client.findLinode(ids[i % len(ids)], asModel=True)))
+    results.append(measure("getLinodes (list walk)", max(1, args.calls // 50), lambda i: client.getLinodes()))
+    results.append(measure("iterLinodes pageSize=100", max(1, args.calls // 50), lambda i: sum(1 for _ in client.iterLinodes(pageSize=100))))
+    bulkIDs = ids[:args.bulk]
+    bulk = measure("bulk rebootLinode", 1, lambda i: list(client.bulk("rebootLinode", bulkIDs, maxInFlight=args.workers)))
+    bulk["calls"] = len(bulkIDs)
+    bulk["calls_per_sec"] = len(bulkIDs) / bulk["seconds"] if bulk["seconds"] else 0.0
+    results.append(bulk)
+    client.catalog.invalidate()
+    results.append(measure("createLinode", args.creates, lambda i: client.createLinode("us-east", "g6-nanode-1", "linode/debian12", "bench-pass-1234"),
+                           counter=lambda: api.requests))
+    client.close()
+    return results
+
+
+def report(results):
+    header = f"{'scenario':<28}{'calls':>7}{'calls/s':>11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak KiB':>10}{'blocks':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        line = f"{r['scenario']:<28}{r['calls']:>7}{r['calls_per_sec']:>11.1f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['peak_kib']:>10.1f}{r['retained_blocks']:>8}"
+        if r.get("api_requests") is not None:
+            line += f"  ({r['api_requests']} API requests)"
+        print(line)
+
+
+def compare(results, baselinePath, tolerance):
+    with open(baselinePath) as f:
+        baseline = {r["scenario"]: r for r in json.load(f)}
+    regressions = []
+    for r in results:
+        old = baseline.get(r["scenario"])
+        if old is None:
+            continue
+        if r["calls_per_sec"] < old["calls_per_sec"] * (1 - tolerance):
+            regressions.append(f"{r['scenario']}: {old['calls_per_sec']:.1f} -> {r['calls_per_sec']:.1f} calls/s")
+        if r["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{r['scenario']}: p95 {old['p95_ms']:.2f} -> {r['p95_ms']:.2f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.0, help="injected server latency per request (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random server latency (seconds)")
+    parser.add_argument("--instances", type=int, default=1000, help="linodes in the fake account")
+    parser.add_argument("--calls", type=int, default=500, help="calls of the single-call scenarios")
+    parser.add_argument("--bulk", type=int, default=500, help="linodes of the bulk scenario")
+    parser.add_argument("--creates", type=int, default=50, help="calls of the createLinode scenario")
+    parser.add_argument("--workers", type=int, default=16, help="bulk workers and connection pool size")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args(argv)
+    results = run(args)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        report(results)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
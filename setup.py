@@ -13,13 +13,20 @@ setup(
     packages=find_packages(where='src'),
     package_dir={'': 'src'},
     install_requires=['requests'],
-    python_requires='>=3.6',  # Specify the minimum Python version
+    extras_require={
+        'async': ['aiohttp'],
+        'fast': ['orjson'],
+        'stats': ['numpy'],
+    },
+    entry_points={
+        'console_scripts': ['mylinode=mylinode_api.cli:main'],
+    },
+    python_requires='>=3.7',  # Specify the minimum Python version
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
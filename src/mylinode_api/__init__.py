@@ -1,27 +1,136 @@
-import requests
+from .transport import Transport, publicTransport
+from .catalog import Catalog
+from .pagination import iterPages, iterRecords, collect
+from .bulk import bulk, BulkResult
+from .response import handleResponse
+from .models import Instance, Disk, Config, IPAddress, Backup, Image
+from .metrics import Metrics, endpointTemplate
+from .readcache import ReadCache, SingleFlight
+from .query import Query, Field, F, And, Or, Where
+from .streaming import JSONStream, streamResponse, iterStreamedRecords
+from .resilience import Hedger, CircuitBreaker
+from .graph import InstanceGraph, iterInstanceGraphs, GRAPH_PARTS
+from .reconcile import Plan, Step, planReconcile, reconcile, diffFields
+from .provision import provision, ProvisionResult, idempotencyLabel
+from .errors import (
+    LinodeError,
+    BadRequestError,
+    UnauthorizedError,
+    ForbiddenError,
+    NotFoundError,
+    RateLimitError,
+    ServerError,
+    CircuitOpenError,
+)
+import importlib
 import sys
 
-def getRegions():
+# Imported on first access, so `import mylinode_api` does not pay for asyncio,
+# threads or the optional extras of features that are never used.
+_LAZY = {
+    "AsyncLinodeClient": ".aio",
+    "Inventory": ".inventory",
+    "StatsFrame": ".stats",
+    "FleetStats": ".stats",
+    "Waiter": ".waiter",
+    "uploadImageData": ".upload",
+    "UploadSource": ".upload",
+}
+
+__all__ = [
+    "linodeClient",
+    "getRegions",
+    "getTypes",
+    "getImages",
+    "keyByValue",
+    "handleRequestError",
+    "Transport",
+    "publicTransport",
+    "Catalog",
+    "iterPages",
+    "iterRecords",
+    "collect",
+    "bulk",
+    "BulkResult",
+    "handleResponse",
+    "Instance",
+    "Disk",
+    "Config",
+    "IPAddress",
+    "Backup",
+    "Image",
+    "Metrics",
+    "endpointTemplate",
+    "ReadCache",
+    "SingleFlight",
+    "Query",
+    "Field",
+    "F",
+    "And",
+    "Or",
+    "Where",
+    "JSONStream",
+    "streamResponse",
+    "iterStreamedRecords",
+    "Hedger",
+    "CircuitBreaker",
+    "InstanceGraph",
+    "iterInstanceGraphs",
+    "GRAPH_PARTS",
+    "Plan",
+    "Step",
+    "planReconcile",
+    "reconcile",
+    "diffFields",
+    "provision",
+    "ProvisionResult",
+    "idempotencyLabel",
+    "LinodeError",
+    "BadRequestError",
+    "UnauthorizedError",
+    "ForbiddenError",
+    "NotFoundError",
+    "RateLimitError",
+    "ServerError",
+    "CircuitOpenError",
+    *_LAZY,
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+def getRegions(transport=None):
     regions = []
-    regionRequest = requests.get("https://api.linode.com/v4/regions").json()
-    for i in regionRequest['data']:
+    transport = transport or publicTransport()
+    for i in iterRecords(transport, "/regions", pageSize=500):
         regions.append(i['id'])
     return regions
 
-def getTypes():
+def getTypes(transport=None):
     types = []
-    typesRequest = requests.get("https://api.linode.com/v4/linode/types").json()
-    for i in typesRequest['data']:
+    transport = transport or publicTransport()
+    for i in iterRecords(transport, "/linode/types", pageSize=500):
         types.append(i['id'])
     return types
 
-def getImages(private=False, token=None):
+def getImages(private=False, token=None, transport=None):
     images = []
+    transport = transport or publicTransport()
     if private and token:
-        imagesRequest = requests.get("https://api.linode.com/v4/images", headers={"Authorization": f"Bearer {token}"}).json()
+        imagesRequest = iterRecords(transport, "/images", pageSize=500, headers={"Authorization": f"Bearer {token}"})
     elif not private:
-        imagesRequest = requests.get("https://api.linode.com/v4/images").json()
-    for i in imagesRequest['data']:
+        imagesRequest = iterRecords(transport, "/images", pageSize=500)
+    for i in imagesRequest:
         images.append(i['id'])
     return images
 
@@ -32,38 +141,153 @@ def keyByValue(dictionary: dict, value: any):
     return key_list[ind]
 
 def handleRequestError(response):
-    if 'errors' in response.json():
-            for i in response.json()['errors']:
-                raise ValueError(str(i['reason']))
-    else:
-        if response.json() == {}:
-            return True
-        else:
-            return response.json()
+    """Decode a response once and raise a typed error if it failed.
+
+    Args:
+        response: The `requests.Response`.
+
+    Raises:
+        A `LinodeError` subclass (a `ValueError`) with the status, request ID and every error reason.
+
+    Returns:
+        The response json (an empty dictionary for action endpoints).
+    """
+    return handleResponse(response)
 
 class linodeClient:
-    def __init__(self, TOKEN) -> None:
+    def __init__(self, TOKEN, transport=None, poolSize=10, baseURL=None, catalogTTL=3600, catalogSnapshot=None, metrics=None, coalesce=False, readCache=None, hedgeAfter=None, circuitBreaker=None, hedgeWorkers=16) -> None:
         """Linode Client
 
         Args:
             TOKEN: Specify token from cloud manager.
+            transport: A `Transport` to send requests through (optional, one is created from the token).
+            poolSize: Number of keep-alive connections kept to the API host.
+            baseURL: Override the API base URL (optional).
+            catalogTTL: Seconds the region/type/image catalogs are cached for.
+            catalogSnapshot: Path of an on-disk catalog snapshot (optional).
+            metrics: A `Metrics` (or True for a new one) recording every request per endpoint (optional).
+            coalesce: Let concurrent identical GETs (across threads) share one in-flight request.
+            readCache: A `ReadCache` (or a TTL in seconds) caching GET responses; writes invalidate it (optional).
+            hedgeAfter: A `Hedger` (or a delay in seconds) sending a duplicate of GETs slower than that (optional).
+            circuitBreaker: A `CircuitBreaker` (or True for a default one) failing GETs fast,
+            or answering them with their last good response, while an endpoint is degraded (optional).
+            hedgeWorkers: Threads sending the hedged duplicates when `hedgeAfter` is a delay.
         """
         self.token = TOKEN
         self.authHeader = {"Authorization": f"Bearer {self.token}"}
+        if transport is None:
+            if baseURL:
+                transport = Transport(TOKEN, baseURL=baseURL, poolSize=poolSize)
+            else:
+                transport = Transport(TOKEN, poolSize=poolSize)
+        self.transport = transport
+        if metrics is True:
+            metrics = Metrics()
+        if metrics is not None:
+            self.transport.metrics = metrics
+        if coalesce and self.transport.singleFlight is None:
+            self.transport.singleFlight = SingleFlight()
+        if readCache is not None and readCache is not False:
+            self.transport.readCache = readCache if isinstance(readCache, ReadCache) else ReadCache(ttl=readCache)
+        if hedgeAfter is not None and hedgeAfter is not False:
+            self.transport.hedger = hedgeAfter if isinstance(hedgeAfter, Hedger) else Hedger(after=hedgeAfter, maxWorkers=hedgeWorkers)
+        if circuitBreaker is True:
+            circuitBreaker = CircuitBreaker()
+        if circuitBreaker:
+            self.transport.breaker = circuitBreaker
+        self.catalog = Catalog(self.transport, ttl=catalogTTL, snapshotPath=catalogSnapshot)
+        self._waiter = None
+
+    @property
+    def metrics(self):
+        """The `Metrics` of the transport (None when disabled)."""
+        return self.transport.metrics
+
+    def resilience(self):
+        """Get the hedging and circuit breaker counters.
+
+        Returns:
+            A dictionary with `hedging` and `circuitBreaker` counters (None when disabled).
+        """
+        hedger, breaker = self.transport.hedger, self.transport.breaker
+        return {
+            "hedging": hedger.snapshot() if hedger is not None else None,
+            "circuitBreaker": breaker.snapshot() if breaker is not None else None,
+        }
+
+    @property
+    def waiter(self):
+        """Shared `Waiter` polling every pending boot, create, resize and restore at once."""
+        if self._waiter is None:
+            from .waiter import Waiter
+            self._waiter = Waiter(self)
+        return self._waiter
+
+    def close(self):
+        """Close the pooled connections of the client."""
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
         
+    def bulk(self, operation, linodeIDs, maxInFlight=8, batchSize=None, haltOnError=False, **kwargs):
+        """Run a client method over many linodes concurrently.
+
+        Size the transport pool (`poolSize`) to at least `maxInFlight` so every
+        worker keeps its own keep-alive connection.
+
+        Args:
+            operation: Method name (for example `"rebootLinode"`) or a callable taking a linode ID.
+            linodeIDs: Iterable of linode IDs.
+            maxInFlight: Maximum number of concurrent calls.
+            batchSize: Process linodes in batches of this size for rolling changes (optional).
+            haltOnError: In batch mode, stop before the next batch if any call failed.
+            kwargs: Extra keyword arguments of every call.
+
+        Yields:
+            A `BulkResult` per linode as each call finishes.
+        """
+        if isinstance(operation, str):
+            operation = getattr(self, operation)
+        return bulk(operation, linodeIDs, maxInFlight, batchSize, haltOnError, kwargs=kwargs)
+
     # Linode methods:
-    def getLinodes(self):
+    def getLinodes(self, asModel=False, keepRaw=False, filter=None, stream=False):
         """Get list of linodes if you have `read` permissions.
 
+        Args:
+            asModel: Return `Instance` objects instead of IDs.
+            keepRaw: Keep the json of every `Instance` (only with `asModel`).
+            filter: A `Query`, filter expression or `X-Filter` dictionary (optional).
+            stream: Parse the pages as they arrive instead of buffering them whole.
+
         Returns:
-            Returns a list of your linodes.
+            Returns a list of your linodes' IDs (or `Instance` objects).
         """
         linodesList = []
-        linodesListRequest = requests.get("https://api.linode.com/v4/linode/instances", headers=self.authHeader).json()
-        
-        for i in linodesListRequest['data']:
-            linodesList.append(i['id'])
+        for i in self.iterLinodes(pageSize=500, filter=filter, stream=stream):
+            linodesList.append(Instance(i, keepRaw) if asModel else i['id'])
         return linodesList
+
+    def iterLinodes(self, pageSize=100, prefetch=True, filter=None, stream=False):
+        """Iterate over every linode page by page if you have `read` permissions.
+
+        Args:
+            pageSize: Linodes fetched per page (25 to 500).
+            prefetch: Fetch the next page while the current one is consumed.
+            filter: A `Query`, filter expression or `X-Filter` dictionary (optional).
+            stream: Parse every page as it arrives, keeping about one linode in
+            memory instead of a whole page (pages are then not prefetched).
+
+        Yields:
+            The json of every linode.
+        """
+        if stream:
+            return iterStreamedRecords(self.transport, "/linode/instances", pageSize, query=filter)
+        return iterRecords(self.transport, "/linode/instances", pageSize, prefetch, handler=handleRequestError, query=filter)
     
     def createLinode(self, region:str, type:str, image:str, root_pass:str, **kwargs):
         """Create a new linode server if you have `write` permissions.
@@ -80,12 +304,7 @@ class linodeClient:
         Returns:
             Returns the json response.
         """
-        if region not in getRegions():
-            raise ValueError("Region not found or not available.")
-        if type not in getTypes():
-            raise ValueError("Type not found or not available.")
-        if image not in getImages(True, self.token):
-            raise ValueError("Image not found or not available.")
+        self.validateCatalog(region, type, image)
         data = {
             "image": image,
             "type": type,
@@ -95,9 +314,52 @@ class linodeClient:
         for i, (k, v) in enumerate(kwargs.items()):
             if v:
                 data[k] = v
-        response = requests.post("https://api.linode.com/v4/linode/instances", json=data, headers=self.authHeader)
+        response = self.transport.post("/linode/instances", json=data)
         return handleRequestError(response)
-    
+
+    def provisionLinodes(self, specs, maxInFlight=8, retries=2, prefix="node"):
+        """Create many linodes concurrently, safe to retry if `write` permissions.
+
+        The catalog is validated once for the whole batch and every node gets
+        a deterministic label, so running the same batch again (or a retry
+        after a timeout) returns the existing nodes instead of duplicating them.
+
+        Args:
+            specs: List of create requests (dictionaries with `region`, `type`,
+            `image`, `root_pass` and any other create field).
+            maxInFlight: Maximum number of concurrent creates.
+            retries: Retries of a create that failed without creating the node.
+            prefix: Prefix of the derived labels of specs without a `label`.
+
+        Raises:
+            Will raise errors if a region, type or image is not found.
+
+        Returns:
+            A `ProvisionResult` per spec, in spec order.
+        """
+        return provision(self, specs, maxInFlight, retries, prefix)
+
+    def validateCatalog(self, region=None, type=None, image=None):
+        """Check region, type and image against the cached catalogs.
+
+        A miss refreshes that catalog once before failing, so a stale cache
+        never rejects a newly added region, type or private image.
+
+        Args:
+            region: Region to check (optional).
+            type: Server plan to check (optional).
+            image: Image to check (optional).
+
+        Raises:
+            Will raise errors if region, type or/and image is not found.
+        """
+        for kind, value, name in (("regions", region, "Region"), ("types", type, "Type"), ("images", image, "Image")):
+            if value is None or value in self.catalog.get(kind):
+                continue
+            self.catalog.invalidate(kind)
+            if value not in self.catalog.get(kind):
+                raise ValueError(f"{name} not found or not available.")
+
     def deleteLinode(self, linodeID:int):
         """Delete Linode if you have `read_write` permissions.
 
@@ -105,22 +367,25 @@ class linodeClient:
             linodeID: The ID of the linode that will be removed.
 
         Returns:
-            true (boolean) if success.
+            An empty dictionary if success.
         """
-        response = requests.delete(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}", headers=self.authHeader)
+        response = self.transport.delete(f"/linode/instances/{str(linodeID)}")
         return handleRequestError(response)
     
-    def findLinode(self, linodeID:int):
+    def findLinode(self, linodeID:int, asModel=False, keepRaw=False):
         """View Linode if you have `read` permissions.
 
         Args:
             linodeID: The LinodeID.
+            asModel: Return an `Instance` object instead of a dictionary.
+            keepRaw: Keep the json of the `Instance` (only with `asModel`).
 
         Returns:
-            Returns a dictionary of the found Linode.
+            Returns a dictionary (or `Instance`) of the found Linode.
         """
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}", headers=self.authHeader)
-        return handleRequestError(response)
+        response = self.transport.get(f"/linode/instances/{str(linodeID)}")
+        linode = handleRequestError(response)
+        return Instance(linode, keepRaw) if asModel else linode
         
     def updateLinode(self, linodeID:int, **kwargs):
         """Update Linode if you have `read_write` permissions.
@@ -135,7 +400,7 @@ class linodeClient:
             Returns the response of the linode with the updated changes.
         """
         data = kwargs
-        response = requests.put(f"https://api.linode.com/v4/linode/instances/{linodeID}", json=data, headers=self.authHeader)
+        response = self.transport.put(f"/linode/instances/{linodeID}", json=data)
         return handleRequestError(response)
         
     def bootLinode(self, linodeID:int):
@@ -145,9 +410,9 @@ class linodeClient:
             linodeID: The linodeID that will be booted.
 
         Returns:
-            true (boolean) if success.
+            An empty dictionary if success.
         """
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/boot", headers=self.authHeader)
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/boot")
         return handleRequestError(response)
         
     def rebootLinode(self, linodeID:int):
@@ -157,9 +422,9 @@ class linodeClient:
             linodeID: The linodeID that will be rebooted.
 
         Returns:
-            true (boolean) if success.
+            An empty dictionary if success.
         """
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/reboot", headers=self.authHeader)
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/reboot")
         return handleRequestError(response)
         
     def resetPassLinode(self, linodeID:int, password:str):
@@ -170,9 +435,9 @@ class linodeClient:
             password: The new password of the linode.
 
         Returns:
-            true (boolean) if success.
+            An empty dictionary if success.
         """
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/password", headers=self.authHeader, json={"root_pass": password})
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/password", json={"root_pass": password})
         return handleRequestError(response)
         
     def rebuildLinode(self, linodeID:int, image:str, root_pass:str, **kwargs):
@@ -190,7 +455,7 @@ class linodeClient:
         for i, (k, v) in enumerate(kwargs.items()):
             if v:
                 data[k] = v
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/rebuild", headers=self.authHeader, json=data)
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/rebuild", json=data)
         return handleRequestError(response)
         
     def shutDownLinode(self, linodeID:int):
@@ -200,9 +465,9 @@ class linodeClient:
             linodeID (int): _description_
 
         Returns:
-            true (boolean) if success.
+            An empty dictionary if success.
         """
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/shutdown")
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/shutdown")
         return handleRequestError(response)
         
     def statisticsLinode(self, linodeID:int):
@@ -214,9 +479,34 @@ class linodeClient:
         Returns:
             Returns a json with the statistics.
         """
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/stats", headers=self.authHeader)
+        response = self.transport.get(f"/linode/instances/{str(linodeID)}/stats")
         return handleRequestError(response)
+
+    def streamStatistics(self, linodeID:int):
+        """Stream the statistics of the linode point by point if you have `read` permissions.
+
+        Args:
+            linodeID: The linodeID.
+
+        Yields:
+            `(metric, [timestamp, value])` tuples, for example `("netv4.in", [1700000000000, 12.5])`.
+        """
+        response = self.transport.get(f"/linode/instances/{str(linodeID)}/stats", stream=True)
+        return streamResponse(response, series=True)[1]
         
+    def fleetStatistics(self, linodeIDs, maxInFlight=16):
+        """Gets the statistics of many linodes as NumPy arrays (requires numpy).
+
+        Args:
+            linodeIDs: Iterable of linode IDs.
+            maxInFlight: Maximum number of concurrent requests.
+
+        Returns:
+            A `FleetStats` with per-instance, fleet-wide and top-N aggregations.
+        """
+        from .stats import FleetStats
+        return FleetStats.fetch(self, linodeIDs, maxInFlight)
+
     def cloneLinode(self, linodeID:int, **kwargs):
         """Clones the linode into a new linode if you have `read_write` permissions.
 
@@ -227,7 +517,7 @@ class linodeClient:
             Returns a json of the new Linode.
         """
         data = kwargs
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/clone", headers=self.authHeader, json=data)
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/clone", json=data)
         return handleRequestError(response)
         
     def volumeListLinode(self, linodeID:int):
@@ -239,9 +529,65 @@ class linodeClient:
         Returns:
             _type_: _description_
         """
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/volumes", headers=self.authHeader)
+        response = self.transport.get(f"/linode/instances/{str(linodeID)}/volumes")
         return handleRequestError(response)
         
+    def fetchInstanceGraph(self, linodeIDs, include=tuple(GRAPH_PARTS), maxInFlight=16, asModel=False):
+        """Fetch linodes with their disks, configs, volumes, firewalls, backups and IPs at once.
+
+        Every sub-request of every linode runs on one shared pool of
+        `maxInFlight` workers instead of one round trip after another.
+
+        Args:
+            linodeIDs: Iterable of linode IDs.
+            include: Parts to fetch besides the linode itself (all by default).
+            maxInFlight: Maximum number of concurrent requests.
+            asModel: Assemble `Instance`, `Disk` and `Config` objects instead of dictionaries.
+
+        Returns:
+            A dictionary of linode ID to its `InstanceGraph`, in the order of `linodeIDs`.
+        """
+        linodeIDs = list(dict.fromkeys(linodeIDs))
+        graphs = {graph.linodeID: graph for graph in iterInstanceGraphs(self, linodeIDs, include, maxInFlight, asModel)}
+        return {linodeID: graphs[linodeID] for linodeID in linodeIDs}
+
+    def iterInstanceGraphs(self, linodeIDs, include=tuple(GRAPH_PARTS), maxInFlight=16, asModel=False):
+        """Like `fetchInstanceGraph`, but yields every `InstanceGraph` as soon as it is complete."""
+        return iterInstanceGraphs(self, linodeIDs, include, maxInFlight, asModel)
+
+    def planReconcile(self, desired:dict, current=None):
+        """Diff a desired state against the linodes and plan the minimal mutations.
+
+        Args:
+            desired: Dictionary of linode ID (or label) to its spec: instance
+            fields such as `label` and `tags`, plus `configs` and `disks`
+            dictionaries of config/disk ID (or label) to their fields.
+            current: Dictionary of linode ID to `InstanceGraph` to diff against (optional, fetched if missing).
+
+        Returns:
+            The `Plan` (empty if everything already matches).
+        """
+        return planReconcile(self, desired, current)
+
+    def reconcile(self, desired:dict, dryRun=False, current=None, maxInFlight=8, timeout=600):
+        """Bring linodes to a desired state if you have `read_write` permissions.
+
+        Only changed fields are sent; disk resizes are ordered shutdown,
+        resize, boot, and independent steps run in parallel. Applying an
+        unchanged state costs reads only.
+
+        Args:
+            desired: The desired state (see `planReconcile`).
+            dryRun: Only print the plan.
+            current: Dictionary of linode ID to `InstanceGraph` to diff against (optional).
+            maxInFlight: Maximum number of concurrent steps.
+            timeout: Seconds to wait for a shutdown, resize or boot.
+
+        Returns:
+            The `Plan`, with the status of every step if it was executed.
+        """
+        return reconcile(self, desired, dryRun, current, maxInFlight, timeout)
+
     def upgradeLinode(self, linodeID:int, **kwargs):
         """Upgrade a linode if you have `read_write` permissions
 
@@ -251,7 +597,7 @@ class linodeClient:
         Returns:
             _type_: _description_
         """
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{linodeID}/mutate", headers=self.authHeader)
+        response = self.transport.post(f"/linode/instances/{linodeID}/mutate", json=kwargs)
         return handleRequestError(response)
         
     # Backup methods:
@@ -265,8 +611,27 @@ class linodeClient:
         Returns:
             Returns the response json.
         """
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/backups", headers=self.authHeader)
+        response = self.transport.get(f"/linode/instances/{str(linodeID)}/backups")
         return handleRequestError(response)
+
+    def iterBackups(self, linodeID:int):
+        """Iterate over the automatic backups and the snapshots of a linode.
+
+        The backups endpoint is not paginated; this flattens its `automatic`
+        list and `snapshot` slots into one stream.
+
+        Args:
+            linodeID: The linodeID.
+
+        Yields:
+            The json of every backup.
+        """
+        backups = self.getBackups(linodeID)
+        yield from backups.get('automatic', [])
+        snapshot = backups.get('snapshot') or {}
+        for key in ('current', 'in_progress'):
+            if snapshot.get(key):
+                yield snapshot[key]
         
     def cancelBackups(self, linodeID:int):
         """Cancel backups for a linode if you have `read_write` permissions.
@@ -275,9 +640,9 @@ class linodeClient:
             linodeID: The ID of the linode that the backups will be canceled in.
 
         Returns:
-            true (boolean) if success.
+            An empty dictionary if success.
         """
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/backups/cancel", headers=self.authHeader)
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/backups/cancel")
         return handleRequestError(response)
         
     def enableBackups(self, linodeID:int):
@@ -287,9 +652,9 @@ class linodeClient:
             linodeID (int): _description_
 
         Returns:
-            true (boolean) if success.
+            An empty dictionary if success.
         """
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/backups/enable", headers=self.authHeader)
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/backups/enable")
         return handleRequestError(response)
         
     def findBackup(self, linodeID:int, backupID:int):
@@ -302,7 +667,7 @@ class linodeClient:
         Returns:
             The response json.
         """
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/backups/{str(backupID)}", headers=self.authHeader)
+        response = self.transport.get(f"/linode/instances/{str(linodeID)}/backups/{str(backupID)}")
         return handleRequestError(response)
         
     def restoreBackup(self, linodeID:int, backupID:int):
@@ -313,9 +678,9 @@ class linodeClient:
             backupID: THe ID of the backup.
 
         Returns:
-            true (boolean) if success.
+            An empty dictionary if success.
         """
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/backups/{str(backupID)}/restore")
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/backups/{str(backupID)}/restore")
         return handleRequestError(response)
         
     # Snapshot methods:
@@ -324,17 +689,31 @@ class linodeClient:
         
     # Configuration methods:
         
-    def getConfigs(self, linodeID:int):
+    def getConfigs(self, linodeID:int, filter=None):
         """Get configurations of a linode.
 
         Args:
             linodeID: The ID of the linode.
+            filter: A `Query`, filter expression or `X-Filter` dictionary (optional).
 
         Returns:
-            Returns response json.
+            Returns response json with the configurations of every page.
         """
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/configs", headers=self.authHeader)
-        return handleRequestError(response)
+        return collect(self.transport, f"/linode/instances/{str(linodeID)}/configs", handler=handleRequestError, query=filter)
+
+    def iterConfigs(self, linodeID:int, pageSize=100, prefetch=True, filter=None):
+        """Iterate over the configurations of a linode page by page.
+
+        Args:
+            linodeID: The ID of the linode.
+            pageSize: Configurations fetched per page (25 to 500).
+            prefetch: Fetch the next page while the current one is consumed.
+            filter: A `Query`, filter expression or `X-Filter` dictionary (optional).
+
+        Yields:
+            The json of every configuration.
+        """
+        return iterRecords(self.transport, f"/linode/instances/{str(linodeID)}/configs", pageSize, prefetch, handler=handleRequestError, query=filter)
         
     def createConfig(self, linodeID:int, devices:dict, label:str, **kwargs):
         """Create a configuration for a linode.
@@ -351,7 +730,7 @@ class linodeClient:
         for i, (k, v) in enumerate(kwargs.items()):
             if v:
                 data[k] = v
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/configs", headers=self.authHeader, json=data)
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/configs", json=data)
         return handleRequestError(response)
         
     def deleteConfig(self, linodeID:int, configID:int):
@@ -362,9 +741,9 @@ class linodeClient:
             configID: The ID of the configuration.
 
         Returns:
-            true (boolean) if success.
+            An empty dictionary if success.
         """
-        response = requests.delete(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/configs/{str(configID)}")
+        response = self.transport.delete(f"/linode/instances/{str(linodeID)}/configs/{str(configID)}")
         return handleRequestError(response)
         
     def findConfig(self, linodeID:int, configID:int):
@@ -377,7 +756,7 @@ class linodeClient:
         Returns:
             Returns response json.
         """
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/configs/{str(configID)}", headers=self.authHeader)
+        response = self.transport.get(f"/linode/instances/{str(linodeID)}/configs/{str(configID)}")
         return handleRequestError(response)
         
     def updateConfig(self, linodeID:int, configID:int, **kwargs):
@@ -391,22 +770,36 @@ class linodeClient:
             Returns response json.
         """
         data = kwargs
-        response = requests.put(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/configs/{str(configID)}", headers=self.authHeader, json=data)
+        response = self.transport.put(f"/linode/instances/{str(linodeID)}/configs/{str(configID)}", json=data)
         return handleRequestError(response)
         
     # Disk methods:
     
-    def getDisks(self, linodeID:int):
+    def getDisks(self, linodeID:int, filter=None):
         """Get all the disks that are in a linode.
 
         Args:
             linodeID: The ID of the linode the disk is in.
+            filter: A `Query`, filter expression or `X-Filter` dictionary (optional).
 
         Returns:
-            Returns response json.
+            Returns response json with the disks of every page.
         """
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/disks", headers=self.authHeader)
-        return handleRequestError(response)
+        return collect(self.transport, f"/linode/instances/{str(linodeID)}/disks", handler=handleRequestError, query=filter)
+
+    def iterDisks(self, linodeID:int, pageSize=100, prefetch=True, filter=None):
+        """Iterate over the disks of a linode page by page.
+
+        Args:
+            linodeID: The ID of the linode the disks are in.
+            pageSize: Disks fetched per page (25 to 500).
+            prefetch: Fetch the next page while the current one is consumed.
+            filter: A `Query`, filter expression or `X-Filter` dictionary (optional).
+
+        Yields:
+            The json of every disk.
+        """
+        return iterRecords(self.transport, f"/linode/instances/{str(linodeID)}/disks", pageSize, prefetch, handler=handleRequestError, query=filter)
         
     def createDisk(self, linodeID:int, size:int, **kwargs):
         """Create disk for linode
@@ -422,7 +815,7 @@ class linodeClient:
         for i, (k, v) in enumerate(kwargs.items()):
             if v:
                 data[k] = v
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/disks", self.authHeader, json=data)
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/disks", json=data)
         return handleRequestError(response)
         
     def deleteDisk(self, linodeID:int, diskID:int):
@@ -433,9 +826,9 @@ class linodeClient:
             diskID: The ID of the disk that will be deleted.
 
         Returns:
-            true if success.
+            An empty dictionary if success.
         """
-        response = requests.delete(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/disks/{str(diskID)}", headers=self.authHeader)
+        response = self.transport.delete(f"/linode/instances/{str(linodeID)}/disks/{str(diskID)}")
         return handleRequestError(response)
         
     def findDisk(self, linodeID:int, diskID:int):
@@ -448,55 +841,71 @@ class linodeClient:
         Returns:
             Returns json info about the disk.
         """
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/disks/{str(diskID)}", headers=self.authHeader)
+        response = self.transport.get(f"/linode/instances/{str(linodeID)}/disks/{str(diskID)}")
         return handleRequestError(response)
     
     def updateDisk(self, linodeID:int, diskID:int, **kwargs):
         data = kwargs
-        response = requests.put(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/disks/{str(diskID)}", headers=self.authHeader, json=data)
+        response = self.transport.put(f"/linode/instances/{str(linodeID)}/disks/{str(diskID)}", json=data)
         return handleRequestError(response)
         
     def cloneDisk(self, linodeID:int, diskID:int):
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/disks/{str(diskID)}/clone", headers=self.authHeader)
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/disks/{str(diskID)}/clone")
         return handleRequestError(response)
         
     def resetPassDisk(self, linodeID:int, diskID:int, password:str):
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/disks/{str(diskID)}/password", headers=self.authHeader, json={"password": str(password)})
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/disks/{str(diskID)}/password", json={"password": str(password)})
         return handleRequestError(response)
         
     def resizeDisk(self, linodeID:int, diskID:int, size:int):
         if not size>=1:
             raise ValueError("Size has to be bigger or equals to one.")
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/disks/{str(diskID)}/resize", headers=self.authHeader, json={"size": size})
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/disks/{str(diskID)}/resize", json={"size": size})
         return handleRequestError(response)
         
     # IP Methods:
     
     def allocateIPv4(self, linodeID:int, public:bool, iptype="ipv4"):
         data = {"public": public, "type": iptype}
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/ips", headers=self.authHeader, json=data)
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/ips", json=data)
         return handleRequestError(response)
         
     def deleteIPv4(self, linodeID:int, address:str):
-        response = requests.delete(f"https://api.linode.com/v4/linode/instances/{str(linodeClient())}/ips/{str(address)}")
+        response = self.transport.delete(f"/linode/instances/{str(linodeID)}/ips/{str(address)}")
         return handleRequestError(response)
         
+    def getIPs(self, linodeID:int):
+        """Get the IPv4 and IPv6 addresses of a linode if you have `read` permissions.
+
+        Args:
+            linodeID: The ID of the linode.
+
+        Returns:
+            The response json, with `ipv4` (`public`, `private`, `shared`, `reserved`) and `ipv6`.
+        """
+        response = self.transport.get(f"/linode/instances/{str(linodeID)}/ips")
+        return handleRequestError(response)
+
     def findIP(self, linodeID:int, address:str):
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/ips/{str(address)}", headers=self.authHeader)
+        response = self.transport.get(f"/linode/instances/{str(linodeID)}/ips/{str(address)}")
         return handleRequestError(response)
         
     def RDNSUpdateIP(self, linodeID:int, address:str, rdns:str):
-        response = requests.put(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/ips/{address}", headers=self.authHeader, json={"rdns": rdns})
+        response = self.transport.put(f"/linode/instances/{str(linodeID)}/ips/{address}", json={"rdns": rdns})
         return handleRequestError(response)
         
     # Kernel Methods:
     
-    def getKernels(self):
-        response = requests.get("https://api.linode.com/v4/linode/kernels", headers=self.authHeader)
-        return handleRequestError(response)
+    def getKernels(self, filter=None):
+        return collect(self.transport, "/linode/kernels", handler=handleRequestError, query=filter)
+
+    def iterKernels(self, pageSize=100, prefetch=True, filter=None, stream=False):
+        if stream:
+            return iterStreamedRecords(self.transport, "/linode/kernels", pageSize, query=filter)
+        return iterRecords(self.transport, "/linode/kernels", pageSize, prefetch, handler=handleRequestError, query=filter)
     
     def findkernel(self, kernelID:int):
-        response = requests.get(f"https://api.linode.com/v4/linode/kernels/{str(kernelID)}", headers=self.authHeader)
+        response = self.transport.get(f"/linode/kernels/{str(kernelID)}")
         return handleRequestError(response)
     
     # Image Methods:
@@ -506,33 +915,85 @@ class linodeClient:
         for i, (k, v) in enumerate(kwargs.items()):
             if v:
                 data[k] = v
-        response = requests.post("https://api.linode.com/v4/images", headers=self.authHeader, json=data)
+        response = self.transport.post("/images", json=data)
+        self.catalog.invalidate("images")
         return handleRequestError(response)
     
-    def uploadImage(self, label:str, region:str, **kwargs):
+    def uploadImage(self, label:str, region:str, source=None, progress=None, compress=None, **kwargs):
+        """Create an image from a local disk image if you have `read_write` permissions.
+
+        Args:
+            label: The label of the image.
+            region: The region the image is uploaded to.
+            source: Path, bytes, binary file object or iterable of bytes to
+            stream to the returned `upload_to` URL (optional, without it only
+            the upload is created).
+            progress: Called with `(bytesRead, totalBytes)` while uploading (optional).
+            compress: Gzip the source on the fly (None detects already gzipped sources).
+
+        Returns:
+            Returns the response json with `image` and `upload_to`.
+        """
         data = {"label": label, "region": region}
         for i, (k, v) in enumerate(kwargs.items()):
             if v:
                 data[k] = v
-        response = requests.post("https://api.linode.com/v4/images/upload", headers=self.authHeader, json=data)
-        return handleRequestError(response)
+        response = self.transport.post("/images/upload", json=data)
+        self.catalog.invalidate("images")
+        upload = handleRequestError(response)
+        if source is not None:
+            self.uploadImageData(upload['upload_to'], source, progress, compress)
+        return upload
+
+    def uploadImageData(self, uploadTo:str, source, progress=None, compress=None, retries=3):
+        """Stream an image to an `upload_to` URL, for example to resume a failed upload.
+
+        Args:
+            uploadTo: The `upload_to` URL returned by `uploadImage`.
+            source: Path, bytes, binary file object or iterable of bytes.
+            progress: Called with `(bytesRead, totalBytes)` while uploading (optional).
+            compress: Gzip the source on the fly (None detects already gzipped sources).
+            retries: Retries of a failed upload (rewindable sources only).
+
+        Returns:
+            The number of source bytes uploaded.
+        """
+        from .upload import uploadImageData
+        return uploadImageData(self.transport.session, uploadTo, source, compress, progress=progress, retries=retries)
     
     def deleteImage(self, imageID:str):
-        response = requests.delete(f"https://api.linode.com/v4/images/{str(imageID)}", headers=self.authHeader)
+        response = self.transport.delete(f"/images/{str(imageID)}")
+        self.catalog.invalidate("images")
         return handleRequestError(response)
     
+    def iterImages(self, pageSize=100, prefetch=True, filter=None, stream=False):
+        """Iterate over every public and private image page by page.
+
+        Args:
+            pageSize: Images fetched per page (25 to 500).
+            prefetch: Fetch the next page while the current one is consumed.
+            filter: A `Query`, filter expression or `X-Filter` dictionary (optional).
+            stream: Parse every page as it arrives instead of buffering it whole.
+
+        Yields:
+            The json of every image.
+        """
+        if stream:
+            return iterStreamedRecords(self.transport, "/images", pageSize, query=filter)
+        return iterRecords(self.transport, "/images", pageSize, prefetch, handler=handleRequestError, query=filter)
+
     def findImage(self, imageID:str):
-        response = requests.get(f"https://api.linode.com/v4/images/{str(imageID)}", headers=self.authHeader)
+        response = self.transport.get(f"/images/{str(imageID)}")
         return handleRequestError(response)
     
     # Ohter Methods:
         
     def createSnapshot(self, linodeID:int, label:str):
-        response = requests.post(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/backups", headers=self.authHeader, json={"label": label})
+        response = self.transport.post(f"/linode/instances/{str(linodeID)}/backups", json={"label": label})
         return handleRequestError(response)
     
     def getFirewalls(self, linodeID:int):
-        response = requests.get(f"https://api.linode.com/v4/linode/instances/{str(linodeID)}/firewalls", headers=self.authHeader)
+        response = self.transport.get(f"/linode/instances/{str(linodeID)}/firewalls")
         return handleRequestError(response)
     
     #TODO: Add more methods
\ No newline at end of file
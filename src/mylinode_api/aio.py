@@ -0,0 +1,438 @@
+import asyncio
+import random
+import time
+
+from .catalog import CATALOG_PATHS
+from .errors import errorForStatus
+from .models import Instance
+from .pagination import MAX_PAGE_SIZE
+from .ratelimit import retryAfter
+from .response import decodeBody, handlePayload
+from .transport import BASE_URL, IDEMPOTENT_METHODS, RETRY_STATUSES
+
+
+def _importAiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("AsyncLinodeClient requires aiohttp: pip install mylinode_api[async]") from None
+    return aiohttp
+
+
+class AsyncLinodeClient:
+    def __init__(self, TOKEN, baseURL=BASE_URL, poolSize=100, concurrency=100, timeout=30, catalogTTL=3600, maxRetries=3, backoffBase=0.5, backoffCap=30) -> None:
+        """Asyncio Linode Client
+
+        Mirrors `linodeClient` on top of aiohttp. Every call shares one
+        connection pool and at most `concurrency` requests are in flight at a
+        time, so thousands of calls can be awaited on one event loop.
+
+        Args:
+            TOKEN: Specify token from cloud manager.
+            baseURL: Override the API base URL (optional).
+            poolSize: Number of pooled connections to the API host.
+            concurrency: Maximum number of requests in flight.
+            timeout: Total timeout (in seconds) of every request.
+            catalogTTL: Seconds the region/type/image catalogs are cached for.
+            maxRetries: Retries of a 429 (any method) or of a 5xx/connection
+            error (idempotent methods only).
+            backoffBase: First retry delay in seconds, doubled every attempt.
+            backoffCap: Maximum retry delay in seconds.
+        """
+        self.token = TOKEN
+        self.baseURL = baseURL.rstrip("/")
+        self.poolSize = poolSize
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.catalogTTL = catalogTTL
+        self.maxRetries = maxRetries
+        self.backoffBase = backoffBase
+        self.backoffCap = backoffCap
+        self._aiohttp = _importAiohttp()
+        self._session = None
+        self._semaphore = None
+        self._catalogs = {}
+        self._catalogFetches = {}
+        self._catalogGenerations = {}
+        self._pausedUntil = 0.0
+
+    def _ensureSession(self):
+        if self._session is None or self._session.closed:
+            aiohttp = self._aiohttp
+            # The token is sent per API request, never to pre-signed upload URLs.
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.poolSize, limit_per_host=self.poolSize),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    def backoff(self, attempt:int):
+        """Jittered exponential backoff delay of a retry (see `Transport.backoff`)."""
+        return random.uniform(0, min(self.backoffCap, self.backoffBase * (2 ** attempt)))
+
+    async def request(self, method:str, path:str, **kwargs):
+        """Send a request and decode its response.
+
+        A 429 is retried after its `Retry-After` delay, during which every
+        other request of the client holds back too; a 5xx or connection error
+        is retried with backoff for idempotent methods.
+
+        Args:
+            method: The HTTP method.
+            path: The API path, for example `/linode/instances`.
+            kwargs: Passed on to `aiohttp.ClientSession.request`.
+
+        Raises:
+            A `LinodeError` subclass if the API returns errors.
+
+        Returns:
+            The response json (an empty dictionary for action endpoints).
+        """
+        session = self._ensureSession()
+        loop = asyncio.get_running_loop()
+        headers = {"Authorization": f"Bearer {self.token}", **kwargs.pop("headers", {})}
+        idempotent = method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            pause = self._pausedUntil - loop.time()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            try:
+                async with self._semaphore:
+                    async with session.request(method, self.baseURL + "/" + path.lstrip("/"), headers=headers, **kwargs) as response:
+                        status = response.status
+                        content = await response.read()
+            except (self._aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not idempotent or attempt >= self.maxRetries:
+                    raise
+                await asyncio.sleep(self.backoff(attempt))
+                attempt += 1
+                continue
+            if attempt >= self.maxRetries or not (status == 429 or (idempotent and status in RETRY_STATUSES)):
+                return handlePayload(status, decodeBody(content), response.headers)
+            delay = retryAfter(response.headers, self.backoff(attempt))
+            if status == 429:
+                self._pausedUntil = max(self._pausedUntil, loop.time() + delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def close(self):
+        """Close the pooled connections of the client."""
+        if self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self):
+        self._ensureSession()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def iterRecords(self, path:str, pageSize=100):
+        """Iterate over every record of a paginated list endpoint.
+
+        Args:
+            path: The list endpoint.
+            pageSize: Records fetched per page (25 to 500).
+
+        Yields:
+            Every record of every page.
+        """
+        if not 25 <= pageSize <= MAX_PAGE_SIZE:
+            raise ValueError(f"Page size has to be between 25 and {MAX_PAGE_SIZE}.")
+        page = 1
+        upcoming = asyncio.ensure_future(self.request("GET", path, params={"page": 1, "page_size": pageSize}))
+        try:
+            while upcoming is not None:
+                response = await upcoming
+                upcoming = None
+                if page < response.get('pages', 1):
+                    page += 1
+                    upcoming = asyncio.ensure_future(self.request("GET", path, params={"page": page, "page_size": pageSize}))
+                for record in response['data']:
+                    yield record
+        finally:
+            if upcoming is not None:
+                upcoming.cancel()
+
+    async def collect(self, path:str):
+        data = [record async for record in self.iterRecords(path, MAX_PAGE_SIZE)]
+        return {"data": data, "page": 1, "pages": 1, "results": len(data)}
+
+    async def _fetchCatalog(self, kind):
+        generation = self._catalogGenerations.get(kind, 0)
+        ids = {i['id'] async for i in self.iterRecords(CATALOG_PATHS[kind], MAX_PAGE_SIZE)}
+        # Only cache a listing that started after the last invalidation.
+        if self._catalogGenerations.get(kind, 0) == generation:
+            self._catalogs[kind] = (time.time(), ids)
+        return ids
+
+    def _invalidateCatalog(self, kind):
+        self._catalogGenerations[kind] = self._catalogGenerations.get(kind, 0) + 1
+        self._catalogs.pop(kind, None)
+        self._catalogFetches.pop(kind, None)
+
+    async def validateCatalog(self, region=None, type=None, image=None):
+        """Async `linodeClient.validateCatalog`.
+
+        Concurrent calls share one in-flight fetch per catalog, so a burst of
+        creates on a cold cache lists every catalog once.
+        """
+        for kind, value, name in (("regions", region, "Region"), ("types", type, "Type"), ("images", image, "Image")):
+            if value is None:
+                continue
+            entry = self._catalogs.get(kind)
+            if entry is not None and time.time() - entry[0] < self.catalogTTL and value in entry[1]:
+                continue
+            fetch = self._catalogFetches.get(kind)
+            if fetch is None:
+                fetch = self._catalogFetches[kind] = asyncio.ensure_future(self._fetchCatalog(kind))
+                fetch.add_done_callback(lambda done, kind=kind: self._catalogFetches.pop(kind, None) if self._catalogFetches.get(kind) is done else None)
+            # Shielded: a cancelled caller does not cancel the fetch the others wait for.
+            ids = await asyncio.shield(fetch)
+            if value not in ids:
+                raise ValueError(f"{name} not found or not available.")
+
+    # Linode methods:
+
+    async def getLinodes(self, asModel=False, keepRaw=False):
+        return [Instance(i, keepRaw) if asModel else i['id'] async for i in self.iterRecords("/linode/instances", MAX_PAGE_SIZE)]
+
+    def iterLinodes(self, pageSize=100):
+        return self.iterRecords("/linode/instances", pageSize)
+
+    async def createLinode(self, region:str, type:str, image:str, root_pass:str, **kwargs):
+        await self.validateCatalog(region, type, image)
+        data = {"image": image, "type": type, "region": region, "root_pass": root_pass}
+        for k, v in kwargs.items():
+            if v:
+                data[k] = v
+        return await self.request("POST", "/linode/instances", json=data)
+
+    async def deleteLinode(self, linodeID:int):
+        return await self.request("DELETE", f"/linode/instances/{linodeID}")
+
+    async def findLinode(self, linodeID:int, asModel=False, keepRaw=False):
+        linode = await self.request("GET", f"/linode/instances/{linodeID}")
+        return Instance(linode, keepRaw) if asModel else linode
+
+    async def updateLinode(self, linodeID:int, **kwargs):
+        return await self.request("PUT", f"/linode/instances/{linodeID}", json=kwargs)
+
+    async def bootLinode(self, linodeID:int):
+        return await self.request("POST", f"/linode/instances/{linodeID}/boot")
+
+    async def rebootLinode(self, linodeID:int):
+        return await self.request("POST", f"/linode/instances/{linodeID}/reboot")
+
+    async def shutDownLinode(self, linodeID:int):
+        return await self.request("POST", f"/linode/instances/{linodeID}/shutdown")
+
+    async def resetPassLinode(self, linodeID:int, password:str):
+        return await self.request("POST", f"/linode/instances/{linodeID}/password", json={"root_pass": password})
+
+    async def rebuildLinode(self, linodeID:int, image:str, root_pass:str, **kwargs):
+        data = {"image": image, "root_pass": root_pass}
+        for k, v in kwargs.items():
+            if v:
+                data[k] = v
+        return await self.request("POST", f"/linode/instances/{linodeID}/rebuild", json=data)
+
+    async def cloneLinode(self, linodeID:int, **kwargs):
+        return await self.request("POST", f"/linode/instances/{linodeID}/clone", json=kwargs)
+
+    async def upgradeLinode(self, linodeID:int, **kwargs):
+        return await self.request("POST", f"/linode/instances/{linodeID}/mutate", json=kwargs)
+
+    async def statisticsLinode(self, linodeID:int):
+        return await self.request("GET", f"/linode/instances/{linodeID}/stats")
+
+    async def volumeListLinode(self, linodeID:int):
+        return await self.request("GET", f"/linode/instances/{linodeID}/volumes")
+
+    # Backup methods:
+
+    async def getBackups(self, linodeID:int):
+        return await self.request("GET", f"/linode/instances/{linodeID}/backups")
+
+    async def cancelBackups(self, linodeID:int):
+        return await self.request("POST", f"/linode/instances/{linodeID}/backups/cancel")
+
+    async def enableBackups(self, linodeID:int):
+        return await self.request("POST", f"/linode/instances/{linodeID}/backups/enable")
+
+    async def findBackup(self, linodeID:int, backupID:int):
+        return await self.request("GET", f"/linode/instances/{linodeID}/backups/{backupID}")
+
+    async def restoreBackup(self, linodeID:int, backupID:int):
+        return await self.request("POST", f"/linode/instances/{linodeID}/backups/{backupID}/restore")
+
+    async def createSnapshot(self, linodeID:int, label:str):
+        return await self.request("POST", f"/linode/instances/{linodeID}/backups", json={"label": label})
+
+    # Configuration methods:
+
+    async def getConfigs(self, linodeID:int):
+        return await self.collect(f"/linode/instances/{linodeID}/configs")
+
+    async def createConfig(self, linodeID:int, devices:dict, label:str, **kwargs):
+        data = {"devices": devices, "label": label}
+        for k, v in kwargs.items():
+            if v:
+                data[k] = v
+        return await self.request("POST", f"/linode/instances/{linodeID}/configs", json=data)
+
+    async def deleteConfig(self, linodeID:int, configID:int):
+        return await self.request("DELETE", f"/linode/instances/{linodeID}/configs/{configID}")
+
+    async def findConfig(self, linodeID:int, configID:int):
+        return await self.request("GET", f"/linode/instances/{linodeID}/configs/{configID}")
+
+    async def updateConfig(self, linodeID:int, configID:int, **kwargs):
+        return await self.request("PUT", f"/linode/instances/{linodeID}/configs/{configID}", json=kwargs)
+
+    # Disk methods:
+
+    async def getDisks(self, linodeID:int):
+        return await self.collect(f"/linode/instances/{linodeID}/disks")
+
+    async def createDisk(self, linodeID:int, size:int, **kwargs):
+        data = {"size": size}
+        for k, v in kwargs.items():
+            if v:
+                data[k] = v
+        return await self.request("POST", f"/linode/instances/{linodeID}/disks", json=data)
+
+    async def deleteDisk(self, linodeID:int, diskID:int):
+        return await self.request("DELETE", f"/linode/instances/{linodeID}/disks/{diskID}")
+
+    async def findDisk(self, linodeID:int, diskID:int):
+        return await self.request("GET", f"/linode/instances/{linodeID}/disks/{diskID}")
+
+    async def updateDisk(self, linodeID:int, diskID:int, **kwargs):
+        return await self.request("PUT", f"/linode/instances/{linodeID}/disks/{diskID}", json=kwargs)
+
+    async def cloneDisk(self, linodeID:int, diskID:int):
+        return await self.request("POST", f"/linode/instances/{linodeID}/disks/{diskID}/clone")
+
+    async def resetPassDisk(self, linodeID:int, diskID:int, password:str):
+        return await self.request("POST", f"/linode/instances/{linodeID}/disks/{diskID}/password", json={"password": str(password)})
+
+    async def resizeDisk(self, linodeID:int, diskID:int, size:int):
+        if not size>=1:
+            raise ValueError("Size has to be bigger or equals to one.")
+        return await self.request("POST", f"/linode/instances/{linodeID}/disks/{diskID}/resize", json={"size": size})
+
+    # IP Methods:
+
+    async def allocateIPv4(self, linodeID:int, public:bool, iptype="ipv4"):
+        return await self.request("POST", f"/linode/instances/{linodeID}/ips", json={"public": public, "type": iptype})
+
+    async def deleteIPv4(self, linodeID:int, address:str):
+        return await self.request("DELETE", f"/linode/instances/{linodeID}/ips/{address}")
+
+    async def getIPs(self, linodeID:int):
+        return await self.request("GET", f"/linode/instances/{linodeID}/ips")
+
+    async def findIP(self, linodeID:int, address:str):
+        return await self.request("GET", f"/linode/instances/{linodeID}/ips/{address}")
+
+    async def RDNSUpdateIP(self, linodeID:int, address:str, rdns:str):
+        return await self.request("PUT", f"/linode/instances/{linodeID}/ips/{address}", json={"rdns": rdns})
+
+    # Kernel Methods:
+
+    async def getKernels(self):
+        return await self.collect("/linode/kernels")
+
+    async def findkernel(self, kernelID:int):
+        return await self.request("GET", f"/linode/kernels/{kernelID}")
+
+    # Image Methods:
+
+    async def getImages(self):
+        return await self.collect("/images")
+
+    async def createImage(self, diskID:int, **kwargs):
+        data = {"disk_id": diskID}
+        for k, v in kwargs.items():
+            if v:
+                data[k] = v
+        self._invalidateCatalog("images")
+        return await self.request("POST", "/images", json=data)
+
+    async def uploadImage(self, label:str, region:str, source=None, progress=None, compress=None, **kwargs):
+        """Async `linodeClient.uploadImage`."""
+        data = {"label": label, "region": region}
+        for k, v in kwargs.items():
+            if v:
+                data[k] = v
+        self._invalidateCatalog("images")
+        upload = await self.request("POST", "/images/upload", json=data)
+        if source is not None:
+            await self.uploadImageData(upload["upload_to"], source, progress, compress)
+        return upload
+
+    async def uploadImageData(self, uploadTo:str, source, progress=None, compress=None, retries=3):
+        """Async `linodeClient.uploadImageData`.
+
+        The source is read (and gzipped) on the default executor, so the
+        event loop keeps running while a large image streams out.
+        """
+        from .upload import UploadSource, GZIP_MAGIC, gzipChunks, peekChunks, countedChunks
+
+        session = self._ensureSession()
+        loop = asyncio.get_running_loop()
+        upload = source if isinstance(source, UploadSource) else UploadSource(source)
+        attempt = 0
+        while True:
+            head, chunks = await loop.run_in_executor(None, peekChunks, upload.chunks())
+            gzip = compress if compress is not None else not head.startswith(GZIP_MAGIC)
+            sent = [0]
+
+            def track(done, total):
+                sent[0] = done
+                if progress is not None:
+                    progress(done, total)
+
+            chunks = countedChunks(chunks, track, upload.size)
+            if gzip:
+                chunks = gzipChunks(chunks)
+
+            async def body(chunks=chunks):
+                while True:
+                    chunk = await loop.run_in_executor(None, next, chunks, None)
+                    if chunk is None:
+                        return
+                    yield chunk
+
+            headers = {"Content-Type": "application/octet-stream"}
+            if not gzip and upload.size is not None:
+                headers["Content-Length"] = str(upload.size)
+            try:
+                async with session.put(uploadTo, data=body(), headers=headers, timeout=self._aiohttp.ClientTimeout(total=None, sock_read=300)) as response:
+                    text = await response.text()
+                    if response.status < 400:
+                        return sent[0]
+                    error = errorForStatus(response.status)([text[:200] or "Upload rejected."], response.status)
+                    if response.status < 500:
+                        raise error
+            except (self._aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                error = exc
+            if attempt >= retries or not upload.rewindable:
+                raise error
+            attempt += 1
+            await asyncio.sleep(random.uniform(0, min(30, 2 ** attempt)))
+
+    async def deleteImage(self, imageID:str):
+        self._invalidateCatalog("images")
+        return await self.request("DELETE", f"/images/{imageID}")
+
+    async def findImage(self, imageID:str):
+        return await self.request("GET", f"/images/{imageID}")
+
+    # Ohter Methods:
+
+    async def getFirewalls(self, linodeID:int):
+        return await self.request("GET", f"/linode/instances/{linodeID}/firewalls")
@@ -0,0 +1,87 @@
+class BulkResult:
+    __slots__ = ("linodeID", "result", "error")
+
+    def __init__(self, linodeID, result=None, error=None) -> None:
+        """Outcome of one operation of a bulk run.
+
+        Args:
+            linodeID: The linode the operation ran on.
+            result: The return value of the operation (None on error).
+            error: The exception raised by the operation (None on success).
+        """
+        self.linodeID = linodeID
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"BulkResult({self.linodeID!r}, error={self.error!r})"
+        return f"BulkResult({self.linodeID!r}, result={self.result!r})"
+
+
+def _call(operation, linodeID, args, kwargs):
+    try:
+        return BulkResult(linodeID, result=operation(linodeID, *args, **kwargs))
+    except Exception as error:
+        return BulkResult(linodeID, error=error)
+
+
+def bulk(operation, linodeIDs, maxInFlight=8, batchSize=None, haltOnError=False, args=(), kwargs=None):
+    """Run an operation over many linodes on a bounded worker pool.
+
+    By default at most `maxInFlight` calls run at once and a new one starts
+    as soon as any finishes. With `batchSize`, linodes are processed in
+    batches of that size and a batch only starts once the previous one is
+    done, which suits rolling changes.
+
+    Args:
+        operation: Callable taking a linode ID (plus `args`/`kwargs`).
+        linodeIDs: Iterable of linode IDs; consumed lazily.
+        maxInFlight: Maximum number of concurrent calls.
+        batchSize: Process linodes in batches of this size (optional).
+        haltOnError: In batch mode, stop before the next batch if any call failed.
+        args: Extra positional arguments of every call.
+        kwargs: Extra keyword arguments of every call.
+
+    Yields:
+        A `BulkResult` per linode, in completion order.
+    """
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    if maxInFlight < 1:
+        raise ValueError("maxInFlight has to be bigger or equals to one.")
+    kwargs = kwargs or {}
+    linodeIDs = iter(linodeIDs)
+    workers = min(maxInFlight, batchSize) if batchSize else maxInFlight
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if batchSize:
+            while True:
+                batch = [linodeID for _, linodeID in zip(range(batchSize), linodeIDs)]
+                if not batch:
+                    return
+                failed = False
+                futures = [executor.submit(_call, operation, linodeID, args, kwargs) for linodeID in batch]
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        failed = failed or not result.ok
+                        yield result
+                if failed and haltOnError:
+                    return
+        pending = set()
+        for linodeID in linodeIDs:
+            pending.add(executor.submit(_call, operation, linodeID, args, kwargs))
+            if len(pending) >= maxInFlight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+import time
+
+from .pagination import iterRecords
+
+CATALOG_PATHS = {
+    "regions": "/regions",
+    "types": "/linode/types",
+    "images": "/images",
+}
+
+
+class Catalog:
+    def __init__(self, transport, ttl=3600, snapshotPath=None) -> None:
+        """Cache of the region, type and image IDs used to validate new linodes.
+
+        Every catalog is kept as a `set` and fetched at most once per `ttl`.
+
+        Args:
+            transport: The `Transport` used to fetch the catalogs.
+            ttl: Seconds a fetched catalog stays valid.
+            snapshotPath: Path of an optional JSON snapshot on disk, read on
+            first use and rewritten after every fetch so new processes start warm.
+        """
+        self.transport = transport
+        self.ttl = ttl
+        self.snapshotPath = snapshotPath
+        self._entries = {}
+        self._lock = threading.Lock()
+        if snapshotPath:
+            self._loadSnapshot()
+
+    def regions(self):
+        """Returns the set of region IDs."""
+        return self.get("regions")
+
+    def types(self):
+        """Returns the set of linode type IDs."""
+        return self.get("types")
+
+    def images(self):
+        """Returns the set of image IDs visible to the token (public and private)."""
+        return self.get("images")
+
+    def get(self, kind:str):
+        """Get a catalog, fetching it if missing or expired.
+
+        Args:
+            kind: One of `regions`, `types` or `images`.
+
+        Returns:
+            A set of IDs.
+        """
+        if kind not in CATALOG_PATHS:
+            raise ValueError(f"Unknown catalog {kind!r}.")
+        with self._lock:
+            entry = self._entries.get(kind)
+            if entry is not None and time.time() - entry[0] < self.ttl:
+                return entry[1]
+            ids = self._fetch(kind)
+            self._entries[kind] = (time.time(), ids)
+            if self.snapshotPath:
+                self._saveSnapshot()
+            return ids
+
+    def invalidate(self, kind=None):
+        """Drop a cached catalog so the next lookup fetches it again.
+
+        Args:
+            kind: The catalog to drop, or every catalog if None.
+        """
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(kind, None)
+
+    def _fetch(self, kind):
+        return {i['id'] for i in iterRecords(self.transport, CATALOG_PATHS[kind], pageSize=500)}
+
+    def _loadSnapshot(self):
+        try:
+            with open(self.snapshotPath, "r") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        for kind, entry in snapshot.items():
+            if kind in CATALOG_PATHS:
+                self._entries[kind] = (entry['fetched'], set(entry['ids']))
+
+    def _saveSnapshot(self):
+        snapshot = {kind: {"fetched": fetched, "ids": sorted(ids)} for kind, (fetched, ids) in self._entries.items()}
+        directory = os.path.dirname(self.snapshotPath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmpPath = f"{self.snapshotPath}.{os.getpid()}.tmp"
+        with open(tmpPath, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmpPath, self.snapshotPath)
@@ -0,0 +1,210 @@
+"""The `mylinode` command line tool.
+
+Examples:
+    mylinode list --filter region=us-east --format ndjson
+    mylinode find 123
+    mylinode reboot 123 456 --wait
+    mylinode stats 123
+    mylinode catalog regions
+    mylinode apply fleet.json --dry-run
+"""
+import argparse
+import json
+import os
+import sys
+
+CATALOG_SNAPSHOT = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "mylinode", "catalog.json")
+
+
+def _parseFilter(expressions):
+    """Turn `field=value` expressions into an `X-Filter` dictionary (numbers and booleans are decoded)."""
+    query = {}
+    for expression in expressions or ():
+        name, sep, value = expression.partition("=")
+        if not sep or not name:
+            raise ValueError(f"Filter has to be field=value, not {expression!r}.")
+        try:
+            query[name] = json.loads(value)
+        except ValueError:
+            query[name] = value
+    return query or None
+
+
+def _write(records, format, out):
+    """Write the records as one JSON array or as one JSON object per line.
+
+    Returns:
+        The number of records reporting `"ok": false`.
+    """
+    failed = 0
+    if format == "ndjson":
+        for record in records:
+            failed += record.get("ok") is False
+            out.write(json.dumps(record, separators=(",", ":")) + "\n")
+            out.flush()
+    else:
+        records = list(records)
+        failed = sum(record.get("ok") is False for record in records)
+        json.dump(records, out, indent=2)
+        out.write("\n")
+    return failed
+
+
+def _client(args):
+    from . import linodeClient
+
+    token = args.token or os.environ.get("LINODE_TOKEN")
+    if not token and args.command != "catalog":
+        raise SystemExit("mylinode: set LINODE_TOKEN or pass --token.")
+    snapshot = None if args.no_cache else args.catalog_cache
+    return linodeClient(token, baseURL=args.base_url, catalogSnapshot=snapshot)
+
+
+def _list(client, args):
+    records = client.iterLinodes(pageSize=500, filter=_parseFilter(args.filter))
+    if args.ids:
+        records = ({"id": i["id"]} for i in records)
+    return records
+
+
+def _find(client, args):
+    return (client.findLinode(i) for i in args.linodeIDs)
+
+
+def _action(method, status):
+    def run(client, args):
+        results = []
+        for result in client.bulk(method, args.linodeIDs, maxInFlight=args.max_in_flight):
+            results.append(result)
+        futures = {}
+        if args.wait:
+            futures = {i.linodeID: client.waiter.waitForInstance(i.linodeID, status, timeout=args.timeout) for i in results if i.ok}
+        for result in results:
+            record = {"id": result.linodeID, "ok": result.ok}
+            if not result.ok:
+                record["error"] = str(result.error)
+            elif result.linodeID in futures:
+                try:
+                    record["status"] = futures[result.linodeID].result()["status"]
+                except Exception as error:
+                    record.update(ok=False, error=str(error))
+            yield record
+    return run
+
+
+def _stats(client, args):
+    for linodeID in args.linodeIDs:
+        stats = client.statisticsLinode(linodeID)
+        yield {"id": linodeID, **stats}
+
+
+def _apply(client, args):
+    with open(args.spec, "r") as f:
+        desired = json.load(f)
+    # JSON keys are strings: numeric ones are linode IDs, the others labels.
+    desired = {int(key) if key.isdigit() else key: spec for key, spec in desired.items()}
+    for spec in desired.values():
+        for part in ("configs", "disks"):
+            if part in spec:
+                spec[part] = {int(key) if key.isdigit() else key: value for key, value in spec[part].items()}
+    if args.dry_run:
+        plan = client.planReconcile(desired)
+        sys.stderr.write(plan.describe() + "\n")
+    else:
+        plan = client.reconcile(desired, maxInFlight=args.max_in_flight)
+    for step in plan:
+        record = {"step": step.index, "id": step.linodeID, "action": step.action, "description": step.description, "after": list(step.after)}
+        if step.afterSettled:
+            record["afterSettled"] = list(step.afterSettled)
+        if not args.dry_run:
+            record["ok"] = step.status == "done"
+            record["status"] = step.status
+            if step.error is not None:
+                record["error"] = str(step.error)
+        yield record
+
+
+def _catalog(client, args):
+    return ({"id": i} for i in sorted(client.catalog.get(args.kind)))
+
+
+def _globalOptions(defaults):
+    """Parser of the options accepted before and after the command.
+
+    Args:
+        defaults: Set the defaults (top level) or leave them unset so a
+        subcommand does not overwrite a value given before it.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    unset = argparse.SUPPRESS
+    parser.add_argument("--token", default=None if defaults else unset, help="API token (default: $LINODE_TOKEN).")
+    parser.add_argument("--base-url", default=None if defaults else unset, help="Override the API base URL.")
+    parser.add_argument("--format", choices=("json", "ndjson"), default="json" if defaults else unset, help="Output format (default: json).")
+    parser.add_argument("--catalog-cache", default=CATALOG_SNAPSHOT if defaults else unset, help=f"Catalog snapshot path (default: {CATALOG_SNAPSHOT}).")
+    parser.add_argument("--no-cache", action="store_true", default=False if defaults else unset, help="Do not read or write the catalog snapshot.")
+    return parser
+
+
+def buildParser():
+    parser = argparse.ArgumentParser(prog="mylinode", description="Command line access to the Linode API.", parents=[_globalOptions(True)])
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+    # The global options are accepted after the command too: `mylinode list --format ndjson`.
+    common = [_globalOptions(False)]
+
+    command = commands.add_parser("list", parents=common, help="List linodes.")
+    command.add_argument("--filter", action="append", metavar="FIELD=VALUE", help="Only list matching linodes (repeatable).")
+    command.add_argument("--ids", action="store_true", help="Only print the IDs.")
+    command.set_defaults(run=_list)
+
+    command = commands.add_parser("find", parents=common, help="Show linodes.")
+    command.add_argument("linodeIDs", type=int, nargs="+", metavar="ID")
+    command.set_defaults(run=_find)
+
+    for name, method, status in (("boot", "bootLinode", "running"), ("reboot", "rebootLinode", "running"), ("shutdown", "shutDownLinode", "offline")):
+        command = commands.add_parser(name, parents=common, help=f"{name.capitalize()} linodes.")
+        command.add_argument("linodeIDs", type=int, nargs="+", metavar="ID")
+        command.add_argument("--wait", action="store_true", help=f"Wait until every linode is {status}.")
+        command.add_argument("--timeout", type=float, default=600, help="Seconds to wait (default: 600).")
+        command.add_argument("--max-in-flight", type=int, default=8, help="Concurrent requests (default: 8).")
+        command.set_defaults(run=_action(method, status))
+
+    command = commands.add_parser("stats", parents=common, help="Show the statistics of linodes.")
+    command.add_argument("linodeIDs", type=int, nargs="+", metavar="ID")
+    command.set_defaults(run=_stats)
+
+    command = commands.add_parser("apply", parents=common, help="Reconcile linodes to a desired state read from a JSON file.")
+    command.add_argument("spec", help="JSON file mapping linode IDs (or labels) to their desired fields, configs and disks.")
+    command.add_argument("--dry-run", action="store_true", help="Only show the plan.")
+    command.add_argument("--max-in-flight", type=int, default=8, help="Concurrent steps (default: 8).")
+    command.set_defaults(run=_apply)
+
+    command = commands.add_parser("catalog", parents=common, help="List regions, types or images (cached on disk).")
+    command.add_argument("kind", choices=("regions", "types", "images"))
+    command.set_defaults(run=_catalog)
+    return parser
+
+
+def main(argv=None):
+    """Entry point of the `mylinode` command.
+
+    Returns:
+        The exit status: 0 on success, 1 if the API returned an error or an action failed.
+    """
+    from .errors import LinodeError
+
+    args = buildParser().parse_args(argv)
+    try:
+        client = _client(args)
+        with client:
+            failed = _write(args.run(client, args), args.format, sys.stdout)
+    except (LinodeError, ValueError) as error:
+        sys.stderr.write(f"mylinode: {error}\n")
+        return 1
+    except BrokenPipeError:
+        return 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
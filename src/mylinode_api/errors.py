@@ -0,0 +1,73 @@
+class LinodeError(ValueError):
+    def __init__(self, reasons, status=None, requestID=None, errors=None) -> None:
+        """Error returned by the Linode API.
+
+        Subclasses `ValueError`, which is what the client raised before typed
+        errors existed.
+
+        Args:
+            reasons: Every error reason of the response.
+            status: The HTTP status code.
+            requestID: The request ID of the response, if the API sent one.
+            errors: The raw `errors` list of the response.
+        """
+        self.reasons = list(reasons)
+        self.status = status
+        self.requestID = requestID
+        self.errors = errors or []
+        super().__init__("; ".join(self.reasons) or f"HTTP {status}")
+
+    @property
+    def fields(self):
+        """Returns the fields the errors refer to (None for general errors)."""
+        return [i.get('field') for i in self.errors]
+
+
+class BadRequestError(LinodeError):
+    pass
+
+
+class UnauthorizedError(LinodeError):
+    pass
+
+
+class ForbiddenError(LinodeError):
+    pass
+
+
+class NotFoundError(LinodeError):
+    pass
+
+
+class RateLimitError(LinodeError):
+    pass
+
+
+class ServerError(LinodeError):
+    pass
+
+
+class CircuitOpenError(ServerError):
+    """Raised without sending a request while the circuit breaker of an endpoint is open."""
+
+
+STATUS_ERRORS = {
+    400: BadRequestError,
+    401: UnauthorizedError,
+    403: ForbiddenError,
+    404: NotFoundError,
+    429: RateLimitError,
+}
+
+
+def errorForStatus(status:int):
+    """Get the error class of an HTTP status code.
+
+    Returns:
+        The `LinodeError` subclass.
+    """
+    if status in STATUS_ERRORS:
+        return STATUS_ERRORS[status]
+    if status >= 500:
+        return ServerError
+    return LinodeError
@@ -0,0 +1,165 @@
+from .errors import NotFoundError
+from .models import Instance, Disk, Config
+from .pagination import collect, MAX_PAGE_SIZE
+from .query import F
+from .response import handleResponse
+
+# Sub-resource of an instance to its path and whether that endpoint is paginated.
+GRAPH_PARTS = {
+    "disks": ("disks", True),
+    "configs": ("configs", True),
+    "volumes": ("volumes", True),
+    "firewalls": ("firewalls", True),
+    "backups": ("backups", False),
+    "ips": ("ips", False),
+}
+_MODELS = {"disks": Disk, "configs": Config}
+# Instances looked up per filtered list request.
+_LOOKUP_BATCH = 100
+
+
+class InstanceGraph:
+    __slots__ = ("linodeID", "instance", "disks", "configs", "volumes", "firewalls", "backups", "ips", "errors")
+
+    def __init__(self, linodeID) -> None:
+        """Everything fetched about one linode by `iterInstanceGraphs`.
+
+        Parts that were not included stay None; `errors` maps the part names
+        (`instance`, `disks`, ...) whose request failed to the exception.
+        """
+        self.linodeID = linodeID
+        self.instance = None
+        self.disks = None
+        self.configs = None
+        self.volumes = None
+        self.firewalls = None
+        self.backups = None
+        self.ips = None
+        self.errors = {}
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def toDict(self):
+        def plain(value):
+            if isinstance(value, list):
+                return [plain(i) for i in value]
+            return value.toDict() if hasattr(value, "toDict") else value
+
+        data = {name: plain(getattr(self, name)) for name in self.__slots__ if name != "errors"}
+        data["errors"] = {name: str(error) for name, error in self.errors.items()}
+        return data
+
+    def __repr__(self):
+        parts = [name for name in GRAPH_PARTS if getattr(self, name) is not None]
+        return f"InstanceGraph({self.linodeID!r}, parts={parts}, errors={sorted(self.errors)})"
+
+
+def _fetchInstances(client, linodeIDs):
+    found = {i["id"]: i for i in client.iterLinodes(pageSize=MAX_PAGE_SIZE, prefetch=False, filter=F("id").isIn(linodeIDs))}
+    return [(linodeID, found.get(linodeID)) for linodeID in linodeIDs]
+
+
+def _fetchPart(client, linodeID, part):
+    path, paginated = GRAPH_PARTS[part]
+    path = f"/linode/instances/{linodeID}/{path}"
+    if paginated:
+        return collect(client.transport, path)["data"]
+    return handleResponse(client.transport.get(path))
+
+
+def _plan(client, linodeIDs, include):
+    """Yield the sub-requests as `(linodeIDs, part, callable)`: one filtered
+    lookup per batch of instances, then one request per included part."""
+    batch, seen = [], set()
+    for linodeID in linodeIDs:
+        if linodeID in seen:
+            continue
+        seen.add(linodeID)
+        batch.append(linodeID)
+        if len(batch) == _LOOKUP_BATCH:
+            yield from _planBatch(client, batch, include)
+            batch = []
+    if batch:
+        yield from _planBatch(client, batch, include)
+
+
+def _planBatch(client, batch, include):
+    yield batch, "instance", lambda: _fetchInstances(client, batch)
+    for linodeID in batch:
+        for part in include:
+            yield [linodeID], part, lambda linodeID=linodeID, part=part: _fetchPart(client, linodeID, part)
+
+
+def iterInstanceGraphs(client, linodeIDs, include=tuple(GRAPH_PARTS), maxInFlight=16, asModel=False):
+    """Fetch linodes with their sub-resources, sharing one concurrency budget.
+
+    The instances are looked up with one filtered list request per 100 IDs
+    and every included part of every instance is one more request; all of
+    them run on the same `maxInFlight` workers (paced by the transport's
+    rate limiter), so a large fleet is bound by the API, not round trips.
+    Requests are planned lazily, so memory is bounded by the instances in flight.
+
+    Args:
+        client: The `linodeClient`.
+        linodeIDs: Iterable of linode IDs.
+        include: Parts to fetch, from `disks`, `configs`, `volumes`, `firewalls`, `backups` and `ips`.
+        maxInFlight: Maximum number of concurrent requests.
+        asModel: Assemble `Instance`, `Disk` and `Config` objects instead of dictionaries.
+
+    Yields:
+        An `InstanceGraph` per linode, as soon as all its requests finished.
+    """
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    include = tuple(dict.fromkeys(include))
+    unknown = [i for i in include if i not in GRAPH_PARTS]
+    if unknown:
+        raise ValueError(f"Unknown instance graph parts: {', '.join(unknown)}.")
+    if maxInFlight < 1:
+        raise ValueError("maxInFlight has to be bigger or equals to one.")
+    graphs, remaining = {}, {}
+
+    def settle(done):
+        for future in done:
+            ids, part = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as error:
+                result = error
+            if part == "instance":
+                for linodeID, instance in (result if not isinstance(result, Exception) else [(i, result) for i in ids]):
+                    graph = graphs[linodeID]
+                    if isinstance(instance, Exception):
+                        graph.errors["instance"] = instance
+                    elif instance is None:
+                        graph.errors["instance"] = NotFoundError(["Not found"], 404)
+                    else:
+                        graph.instance = Instance(instance) if asModel else instance
+            else:
+                graph = graphs[ids[0]]
+                if isinstance(result, Exception):
+                    graph.errors[part] = result
+                else:
+                    setattr(graph, part, [_MODELS[part](i) for i in result] if asModel and part in _MODELS else result)
+            for linodeID in ids:
+                remaining[linodeID] -= 1
+                if remaining[linodeID] == 0:
+                    del remaining[linodeID]
+                    yield graphs.pop(linodeID)
+
+    pending = {}
+    with ThreadPoolExecutor(max_workers=maxInFlight) as executor:
+        for ids, part, call in _plan(client, linodeIDs, include):
+            if part == "instance":
+                for linodeID in ids:
+                    graphs[linodeID] = InstanceGraph(linodeID)
+                    remaining[linodeID] = 1 + len(include)
+            pending[executor.submit(call)] = (ids, part)
+            if len(pending) >= maxInFlight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from settle(done)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from settle(done)
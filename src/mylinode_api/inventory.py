@@ -0,0 +1,175 @@
+import json
+import threading
+
+from .models import Instance
+from .pagination import iterPages, MAX_PAGE_SIZE
+from .response import handleResponse
+
+
+class _NotModified(Exception):
+    pass
+
+
+class Inventory:
+    def __init__(self, client, fullRefreshEvery=10, keepRaw=False) -> None:
+        """In-process index of every linode of the account.
+
+        After the first full load, `refresh()` only asks the API for linodes
+        whose `updated` timestamp moved (server-side `X-Filter`) and sends the
+        last `ETag` as `If-None-Match`, so an unchanged fleet costs one
+        conditional request. Every `fullRefreshEvery` refreshes a full walk
+        picks up deletions and changes that do not bump `updated`, such as
+        status transitions.
+
+        Args:
+            client: The `linodeClient` to fetch through.
+            fullRefreshEvery: Do a full walk every N refreshes (0 to never).
+            keepRaw: Keep the json of every `Instance`.
+        """
+        self.client = client
+        self.fullRefreshEvery = fullRefreshEvery
+        self.keepRaw = keepRaw
+        self.instances = {}
+        self.byLabel = {}
+        self.byTag = {}
+        self.byRegion = {}
+        self.byStatus = {}
+        self.lastUpdated = None
+        self.refreshes = 0
+        self._etag = None
+        self._lock = threading.RLock()
+
+    def refresh(self, full=False):
+        """Bring the index up to date.
+
+        Args:
+            full: Force a full walk of every linode.
+
+        Returns:
+            The number of linodes added or changed (plus removed on a full walk).
+        """
+        with self._lock:
+            full = full or self.lastUpdated is None or (self.fullRefreshEvery and self.refreshes % self.fullRefreshEvery == 0)
+            self.refreshes += 1
+            if full:
+                return self._fullRefresh()
+            return self._incrementalRefresh()
+
+    def _fullRefresh(self):
+        seen = set()
+        changed = 0
+        for page in iterPages(self.client.transport, "/linode/instances", MAX_PAGE_SIZE, handler=handleResponse):
+            for data in page:
+                seen.add(data['id'])
+                changed += self._upsert(data)
+        for linodeID in set(self.instances) - seen:
+            self._remove(linodeID)
+            changed += 1
+        self._etag = None
+        return changed
+
+    def _incrementalRefresh(self):
+        headers = {"X-Filter": json.dumps({"updated": {"+gte": self.lastUpdated}})}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        changed = 0
+        try:
+            for page in iterPages(self.client.transport, "/linode/instances", MAX_PAGE_SIZE, prefetch=False, headers=headers, handler=self._conditional):
+                for data in page:
+                    changed += self._upsert(data)
+        except _NotModified:
+            return 0
+        return changed
+
+    def _conditional(self, response):
+        if response.status_code == 304:
+            raise _NotModified()
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag = etag
+        return handleResponse(response)
+
+    def _upsert(self, data):
+        current = self.instances.get(data['id'])
+        if current is not None and current.updated == data.get('updated') and current.status == data.get('status'):
+            return 0
+        if current is not None:
+            self._unindex(current)
+        instance = Instance(data, self.keepRaw)
+        self.instances[instance.id] = instance
+        self.byLabel[instance.label] = instance.id
+        for tag in instance.tags or ():
+            self.byTag.setdefault(tag, set()).add(instance.id)
+        self.byRegion.setdefault(instance.region, set()).add(instance.id)
+        self.byStatus.setdefault(instance.status, set()).add(instance.id)
+        if instance.updated and (self.lastUpdated is None or instance.updated > self.lastUpdated):
+            self.lastUpdated = instance.updated
+        return 1
+
+    def _remove(self, linodeID):
+        instance = self.instances.pop(linodeID, None)
+        if instance is not None:
+            self._unindex(instance)
+
+    def _unindex(self, instance):
+        if self.byLabel.get(instance.label) == instance.id:
+            del self.byLabel[instance.label]
+        for index, keys in ((self.byTag, instance.tags or ()), (self.byRegion, (instance.region,)), (self.byStatus, (instance.status,))):
+            for key in keys:
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(instance.id)
+                    if not ids:
+                        del index[key]
+
+    def discard(self, linodeID:int):
+        """Drop a linode from the index (for example after deleting it)."""
+        with self._lock:
+            self._remove(linodeID)
+
+    def get(self, linodeID:int):
+        """Get an indexed linode by ID.
+
+        Returns:
+            The `Instance`, or None if it is not indexed.
+        """
+        return self.instances.get(linodeID)
+
+    def findByLabel(self, label:str):
+        """Get an indexed linode by label.
+
+        Returns:
+            The `Instance`, or None if it is not indexed.
+        """
+        linodeID = self.byLabel.get(label)
+        return None if linodeID is None else self.instances.get(linodeID)
+
+    def filter(self, tag=None, region=None, status=None):
+        """Filter the indexed linodes, every given criterion has to match.
+
+        Args:
+            tag: A tag the linode has.
+            region: The region of the linode.
+            status: The status of the linode.
+
+        Returns:
+            A list of matching `Instance` objects.
+        """
+        with self._lock:
+            sets = []
+            for index, key in ((self.byTag, tag), (self.byRegion, region), (self.byStatus, status)):
+                if key is not None:
+                    sets.append(index.get(key, set()))
+            if not sets:
+                return list(self.instances.values())
+            ids = set.intersection(*sorted(sets, key=len))
+            return [self.instances[i] for i in ids]
+
+    def __len__(self):
+        return len(self.instances)
+
+    def __contains__(self, linodeID):
+        return linodeID in self.instances
+
+    def __iter__(self):
+        return iter(list(self.instances.values()))
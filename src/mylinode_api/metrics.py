@@ -0,0 +1,122 @@
+import bisect
+import logging
+import re
+import threading
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+_TEMPLATE_RULES = (
+    (re.compile(r"^/images/[^/]+/[^/]+"), "/images/{id}"),
+    (re.compile(r"^/linode/kernels/[^/]+/[^/]+"), "/linode/kernels/{id}"),
+    (re.compile(r"/ips/[^/]+"), "/ips/{address}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{id}"),
+)
+
+
+def endpointTemplate(path:str):
+    """Collapse the IDs of an API path into a template.
+
+    Args:
+        path: The API path, for example `/linode/instances/123/disks/45`.
+
+    Returns:
+        The template, for example `/linode/instances/{id}/disks/{id}`.
+    """
+    path = path.split("?", 1)[0]
+    for pattern, replacement in _TEMPLATE_RULES:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+class EndpointStats:
+    __slots__ = ("count", "errors", "seconds", "buckets", "requestBytes", "responseBytes", "statuses", "retries", "rateLimitedSeconds")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.requestBytes = 0
+        self.responseBytes = 0
+        self.statuses = {}
+        self.retries = 0
+        self.rateLimitedSeconds = 0.0
+
+    def toDict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "seconds": self.seconds,
+            "meanSeconds": self.seconds / self.count if self.count else 0.0,
+            "latencyHistogram": dict(zip([str(i) for i in LATENCY_BUCKETS] + ["+Inf"], self.buckets)),
+            "requestBytes": self.requestBytes,
+            "responseBytes": self.responseBytes,
+            "statuses": dict(self.statuses),
+            "retries": self.retries,
+            "rateLimitedSeconds": self.rateLimitedSeconds,
+        }
+
+
+class Metrics:
+    def __init__(self, hooks=()) -> None:
+        """Per-endpoint request metrics of a `Transport`.
+
+        Every finished request (including its retries) is recorded under its
+        endpoint template and then passed to every hook as an event
+        dictionary with `method`, `endpoint`, `template`, `status`, `seconds`,
+        `requestBytes`, `responseBytes`, `retries`, `rateLimitedSeconds` and
+        `error`. Hooks can forward events to a tracing or metrics backend;
+        an exception raised by a hook is logged and never reaches the request.
+
+        Args:
+            hooks: Callables receiving every event.
+        """
+        self.hooks = list(hooks)
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def addHook(self, hook):
+        """Register a callable receiving every request event."""
+        self.hooks.append(hook)
+
+    def removeHook(self, hook):
+        self.hooks.remove(hook)
+
+    def record(self, event:dict):
+        """Record one request event and pass it to the hooks."""
+        with self._lock:
+            stats = self.endpoints.get((event["method"], event["template"]))
+            if stats is None:
+                stats = self.endpoints[(event["method"], event["template"])] = EndpointStats()
+            stats.count += 1
+            stats.seconds += event["seconds"]
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, event["seconds"])] += 1
+            stats.requestBytes += event["requestBytes"]
+            stats.responseBytes += event["responseBytes"]
+            status = event["status"]
+            if status is None or status >= 400:
+                stats.errors += 1
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.retries += event["retries"]
+            stats.rateLimitedSeconds += event["rateLimitedSeconds"]
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Metrics hook %r failed on %s %s.", hook, event["method"], event["endpoint"])
+
+    def snapshot(self):
+        """Export the metrics.
+
+        Returns:
+            A dictionary of `"METHOD /template"` to its counters and histogram.
+        """
+        with self._lock:
+            return {f"{method} {template}": stats.toDict() for (method, template), stats in sorted(self.endpoints.items())}
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
@@ -0,0 +1,721 @@
+import io
+import json
+import math
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, parse_qsl
+
+import requests
+from requests.adapters import BaseAdapter
+
+from .query import matchesFilter
+from .transport import BASE_URL
+
+REGIONS = ("us-east", "us-central", "us-west", "us-southeast", "eu-west", "eu-central", "ap-south", "ap-northeast")
+TYPES = ("g6-nanode-1", "g6-standard-1", "g6-standard-2", "g6-standard-4", "g6-standard-8", "g6-dedicated-2")
+IMAGES = ("linode/debian12", "linode/ubuntu22.04", "linode/ubuntu24.04", "linode/almalinux9", "linode/arch")
+KERNELS = ("linode/grub2", "linode/direct-disk", "linode/latest-64bit")
+SPECS = {
+    "g6-nanode-1": (1, 1024, 25600),
+    "g6-standard-1": (1, 2048, 51200),
+    "g6-standard-2": (2, 4096, 81920),
+    "g6-standard-4": (4, 8192, 163840),
+    "g6-standard-8": (6, 16384, 327680),
+    "g6-dedicated-2": (2, 4096, 81920),
+}
+
+# Path parameters of the routes below.
+_ID = r"(\d+)"
+_IMAGE = r"([\w.-]+/[\w.-]+)"
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+class _Error(Exception):
+    def __init__(self, status, reason, field=None) -> None:
+        self.status = status
+        self.reason = reason
+        self.field = field
+
+
+class MockLinodeAPI:
+    def __init__(self, latency=0.0, jitter=0.0, errorRate=0.0, rateLimit=None, transition=0.0, seed=None) -> None:
+        """Stateful in-process fake of the Linode v4 endpoints used by `linodeClient`.
+
+        Args:
+            latency: Seconds every request is delayed by.
+            jitter: Extra random delay (0 to `jitter` seconds) per request.
+            errorRate: Probability of answering any request with a 500.
+            rateLimit: `(requests, per seconds)` allowed before answering 429 (optional).
+            transition: Seconds a boot/shutdown/resize/restore stays in its
+            transitional status before it settles.
+            seed: Seed of the random generator, for reproducible runs.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.errorRate = errorRate
+        self.rateLimit = rateLimit
+        self.transition = transition
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.failNext = 0
+        self.failUploads = 0
+        self.uploads = {}
+        self.uploadURL = BASE_URL + "/mock-upload"
+        self.instances = {}
+        self.disks = {}
+        self.configs = {}
+        self.ips = {}
+        self.backups = {}
+        self.images = {i: self._image(i, True) for i in IMAGES}
+        self._pending = {}
+        self._nextID = 1000
+        self._window = []
+        self._lock = threading.RLock()
+        self._routes = [(method, re.compile("^" + pattern + "$"), handler) for method, pattern, handler in (
+            ("GET", r"/regions", self._listRegions),
+            ("GET", r"/linode/types", self._listTypes),
+            ("GET", r"/linode/kernels", self._listKernels),
+            ("GET", r"/linode/kernels/([\w./-]+)", self._getKernel),
+            ("GET", r"/images", self._listImages),
+            ("POST", r"/images", self._createImage),
+            ("POST", r"/images/upload", self._uploadImage),
+            ("GET", r"/images/" + _IMAGE, self._getImage),
+            ("DELETE", r"/images/" + _IMAGE, self._deleteImage),
+            ("GET", r"/linode/instances", self._listInstances),
+            ("POST", r"/linode/instances", self._createInstance),
+            ("GET", r"/linode/instances/" + _ID, self._getInstance),
+            ("PUT", r"/linode/instances/" + _ID, self._updateInstance),
+            ("DELETE", r"/linode/instances/" + _ID, self._deleteInstance),
+            ("POST", r"/linode/instances/" + _ID + r"/(boot|reboot|shutdown)", self._power),
+            ("POST", r"/linode/instances/" + _ID + r"/(password|rebuild|mutate)", self._instanceAction),
+            ("POST", r"/linode/instances/" + _ID + r"/clone", self._cloneInstance),
+            ("GET", r"/linode/instances/" + _ID + r"/stats", self._stats),
+            ("GET", r"/linode/instances/" + _ID + r"/volumes", self._emptyList),
+            ("GET", r"/linode/instances/" + _ID + r"/firewalls", self._emptyList),
+            ("GET", r"/linode/instances/" + _ID + r"/backups", self._listBackups),
+            ("POST", r"/linode/instances/" + _ID + r"/backups", self._snapshot),
+            ("POST", r"/linode/instances/" + _ID + r"/backups/(cancel|enable)", self._backupSettings),
+            ("GET", r"/linode/instances/" + _ID + r"/backups/" + _ID, self._getBackup),
+            ("POST", r"/linode/instances/" + _ID + r"/backups/" + _ID + r"/restore", self._restoreBackup),
+            ("GET", r"/linode/instances/" + _ID + r"/configs", self._listChildren("configs")),
+            ("POST", r"/linode/instances/" + _ID + r"/configs", self._createConfig),
+            ("GET", r"/linode/instances/" + _ID + r"/configs/" + _ID, self._getChild("configs")),
+            ("PUT", r"/linode/instances/" + _ID + r"/configs/" + _ID, self._updateChild("configs")),
+            ("DELETE", r"/linode/instances/" + _ID + r"/configs/" + _ID, self._deleteChild("configs")),
+            ("GET", r"/linode/instances/" + _ID + r"/disks", self._listChildren("disks")),
+            ("POST", r"/linode/instances/" + _ID + r"/disks", self._createDisk),
+            ("GET", r"/linode/instances/" + _ID + r"/disks/" + _ID, self._getChild("disks")),
+            ("PUT", r"/linode/instances/" + _ID + r"/disks/" + _ID, self._updateChild("disks")),
+            ("DELETE", r"/linode/instances/" + _ID + r"/disks/" + _ID, self._deleteChild("disks")),
+            ("POST", r"/linode/instances/" + _ID + r"/disks/" + _ID + r"/(clone|password)", self._diskAction),
+            ("POST", r"/linode/instances/" + _ID + r"/disks/" + _ID + r"/resize", self._resizeDisk),
+            ("GET", r"/linode/instances/" + _ID + r"/ips", self._listIPs),
+            ("POST", r"/linode/instances/" + _ID + r"/ips", self._allocateIP),
+            ("GET", r"/linode/instances/" + _ID + r"/ips/([\w.:]+)", self._getIP),
+            ("PUT", r"/linode/instances/" + _ID + r"/ips/([\w.:]+)", self._updateIP),
+            ("DELETE", r"/linode/instances/" + _ID + r"/ips/([\w.:]+)", self._deleteIP),
+        )]
+
+    # Setup:
+
+    def addInstances(self, count:int, **fields):
+        """Create linodes directly in the fake state.
+
+        Args:
+            count: Number of linodes to create.
+            fields: Fields every linode gets (defaults are picked round-robin).
+
+        Returns:
+            The list of new linode IDs.
+        """
+        ids = []
+        with self._lock:
+            for n in range(count):
+                data = {
+                    "region": REGIONS[n % len(REGIONS)],
+                    "type": TYPES[n % len(TYPES)],
+                    "image": IMAGES[n % len(IMAGES)],
+                    "status": "running",
+                }
+                data.update(fields)
+                ids.append(self._newInstance(data)['id'])
+        return ids
+
+    def mount(self, client):
+        """Route a `linodeClient` (or `Transport`) through this fake, in-process.
+
+        Returns:
+            The `MockAdapter` mounted on the client's session.
+        """
+        transport = getattr(client, "transport", client)
+        adapter = MockAdapter(self, transport.baseURL)
+        transport.session.mount(transport.baseURL, adapter)
+        self.uploadURL = transport.baseURL + "/mock-upload"
+        return adapter
+
+    def serve(self, host="127.0.0.1", port=0):
+        """Serve this fake over HTTP from a background thread.
+
+        Returns:
+            The running `http.server.ThreadingHTTPServer`; its API base URL
+            is `server.url` and `server.shutdown()` stops it.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _chunked(self):
+                while True:
+                    size = int(self.rfile.readline().split(b";")[0], 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        return
+                    yield self.rfile.read(size)
+                    self.rfile.readline()
+
+            def _sized(self, length):
+                while length > 0:
+                    chunk = self.rfile.read(min(length, 65536))
+                    if not chunk:
+                        return
+                    length -= len(chunk)
+                    yield chunk
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                    body = self._chunked()
+                elif "/mock-upload/" in self.path:
+                    body = self._sized(length)
+                else:
+                    body = self.rfile.read(length) if length else b""
+                status, headers, content = api.handle(self.command, self.path, dict(self.headers), body)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        server.url = f"http://{host}:{server.server_address[1]}/v4"
+        self.uploadURL = server.url + "/mock-upload"
+        threading.Thread(target=server.serve_forever, name="mylinode-mock", daemon=True).start()
+        return server
+
+    # Dispatch:
+
+    def handle(self, method:str, url:str, headers=None, body=b""):
+        """Answer one request.
+
+        Args:
+            method: The HTTP method.
+            url: The request URL or path (with `/v4` prefix and query string).
+            headers: The request headers.
+            body: The raw request body (an iterable of chunks for image uploads).
+
+        Returns:
+            A tuple of status code, headers dictionary and raw body.
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        parts = urlsplit(url)
+        path = parts.path
+        if path.startswith("/v4"):
+            path = path[3:]
+        query = dict(parse_qsl(parts.query))
+        if path.startswith("/mock-upload/") and method.upper() == "PUT":
+            return self.receiveUpload(path[len("/mock-upload/"):], body)
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        responseHeaders = {"Content-Type": "application/json"}
+        with self._lock:
+            self.requests += 1
+            limited = self._limited(responseHeaders)
+            failing = self.failNext > 0 or (self.errorRate and self.random.random() < self.errorRate)
+            if self.failNext > 0:
+                self.failNext -= 1
+        try:
+            if limited:
+                raise _Error(429, "Too many requests")
+            if failing:
+                raise _Error(500, "Internal server error")
+            try:
+                payload = json.loads(body) if body else {}
+            except ValueError:
+                raise _Error(400, "Invalid JSON")
+            status, result = self._dispatch(method.upper(), path, query, headers, payload)
+        except _Error as error:
+            status = error.status
+            reason = {"reason": error.reason}
+            if error.field:
+                reason["field"] = error.field
+            result = {"errors": [reason]}
+        return status, responseHeaders, json.dumps(result).encode()
+
+    def receiveUpload(self, imageID:str, chunks):
+        """Sink of the pre-signed image upload URL.
+
+        Consumes the body chunk by chunk, records its size, SHA-256 and
+        whether it is gzip in `uploads`, and marks the image available.
+
+        Returns:
+            A tuple of status code, headers dictionary and raw body.
+        """
+        import hashlib
+
+        if isinstance(chunks, (bytes, bytearray)):
+            chunks = (bytes(chunks),)
+        digest = hashlib.sha256()
+        size = 0
+        head = b""
+        for chunk in chunks:
+            if len(head) < 2:
+                head += chunk[:2]
+            digest.update(chunk)
+            size += len(chunk)
+        with self._lock:
+            if self.failUploads > 0:
+                self.failUploads -= 1
+                return 500, {"Content-Type": "text/plain"}, b"upload failed"
+            image = self.images.get(imageID)
+            if image is None:
+                return 404, {"Content-Type": "text/plain"}, b"no such upload"
+            self.uploads[imageID] = {"bytes": size, "sha256": digest.hexdigest(), "gzip": head[:2] == b"\x1f\x8b"}
+            image["status"] = "available"
+            image["size"] = max(1, size // (1024 * 1024))
+        return 200, {"Content-Type": "text/plain"}, b""
+
+    def _limited(self, headers):
+        if not self.rateLimit:
+            return False
+        limit, per = self.rateLimit
+        now = time.time()
+        self._window = [i for i in self._window if now - i < per]
+        reset = math.ceil((self._window[0] if self._window else now) + per)
+        headers["X-RateLimit-Limit"] = str(limit)
+        headers["X-RateLimit-Reset"] = str(reset)
+        if len(self._window) >= limit:
+            headers["X-RateLimit-Remaining"] = "0"
+            headers["Retry-After"] = str(max(1, reset - int(now)))
+            return True
+        self._window.append(now)
+        headers["X-RateLimit-Remaining"] = str(limit - len(self._window))
+        return False
+
+    def _dispatch(self, method, path, query, headers, payload):
+        known = False
+        for routeMethod, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            known = True
+            if routeMethod == method:
+                with self._lock:
+                    self._settle()
+                    return handler(*match.groups(), query=query, headers=headers, payload=payload)
+        if known:
+            raise _Error(405, "Method not allowed")
+        raise _Error(404, "Not found")
+
+    def _page(self, records, query, headers):
+        flt = headers.get("x-filter")
+        if flt:
+            try:
+                flt = json.loads(flt)
+            except ValueError:
+                raise _Error(400, "Invalid X-Filter")
+            records = [i for i in records if matchesFilter(i, flt)]
+            if "+order_by" in flt:
+                records = sorted(records, key=lambda i: (i.get(flt["+order_by"]) is None, i.get(flt["+order_by"])), reverse=flt.get("+order") == "desc")
+        pageSize = int(query.get("page_size", 100))
+        if not 25 <= pageSize <= 500:
+            raise _Error(400, "Must be between 25 and 500", "page_size")
+        page = int(query.get("page", 1))
+        pages = max(1, -(-len(records) // pageSize))
+        start = (page - 1) * pageSize
+        return 200, {"data": records[start:start + pageSize], "page": page, "pages": pages, "results": len(records)}
+
+    def _newID(self):
+        self._nextID += 1
+        return self._nextID
+
+    def _instance(self, linodeID):
+        instance = self.instances.get(int(linodeID))
+        if instance is None:
+            raise _Error(404, "Not found")
+        return instance
+
+    def _transition(self, key, record, busy, final):
+        record["status"] = busy
+        record["updated"] = _now()
+        self._pending[key] = (time.monotonic() + self.transition, record, final)
+        if not self.transition:
+            self._settle()
+
+    def _settle(self):
+        now = time.monotonic()
+        for key, (due, record, final) in list(self._pending.items()):
+            if now >= due:
+                record["status"] = final
+                record["updated"] = _now()
+                del self._pending[key]
+
+    # Catalogs:
+
+    def _listRegions(self, query, headers, payload):
+        return self._page([{"id": i, "country": i.split("-")[0], "status": "ok"} for i in REGIONS], query, headers)
+
+    def _listTypes(self, query, headers, payload):
+        return self._page([{"id": i, "vcpus": v, "memory": m, "disk": d} for i, (v, m, d) in SPECS.items()], query, headers)
+
+    def _listKernels(self, query, headers, payload):
+        return self._page([{"id": i, "label": i, "kvm": True} for i in KERNELS], query, headers)
+
+    def _getKernel(self, kernelID, query, headers, payload):
+        if kernelID not in KERNELS:
+            raise _Error(404, "Not found")
+        return 200, {"id": kernelID, "label": kernelID, "kvm": True}
+
+    # Images:
+
+    def _image(self, imageID, public, **fields):
+        data = {"id": imageID, "label": imageID.split("/")[-1], "is_public": public, "status": "available",
+                "type": "manual" if public else "automatic", "size": 2500, "created": _now(), "vendor": None,
+                "description": "", "deprecated": False, "capabilities": [], "tags": []}
+        data.update(fields)
+        return data
+
+    def _listImages(self, query, headers, payload):
+        return self._page(list(self.images.values()), query, headers)
+
+    def _getImage(self, imageID, query, headers, payload):
+        if imageID not in self.images:
+            raise _Error(404, "Not found")
+        return 200, self.images[imageID]
+
+    def _createImage(self, query, headers, payload):
+        imageID = f"private/{self._newID()}"
+        self.images[imageID] = self._image(imageID, False, label=payload.get("label") or imageID)
+        return 200, self.images[imageID]
+
+    def _uploadImage(self, query, headers, payload):
+        for field in ("label", "region"):
+            if field not in payload:
+                raise _Error(400, f"{field} is required", field)
+        imageID = f"private/{self._newID()}"
+        self.images[imageID] = self._image(imageID, False, label=payload["label"], status="pending_upload")
+        return 200, {"image": self.images[imageID], "upload_to": f"{self.uploadURL}/{imageID}"}
+
+    def _deleteImage(self, imageID, query, headers, payload):
+        if self.images.pop(imageID, None) is None:
+            raise _Error(404, "Not found")
+        return 200, {}
+
+    # Instances:
+
+    def _newInstance(self, data):
+        linodeID = self._newID()
+        vcpus, memory, disk = SPECS.get(data.get("type"), (1, 1024, 25600))
+        created = _now()
+        instance = {
+            "id": linodeID,
+            "label": data.get("label") or f"linode{linodeID}",
+            "region": data.get("region"),
+            "type": data.get("type"),
+            "image": data.get("image"),
+            "status": data.get("status", "provisioning"),
+            "group": data.get("group", ""),
+            "tags": list(data.get("tags", [])),
+            "hypervisor": "kvm",
+            "ipv4": [f"10.{linodeID // 65536 % 256}.{linodeID // 256 % 256}.{linodeID % 256}"],
+            "ipv6": f"2600:3c00::{linodeID:x}/128",
+            "specs": {"disk": disk, "memory": memory, "vcpus": vcpus, "transfer": 4000, "gpus": 0},
+            "alerts": {"cpu": 180, "io": 10000, "network_in": 10, "network_out": 10, "transfer_quota": 80},
+            "backups": {"enabled": bool(data.get("backups_enabled")), "available": False, "schedule": {"day": None, "window": None}, "last_successful": None},
+            "watchdog_enabled": True,
+            "created": created,
+            "updated": created,
+        }
+        self.instances[linodeID] = instance
+        rootID, swapID = self._newID(), self._newID()
+        self.disks[linodeID] = {
+            rootID: {"id": rootID, "label": f"{instance['image'] or 'blank'} Disk", "status": "ready", "size": disk - 512, "filesystem": "ext4", "created": created, "updated": created},
+            swapID: {"id": swapID, "label": "512 MB Swap Image", "status": "ready", "size": 512, "filesystem": "swap", "created": created, "updated": created},
+        }
+        configID = self._newID()
+        self.configs[linodeID] = {configID: {
+            "id": configID, "label": "My Config", "kernel": "linode/grub2", "comments": "", "memory_limit": 0,
+            "run_level": "default", "virt_mode": "paravirt", "root_device": "/dev/sda",
+            "devices": {"sda": {"disk_id": rootID, "volume_id": None}, "sdb": {"disk_id": swapID, "volume_id": None}},
+            "helpers": {"updatedb_disabled": True, "distro": True, "modules_dep": True, "network": True, "devtmpfs_automount": True},
+            "interfaces": [], "created": created, "updated": created,
+        }}
+        address = instance["ipv4"][0]
+        self.ips[linodeID] = {address: {"address": address, "gateway": None, "subnet_mask": "255.255.255.0", "prefix": 24, "type": "ipv4", "public": True, "rdns": None, "linode_id": linodeID, "region": instance["region"]}}
+        self.backups[linodeID] = {"automatic": [], "snapshot": {"current": None, "in_progress": None}}
+        return instance
+
+    def _listInstances(self, query, headers, payload):
+        return self._page(list(self.instances.values()), query, headers)
+
+    def _createInstance(self, query, headers, payload):
+        for field, choices in (("region", REGIONS), ("type", SPECS)):
+            if payload.get(field) not in choices:
+                raise _Error(400, f"{field} is not valid", field)
+        if payload.get("image") and payload["image"] not in self.images:
+            raise _Error(400, "image is not valid", "image")
+        if payload.get("label") and any(i["label"] == payload["label"] for i in self.instances.values()):
+            raise _Error(400, "Label must be unique among your linodes", "label")
+        instance = self._newInstance(dict(payload, status="provisioning"))
+        self._transition(("instance", instance["id"]), instance, "provisioning", "running" if payload.get("booted", True) else "offline")
+        return 200, instance
+
+    def _getInstance(self, linodeID, query, headers, payload):
+        return 200, self._instance(linodeID)
+
+    def _updateInstance(self, linodeID, query, headers, payload):
+        instance = self._instance(linodeID)
+        for key in ("label", "group", "tags", "alerts", "watchdog_enabled"):
+            if key in payload:
+                instance[key] = payload[key]
+        instance["updated"] = _now()
+        return 200, instance
+
+    def _deleteInstance(self, linodeID, query, headers, payload):
+        instance = self._instance(linodeID)
+        for store in (self.instances, self.disks, self.configs, self.ips, self.backups):
+            store.pop(instance["id"], None)
+        self._pending.pop(("instance", instance["id"]), None)
+        return 200, {}
+
+    def _power(self, linodeID, action, query, headers, payload):
+        instance = self._instance(linodeID)
+        busy, final = {"boot": ("booting", "running"), "reboot": ("rebooting", "running"), "shutdown": ("shutting_down", "offline")}[action]
+        self._transition(("instance", instance["id"]), instance, busy, final)
+        return 200, {}
+
+    def _instanceAction(self, linodeID, action, query, headers, payload):
+        instance = self._instance(linodeID)
+        if action == "rebuild":
+            instance["image"] = payload.get("image", instance["image"])
+            self._transition(("instance", instance["id"]), instance, "rebuilding", "running")
+            return 200, instance
+        return 200, {}
+
+    def _cloneInstance(self, linodeID, query, headers, payload):
+        source = self._instance(linodeID)
+        data = dict(source, label=payload.get("label"), status="provisioning", tags=list(source["tags"]))
+        data.update({k: v for k, v in payload.items() if k in ("region", "type", "group")})
+        clone = self._newInstance(data)
+        self._transition(("instance", clone["id"]), clone, "provisioning", "offline")
+        return 200, clone
+
+    def _stats(self, linodeID, query, headers, payload):
+        self._instance(linodeID)
+        rng = random.Random(int(linodeID))
+        start = int(time.time() // 300 * 300 - 86400) * 1000
+        series = lambda scale: [[start + 300000 * i, rng.random() * scale] for i in range(288)]
+        return 200, {"title": f"linode{linodeID} - day", "data": {
+            "cpu": series(100),
+            "io": {"io": series(50), "swap": series(1)},
+            "netv4": {"in": series(5000), "out": series(5000), "private_in": series(100), "private_out": series(100)},
+            "netv6": {"in": series(500), "out": series(500), "private_in": series(10), "private_out": series(10)},
+        }}
+
+    def _emptyList(self, linodeID, query, headers, payload):
+        self._instance(linodeID)
+        return self._page([], query, headers)
+
+    # Backups:
+
+    def _listBackups(self, linodeID, query, headers, payload):
+        return 200, self.backups[self._instance(linodeID)["id"]]
+
+    def _snapshot(self, linodeID, query, headers, payload):
+        instance = self._instance(linodeID)
+        backupID = self._newID()
+        backup = {"id": backupID, "label": payload.get("label"), "status": "successful", "type": "snapshot",
+                  "region": instance["region"], "created": _now(), "updated": _now(), "finished": _now(), "available": True,
+                  "configs": [c["label"] for c in self.configs[instance["id"]].values()],
+                  "disks": [{"label": d["label"], "size": d["size"], "filesystem": d["filesystem"]} for d in self.disks[instance["id"]].values()]}
+        self.backups[instance["id"]]["snapshot"]["current"] = backup
+        return 200, backup
+
+    def _backupSettings(self, linodeID, action, query, headers, payload):
+        self._instance(linodeID)["backups"]["enabled"] = action == "enable"
+        return 200, {}
+
+    def _findBackup(self, linodeID, backupID):
+        backups = self.backups[self._instance(linodeID)["id"]]
+        for backup in backups["automatic"] + [backups["snapshot"]["current"], backups["snapshot"]["in_progress"]]:
+            if backup and backup["id"] == int(backupID):
+                return backup
+        raise _Error(404, "Not found")
+
+    def _getBackup(self, linodeID, backupID, query, headers, payload):
+        return 200, self._findBackup(linodeID, backupID)
+
+    def _restoreBackup(self, linodeID, backupID, query, headers, payload):
+        self._findBackup(linodeID, backupID)
+        target = self._instance(payload.get("linode_id", linodeID))
+        self._transition(("instance", target["id"]), target, "restoring", "offline")
+        return 200, {}
+
+    # Configs and disks:
+
+    def _children(self, kind, linodeID):
+        return getattr(self, kind)[self._instance(linodeID)["id"]]
+
+    def _child(self, kind, linodeID, childID):
+        child = self._children(kind, linodeID).get(int(childID))
+        if child is None:
+            raise _Error(404, "Not found")
+        return child
+
+    def _listChildren(self, kind):
+        def handler(linodeID, query, headers, payload):
+            return self._page(list(self._children(kind, linodeID).values()), query, headers)
+        return handler
+
+    def _getChild(self, kind):
+        def handler(linodeID, childID, query, headers, payload):
+            return 200, self._child(kind, linodeID, childID)
+        return handler
+
+    def _updateChild(self, kind):
+        def handler(linodeID, childID, query, headers, payload):
+            child = self._child(kind, linodeID, childID)
+            child.update({k: v for k, v in payload.items() if k not in ("id", "created", "status", "size")})
+            child["updated"] = _now()
+            return 200, child
+        return handler
+
+    def _deleteChild(self, kind):
+        def handler(linodeID, childID, query, headers, payload):
+            self._child(kind, linodeID, childID)
+            del self._children(kind, linodeID)[int(childID)]
+            return 200, {}
+        return handler
+
+    def _createConfig(self, linodeID, query, headers, payload):
+        configs = self._children("configs", linodeID)
+        if "label" not in payload or "devices" not in payload:
+            raise _Error(400, "label and devices are required")
+        configID = self._newID()
+        configs[configID] = dict({"kernel": "linode/grub2", "comments": "", "memory_limit": 0, "run_level": "default",
+                                  "virt_mode": "paravirt", "root_device": "/dev/sda", "helpers": {}, "interfaces": []},
+                                 **payload, id=configID, created=_now(), updated=_now())
+        return 200, configs[configID]
+
+    def _createDisk(self, linodeID, query, headers, payload):
+        disks = self._children("disks", linodeID)
+        if not payload.get("size"):
+            raise _Error(400, "size is required", "size")
+        diskID = self._newID()
+        disks[diskID] = {"id": diskID, "label": payload.get("label") or f"disk{diskID}", "status": "not ready",
+                         "size": payload["size"], "filesystem": payload.get("filesystem", "ext4"), "created": _now(), "updated": _now()}
+        self._transition(("disk", diskID), disks[diskID], "not ready", "ready")
+        return 200, disks[diskID]
+
+    def _diskAction(self, linodeID, diskID, action, query, headers, payload):
+        disk = self._child("disks", linodeID, diskID)
+        if action == "clone":
+            return self._createDisk(linodeID, query, headers, {"size": disk["size"], "label": disk["label"] + " clone", "filesystem": disk["filesystem"]})
+        return 200, {}
+
+    def _resizeDisk(self, linodeID, diskID, query, headers, payload):
+        disk = self._child("disks", linodeID, diskID)
+        if self._instance(linodeID)["status"] not in ("offline",):
+            raise _Error(400, "Linode must be shut down to resize a disk")
+        disk["size"] = payload.get("size", disk["size"])
+        self._transition(("disk", disk["id"]), disk, "resizing", "ready")
+        return 200, {}
+
+    # IPs:
+
+    def _listIPs(self, linodeID, query, headers, payload):
+        ips = list(self._children("ips", linodeID).values())
+        return 200, {"ipv4": {"public": [i for i in ips if i["public"]], "private": [i for i in ips if not i["public"]], "shared": [], "reserved": []}, "ipv6": None}
+
+    def _allocateIP(self, linodeID, query, headers, payload):
+        ips = self._children("ips", linodeID)
+        n = self._newID()
+        address = f"192.168.{n // 256 % 256}.{n % 256}" if not payload.get("public") else f"172.16.{n // 256 % 256}.{n % 256}"
+        ips[address] = {"address": address, "gateway": None, "subnet_mask": "255.255.128.0", "prefix": 17, "type": "ipv4",
+                        "public": bool(payload.get("public")), "rdns": None, "linode_id": int(linodeID), "region": self._instance(linodeID)["region"]}
+        return 200, ips[address]
+
+    def _ip(self, linodeID, address):
+        ip = self._children("ips", linodeID).get(address)
+        if ip is None:
+            raise _Error(404, "Not found")
+        return ip
+
+    def _getIP(self, linodeID, address, query, headers, payload):
+        return 200, self._ip(linodeID, address)
+
+    def _updateIP(self, linodeID, address, query, headers, payload):
+        ip = self._ip(linodeID, address)
+        ip["rdns"] = payload.get("rdns")
+        return 200, ip
+
+    def _deleteIP(self, linodeID, address, query, headers, payload):
+        self._ip(linodeID, address)
+        del self._children("ips", linodeID)[address]
+        return 200, {}
+
+
+class MockAdapter(BaseAdapter):
+    def __init__(self, api, baseURL=BASE_URL) -> None:
+        """requests transport adapter answering from a `MockLinodeAPI`, no sockets involved.
+
+        Args:
+            api: The `MockLinodeAPI`.
+            baseURL: The API base URL the adapter is mounted on.
+        """
+        super().__init__()
+        self.api = api
+        self.baseURL = baseURL.rstrip("/")
+
+    def send(self, request, **kwargs):
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode()
+        elif hasattr(body, "read"):
+            reader = body
+            body = iter(lambda: reader.read(65536), b"")
+        elif not isinstance(body, bytes):
+            body = iter(body)
+        if isinstance(body, bytes) or "/mock-upload/" not in request.url:
+            body = body if isinstance(body, bytes) else b"".join(body)
+        path = request.url[len(self.baseURL):] if request.url.startswith(self.baseURL) else request.url
+        status, headers, content = self.api.handle(request.method, path, dict(request.headers), body)
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response.raw = io.BytesIO(content)
+        if not kwargs.get("stream"):
+            response._content = content
+        response.url = request.url
+        response.request = request
+        response.reason = "OK" if status < 400 else "Error"
+        return response
+
+    def close(self):
+        pass
@@ -0,0 +1,159 @@
+import sys
+
+_INTERNED = frozenset(("region", "type", "status", "image", "hypervisor", "filesystem", "kernel", "virt_mode", "run_level", "vendor"))
+
+
+class Record:
+    __slots__ = ("_data",)
+
+    def __init__(self, data) -> None:
+        """Read-only attribute view of a nested json object."""
+        self._data = data
+
+    def __getattr__(self, name):
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name):
+        return self._data[name]
+
+    def toDict(self):
+        return self._data
+
+    def __repr__(self):
+        return f"Record({self._data!r})"
+
+
+def _tuple(value):
+    return tuple(value)
+
+
+def _record(value):
+    return Record(value)
+
+
+def _records(value):
+    return tuple(Record(i) if isinstance(i, dict) else i for i in value)
+
+
+class _Lazy:
+    __slots__ = ("name", "slot", "decoder")
+
+    def __init__(self, name, decoder) -> None:
+        self.name = name
+        self.slot = "_" + name
+        self.decoder = decoder
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if type(value) is dict or type(value) is list:
+            value = self.decoder(value)
+            setattr(obj, self.slot, value)
+        return value
+
+
+class _ModelMeta(type):
+    def __new__(mcs, name, bases, namespace):
+        fields = namespace.get("_fields", ())
+        nested = namespace.get("_nested", {})
+        namespace.setdefault("__slots__", tuple(fields) + tuple("_" + i for i in nested))
+        for field, decoder in nested.items():
+            namespace[field] = _Lazy(field, decoder)
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class Model(metaclass=_ModelMeta):
+    __slots__ = ("_raw",)
+    _fields = ()
+    _nested = {}
+
+    def __init__(self, data:dict, keepRaw=False) -> None:
+        """Compact object built from an API json.
+
+        Scalar fields are copied into `__slots__` (common strings such as
+        region, type and status are interned); nested objects and lists are
+        only decoded the first time they are read.
+
+        Args:
+            data: The json of the object.
+            keepRaw: Keep a reference to `data`, available as `raw`.
+        """
+        get = data.get
+        for field in self._fields:
+            value = get(field)
+            if field in _INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, field, value)
+        for field in self._nested:
+            setattr(self, "_" + field, get(field))
+        self._raw = data if keepRaw else None
+
+    @property
+    def raw(self):
+        """Returns the json the object was built from (None unless `keepRaw`)."""
+        return self._raw
+
+    def toDict(self):
+        """Convert the object back to a json dictionary.
+
+        Returns:
+            The original json if it was kept, otherwise one rebuilt from the fields.
+        """
+        if self._raw is not None:
+            return self._raw
+        data = {field: getattr(self, field) for field in self._fields}
+        for field in self._nested:
+            value = getattr(self, field)
+            if isinstance(value, Record):
+                value = value.toDict()
+            elif isinstance(value, tuple):
+                value = [i.toDict() if isinstance(i, (Record, Model)) else i for i in value]
+            elif isinstance(value, Model):
+                value = value.toDict()
+            data[field] = value
+        return data
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r}, label={getattr(self, 'label', None)!r})"
+
+
+class Specs(Model):
+    _fields = ("disk", "memory", "vcpus", "transfer", "gpus")
+
+    def __repr__(self):
+        return f"Specs(vcpus={self.vcpus!r}, memory={self.memory!r}, disk={self.disk!r})"
+
+
+class Instance(Model):
+    _fields = ("id", "label", "region", "type", "image", "status", "group", "hypervisor", "ipv6", "created", "updated", "watchdog_enabled")
+    _nested = {"tags": _tuple, "ipv4": _tuple, "specs": Specs, "alerts": _record, "backups": _record}
+
+
+class Disk(Model):
+    _fields = ("id", "label", "status", "size", "filesystem", "created", "updated")
+
+
+class Config(Model):
+    _fields = ("id", "label", "kernel", "comments", "memory_limit", "run_level", "virt_mode", "root_device", "created", "updated")
+    _nested = {"devices": _record, "helpers": _record, "interfaces": _records}
+
+
+class IPAddress(Model):
+    _fields = ("address", "gateway", "subnet_mask", "prefix", "type", "public", "rdns", "linode_id", "region")
+
+    def __repr__(self):
+        return f"IPAddress({self.address!r}, public={self.public!r})"
+
+
+class Backup(Model):
+    _fields = ("id", "label", "status", "type", "region", "created", "updated", "finished", "available")
+    _nested = {"configs": _tuple, "disks": _records}
+
+
+class Image(Model):
+    _fields = ("id", "label", "description", "created", "created_by", "deprecated", "is_public", "size", "type", "vendor", "status", "expiry", "eol", "updated")
+    _nested = {"capabilities": _tuple, "tags": _tuple}
@@ -0,0 +1,83 @@
+from .query import toQuery
+from .response import handleResponse
+
+MAX_PAGE_SIZE = 500
+
+
+def iterPages(transport, path:str, pageSize=100, prefetch=True, params=None, headers=None, handler=handleResponse):
+    """Walk every page of a paginated list endpoint.
+
+    While the caller consumes page N, page N+1 is already being fetched in the
+    background, so at most two pages are held in memory at once.
+
+    Args:
+        transport: The `Transport` to send the requests through.
+        path: The list endpoint, for example `/linode/instances`.
+        pageSize: Results per page (25 to 500).
+        prefetch: Fetch the next page in the background.
+        params: Extra query parameters (optional).
+        headers: Extra headers, for example `X-Filter` (optional).
+        handler: Callable turning a response into the decoded page.
+
+    Yields:
+        The `data` list of every page.
+    """
+    if not 25 <= pageSize <= MAX_PAGE_SIZE:
+        raise ValueError(f"Page size has to be between 25 and {MAX_PAGE_SIZE}.")
+    params = dict(params or {})
+
+    def fetch(page):
+        query = dict(params, page=page, page_size=pageSize)
+        return handler(transport.get(path, params=query, headers=headers))
+
+    response = fetch(1)
+    pages = response.get('pages', 1)
+    if not prefetch or pages <= 1:
+        yield response['data']
+        for page in range(2, pages + 1):
+            yield fetch(page)['data']
+        return
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for page in range(2, pages + 1):
+            upcoming = executor.submit(fetch, page)
+            data = response['data']
+            response = None
+            yield data
+            data = None
+            response = upcoming.result()
+        yield response['data']
+
+
+def iterRecords(transport, path:str, pageSize=100, prefetch=True, params=None, headers=None, handler=handleResponse, query=None):
+    """Walk every record of a paginated list endpoint.
+
+    Args:
+        Same as `iterPages`, plus:
+        query: A `Query`, filter expression or raw `X-Filter` dictionary; its
+        server-side part is sent as `X-Filter` and the rest filters the stream.
+
+    Yields:
+        Every (matching) record of every page.
+    """
+    query = toQuery(query)
+    if query is not None:
+        headers = dict(headers or {}, **query.headers())
+    records = (record for data in iterPages(transport, path, pageSize, prefetch, params, headers, handler) for record in data)
+    if query is not None:
+        records = query.apply(records)
+    yield from records
+
+
+def collect(transport, path:str, pageSize=MAX_PAGE_SIZE, params=None, headers=None, handler=handleResponse, query=None):
+    """Fetch every page of a list endpoint into one response.
+
+    Args:
+        Same as `iterRecords`.
+
+    Returns:
+        A response json with every record in `data` as if it was a single page.
+    """
+    data = list(iterRecords(transport, path, pageSize, True, params, headers, handler, query))
+    return {"data": data, "page": 1, "pages": 1, "results": len(data)}
@@ -0,0 +1,178 @@
+import json
+import random
+import time
+
+from .errors import LinodeError, BadRequestError, ServerError
+from .query import F
+from .response import handleResponse
+
+# Fields left out of the idempotency key: secrets, and ones that do not make two nodes different.
+_UNKEYED = ("root_pass", "authorized_keys", "authorized_users", "stackscript_data", "label", "tags")
+LABEL_LENGTH = 64
+
+
+def idempotencyLabel(spec:dict, prefix="node", occurrence=0):
+    """Derive a deterministic label for a create request.
+
+    The same spec (and occurrence of it within a batch) always gives the same
+    label, and labels are unique per account, so a retried batch finds the
+    nodes an earlier attempt created instead of creating them again.
+
+    Args:
+        spec: The create request.
+        prefix: Label prefix.
+        occurrence: Index of the spec among identical specs of the batch.
+
+    Returns:
+        The label.
+    """
+    import hashlib
+
+    keyed = {k: v for k, v in spec.items() if k not in _UNKEYED}
+    digest = hashlib.sha256(json.dumps(keyed, sort_keys=True, separators=(",", ":")).encode()).hexdigest()[:12]
+    suffix = f"-{digest}-{occurrence}"
+    return prefix[:LABEL_LENGTH - len(suffix)] + suffix
+
+
+class ProvisionResult:
+    __slots__ = ("index", "label", "status", "instance", "error", "attempts")
+
+    def __init__(self, index, label, status, instance=None, error=None, attempts=0) -> None:
+        """Outcome of one node of a batch provisioning.
+
+        Args:
+            index: Index of the spec in the batch.
+            label: The idempotency label of the node.
+            status: `created`, `existing` (created by an earlier attempt) or `failed`.
+            instance: The json of the linode (None if failed).
+            error: The exception of the last attempt (None unless failed).
+            attempts: Create requests sent for the node.
+        """
+        self.index = index
+        self.label = label
+        self.status = status
+        self.instance = instance
+        self.error = error
+        self.attempts = attempts
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def linodeID(self):
+        return self.instance["id"] if self.instance else None
+
+    def toDict(self):
+        return {
+            "index": self.index,
+            "label": self.label,
+            "status": self.status,
+            "linodeID": self.linodeID,
+            "error": str(self.error) if self.error is not None else None,
+            "attempts": self.attempts,
+        }
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"ProvisionResult({self.index}, {self.label!r}, error={self.error!r})"
+        return f"ProvisionResult({self.index}, {self.label!r}, {self.status!r}, linodeID={self.linodeID!r})"
+
+
+def _findByLabels(client, labels):
+    found = {}
+    labels = list(labels)
+    for start in range(0, len(labels), 100):
+        for record in client.iterLinodes(pageSize=500, filter=F("label").isIn(labels[start:start + 100])):
+            found[record["label"]] = record
+    return found
+
+
+def _create(client, index, label, data, retries):
+    import requests
+
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return ProvisionResult(index, label, "created", handleResponse(client.transport.post("/linode/instances", json=data)), attempts=attempt)
+        except BadRequestError as error:
+            if "label" not in error.fields:
+                return ProvisionResult(index, label, "failed", error=error, attempts=attempt)
+            # The label is taken: an earlier attempt (or batch) created the node.
+            found = _findByLabels(client, [label]).get(label)
+            if found is None:
+                return ProvisionResult(index, label, "failed", error=error, attempts=attempt)
+            return ProvisionResult(index, label, "existing", found, attempts=attempt)
+        except (ServerError, requests.ConnectionError, requests.Timeout) as error:
+            # The create may or may not have happened; look before sending it again.
+            try:
+                found = _findByLabels(client, [label]).get(label)
+            except (LinodeError, requests.RequestException):
+                found = None
+            if found is not None:
+                return ProvisionResult(index, label, "created", found, attempts=attempt)
+            if attempt > retries:
+                return ProvisionResult(index, label, "failed", error=error, attempts=attempt)
+        except LinodeError as error:
+            return ProvisionResult(index, label, "failed", error=error, attempts=attempt)
+        time.sleep(random.uniform(0, min(30, 2 ** attempt)))
+
+
+def provision(client, specs, maxInFlight=8, retries=2, prefix="node"):
+    """Create many linodes at once, safely retryable.
+
+    Every region, type and image of the batch is validated once against the
+    cached catalogs before anything is sent. Each spec gets a deterministic
+    idempotency label (its own `label` if it has one, else
+    `idempotencyLabel`); nodes whose label already exists are reported as
+    `existing` without a create. The creates are then sent on `maxInFlight`
+    workers, paced by the transport's rate limiter. A create that timed out
+    or failed with a server error is looked up by label before it is sent
+    again, so a lost response never creates a duplicate.
+
+    Args:
+        client: The `linodeClient`.
+        specs: Iterable of create requests (dictionaries with `region`, `type`,
+        `image`, `root_pass` and any other create field).
+        maxInFlight: Maximum number of concurrent creates.
+        retries: Retries of a create that failed without creating the node.
+        prefix: Prefix of the derived labels.
+
+    Raises:
+        ValueError: If a region, type or image is not found or two specs share a label.
+
+    Returns:
+        A `ProvisionResult` per spec, in spec order.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if maxInFlight < 1:
+        raise ValueError("maxInFlight has to be bigger or equals to one.")
+    specs = [{k: v for k, v in spec.items() if v} for spec in specs]
+    for kind in ("region", "type", "image"):
+        for value in sorted({str(spec[kind]) for spec in specs if spec.get(kind)}):
+            client.validateCatalog(**{kind: value})
+    labels, seen = [], {}
+    for spec in specs:
+        if spec.get("label"):
+            labels.append(spec["label"])
+            continue
+        key = json.dumps({k: v for k, v in spec.items() if k not in _UNKEYED}, sort_keys=True)
+        labels.append(idempotencyLabel(spec, prefix, seen.get(key, 0)))
+        seen[key] = seen.get(key, 0) + 1
+    if len(set(labels)) != len(labels):
+        raise ValueError("Every spec of a batch has to have its own label.")
+
+    existing = _findByLabels(client, labels)
+    results = [None] * len(specs)
+    pending = []
+    for index, (spec, label) in enumerate(zip(specs, labels)):
+        if label in existing:
+            results[index] = ProvisionResult(index, label, "existing", existing[label])
+        else:
+            pending.append((index, label, dict(spec, label=label)))
+    with ThreadPoolExecutor(max_workers=maxInFlight) as executor:
+        for result in executor.map(lambda item: _create(client, *item, retries), pending):
+            results[result.index] = result
+    return results
@@ -0,0 +1,299 @@
+import json
+
+_OPERATORS = {
+    "==": None,
+    "!=": "+neq",
+    ">": "+gt",
+    ">=": "+gte",
+    "<": "+lt",
+    "<=": "+lte",
+    "contains": "+contains",
+}
+
+
+def _lookup(record, name):
+    for part in name.split("."):
+        if isinstance(record, dict):
+            record = record.get(part)
+        else:
+            record = getattr(record, part, None)
+    return record
+
+
+def matchesFilter(record, query):
+    """Evaluate a Linode `X-Filter` query against a record, client-side.
+
+    Supports field equality, `+and`, `+or` and the `+gt`, `+gte`, `+lt`,
+    `+lte`, `+neq` and `+contains` operators; list fields match when they
+    contain the value. `+order_by`/`+order` are ignored here.
+
+    Returns:
+        True if the record matches.
+    """
+    for key, value in query.items():
+        if key in ("+order_by", "+order"):
+            continue
+        if key == "+and":
+            if not all(matchesFilter(record, i) for i in value):
+                return False
+        elif key == "+or":
+            if not any(matchesFilter(record, i) for i in value):
+                return False
+        elif not _matchesField(_lookup(record, key), value):
+            return False
+    return True
+
+
+def _matchesField(actual, expected):
+    if isinstance(expected, dict):
+        for op, operand in expected.items():
+            if op == "+or":
+                if not any(_matchesField(actual, i) for i in operand):
+                    return False
+                continue
+            if actual is None:
+                return op == "+neq"
+            if op == "+gt" and not actual > operand:
+                return False
+            if op == "+gte" and not actual >= operand:
+                return False
+            if op == "+lt" and not actual < operand:
+                return False
+            if op == "+lte" and not actual <= operand:
+                return False
+            if op == "+neq" and actual == operand:
+                return False
+            if op == "+contains" and str(operand) not in (actual if isinstance(actual, (list, tuple)) else str(actual)):
+                return False
+        return True
+    if isinstance(actual, (list, tuple)):
+        return expected in actual
+    return actual == expected
+
+
+class Node:
+    """Base of the filter expressions; combine them with `&` and `|`."""
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def compile(self, serverFields=None):
+        """Split the expression into what the API can filter and what it can not.
+
+        Args:
+            serverFields: Fields the endpoint can filter on (None allows any
+            top-level field).
+
+        Returns:
+            A tuple of the `X-Filter` dictionary (None if nothing can be sent)
+            and a client-side predicate (None if the API filters everything).
+        """
+        raise NotImplementedError
+
+    def matches(self, record):
+        raise NotImplementedError
+
+
+class Condition(Node):
+    def __init__(self, name:str, op:str, value) -> None:
+        self.name = name
+        self.op = op
+        self.value = value
+
+    def toFilter(self):
+        operator = _OPERATORS[self.op]
+        return {self.name: self.value if operator is None else {operator: self.value}}
+
+    def compile(self, serverFields=None):
+        if "." in self.name or (serverFields is not None and self.name not in serverFields):
+            return None, self.matches
+        return self.toFilter(), None
+
+    def matches(self, record):
+        return matchesFilter(record, self.toFilter())
+
+    def __repr__(self):
+        return f"(F({self.name!r}) {self.op} {self.value!r})"
+
+
+class Field:
+    def __init__(self, name:str) -> None:
+        """A record field to build conditions on, for example `F("region") == "us-east"`.
+
+        Dotted names such as `specs.vcpus` are evaluated client-side.
+        """
+        self.name = name
+
+    def __eq__(self, value):
+        return Condition(self.name, "==", value)
+
+    def __ne__(self, value):
+        return Condition(self.name, "!=", value)
+
+    def __gt__(self, value):
+        return Condition(self.name, ">", value)
+
+    def __ge__(self, value):
+        return Condition(self.name, ">=", value)
+
+    def __lt__(self, value):
+        return Condition(self.name, "<", value)
+
+    def __le__(self, value):
+        return Condition(self.name, "<=", value)
+
+    def contains(self, value):
+        return Condition(self.name, "contains", value)
+
+    def isIn(self, values):
+        """Condition matching any of `values`.
+
+        Raises:
+            ValueError: If `values` is empty (the API has no filter matching nothing).
+        """
+        values = list(values)
+        if not values:
+            raise ValueError(f"isIn of {self.name!r} needs at least one value.")
+        return Or(*[Condition(self.name, "==", i) for i in values])
+
+    __hash__ = None
+
+
+F = Field
+
+
+class And(Node):
+    def __init__(self, *parts) -> None:
+        self.parts = [i for part in parts for i in (part.parts if isinstance(part, And) else [part])]
+
+    def compile(self, serverFields=None):
+        filters, predicates = [], []
+        for part in self.parts:
+            server, client = part.compile(serverFields)
+            if server is not None:
+                filters.append(server)
+            if client is not None:
+                predicates.append(client)
+        server = None if not filters else filters[0] if len(filters) == 1 else {"+and": filters}
+        client = None if not predicates else predicates[0] if len(predicates) == 1 else (lambda record: all(p(record) for p in predicates))
+        return server, client
+
+    def matches(self, record):
+        return all(part.matches(record) for part in self.parts)
+
+    def __repr__(self):
+        return "(" + " & ".join(repr(i) for i in self.parts) + ")"
+
+
+class Or(Node):
+    def __init__(self, *parts) -> None:
+        self.parts = [i for part in parts for i in (part.parts if isinstance(part, Or) else [part])]
+
+    def compile(self, serverFields=None):
+        filters = []
+        for part in self.parts:
+            server, client = part.compile(serverFields)
+            if server is None or client is not None:
+                # One side the API can not express makes the whole OR client-side.
+                return None, self.matches
+            filters.append(server)
+        return (filters[0] if len(filters) == 1 else {"+or": filters}), None
+
+    def matches(self, record):
+        return any(part.matches(record) for part in self.parts)
+
+    def __repr__(self):
+        return "(" + " | ".join(repr(i) for i in self.parts) + ")"
+
+
+class Where(Node):
+    def __init__(self, predicate) -> None:
+        """Arbitrary client-side predicate taking a record."""
+        self.predicate = predicate
+
+    def compile(self, serverFields=None):
+        return None, self.predicate
+
+    def matches(self, record):
+        return bool(self.predicate(record))
+
+
+class Query:
+    def __init__(self, where=None, orderBy=None, order="asc", serverFields=None) -> None:
+        """Filter and ordering of a list request.
+
+        The parts the API can express are sent as the `X-Filter` header, so
+        only matching rows come over the wire; the rest is applied as a
+        streaming filter while the pages are walked.
+
+        Args:
+            where: A `Node` (for example `(F("region") == "us-east") & F("tags").contains("prod")`)
+            or a raw `X-Filter` dictionary.
+            orderBy: Field to order by (server-side).
+            order: `asc` or `desc`.
+            serverFields: Fields the endpoint can filter on (None allows any top-level field).
+        """
+        if order not in ("asc", "desc"):
+            raise ValueError("Order has to be `asc` or `desc`.")
+        self.where = where
+        self.orderBy = orderBy
+        self.order = order
+        self.serverFields = serverFields
+        if where is None:
+            server, client = None, None
+        elif isinstance(where, dict):
+            server, client = dict(where), None
+        else:
+            server, client = where.compile(serverFields)
+        self.serverFilter = server
+        self.clientPredicate = client
+
+    def filter(self, *parts):
+        """Returns a new query with more conditions AND-ed in."""
+        where = And(*([self.where] if self.where is not None else []), *parts)
+        return Query(where, self.orderBy, self.order, self.serverFields)
+
+    def orderedBy(self, field:str, order="asc"):
+        return Query(self.where, field, order, self.serverFields)
+
+    def toFilter(self):
+        """Returns the `X-Filter` dictionary (None if there is nothing to send)."""
+        query = {}
+        if self.serverFilter:
+            query.update(self.serverFilter)
+        if self.orderBy:
+            query["+order_by"] = self.orderBy
+            query["+order"] = self.order
+        return query or None
+
+    def headers(self):
+        """Returns the request headers carrying the `X-Filter` (may be empty)."""
+        query = self.toFilter()
+        return {"X-Filter": json.dumps(query, separators=(",", ":"))} if query else {}
+
+    def apply(self, records):
+        """Apply the client-side part of the query to a stream of records.
+
+        Yields:
+            Every matching record.
+        """
+        if self.clientPredicate is None:
+            yield from records
+            return
+        predicate = self.clientPredicate
+        for record in records:
+            if predicate(record):
+                yield record
+
+    def __repr__(self):
+        return f"Query(filter={self.serverFilter!r}, clientSide={self.clientPredicate is not None})"
+
+
+def toQuery(value):
+    """Normalize a `Query`, `Node` or raw `X-Filter` dictionary to a `Query` (None stays None)."""
+    if value is None or isinstance(value, Query):
+        return value
+    return Query(value)
@@ -0,0 +1,176 @@
+import re
+import threading
+import time
+
+# (name, methods, path pattern, requests, per seconds); the first match wins.
+DEFAULT_LIMITS = (
+    ("create", ("POST",), r"^/linode/instances$", 10, 30),
+    ("images", ("POST",), r"^/images(/upload)?$", 5, 60),
+    ("stats", None, r"/stats$", 50, 60),
+    ("read", ("GET", "HEAD", "OPTIONS"), r"", 1600, 60),
+    ("write", None, r"", 800, 60),
+)
+
+
+class TokenBucket:
+    def __init__(self, requests:int, per:float) -> None:
+        """Token bucket allowing `requests` calls every `per` seconds.
+
+        Args:
+            requests: Size of the bucket (burst) and calls allowed per window.
+            per: Length of the window in seconds.
+        """
+        self.capacity = float(requests)
+        self.rate = requests / per
+        self.tokens = float(requests)
+        self.updated = time.monotonic()
+        self.pausedUntil = 0.0
+        # Longest time to a window reset seen, the best estimate of the server's window.
+        self.window = 0.0
+        # Calls granted whose response was not seen yet: not counted in `X-RateLimit-Remaining`.
+        self.inFlight = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Take a token, sleeping until one is available.
+
+        Returns:
+            The time (in seconds) spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.pausedUntil and self.tokens >= 1:
+                    self.tokens -= 1
+                    self.inFlight += 1
+                    return waited
+                delay = max(self.pausedUntil - now, (1 - self.tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+
+    def observe(self, limit=None, remaining=None, resetAt=None):
+        """Adapt the bucket to the rate-limit headers of a response.
+
+        The refill rate follows the advertised ceiling: `limit` calls per
+        window, the window being the longest time to `resetAt` seen so far.
+        The calls still in flight are taken off `remaining`; running out of
+        calls pauses the bucket until the reset.
+
+        Args:
+            limit: `X-RateLimit-Limit`, the calls allowed per window.
+            remaining: `X-RateLimit-Remaining`, the calls left in the window.
+            resetAt: `X-RateLimit-Reset` as a unix timestamp.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.inFlight = max(0, self.inFlight - 1)
+            untilReset = resetAt - time.time() if resetAt else None
+            if limit:
+                self.capacity = float(limit)
+                if untilReset is not None and untilReset > 0:
+                    self.window = max(self.window, untilReset)
+                    self.rate = limit / self.window
+            if remaining is not None:
+                available = remaining - self.inFlight
+                self.tokens = min(self.tokens, float(available))
+                if available <= 0 and untilReset is not None:
+                    self.pause(max(0.0, untilReset), now)
+
+    def release(self):
+        """Forget a granted call that got no response (for example a connection error)."""
+        with self._lock:
+            self.inFlight = max(0, self.inFlight - 1)
+
+    def pause(self, seconds:float, now=None):
+        """Hold every acquire for `seconds` (for example after a 429)."""
+        now = time.monotonic() if now is None else now
+        self.pausedUntil = max(self.pausedUntil, now + seconds)
+        self.tokens = min(self.tokens, 0.0)
+
+
+class RateLimiter:
+    def __init__(self, limits=DEFAULT_LIMITS) -> None:
+        """Client-side scheduler with a token bucket per endpoint class.
+
+        Args:
+            limits: Tuples of `(name, methods, path pattern, requests, per seconds)`,
+            matched in order; `methods` None matches any method.
+        """
+        self.limits = [(name, methods, re.compile(pattern)) for name, methods, pattern, _, _ in limits]
+        self.buckets = {name: TokenBucket(requests, per) for name, _, _, requests, per in limits}
+
+    def classify(self, method:str, path:str):
+        """Get the endpoint class of a request.
+
+        Args:
+            method: The HTTP method.
+            path: The API path.
+
+        Returns:
+            The name of the endpoint class.
+        """
+        for name, methods, pattern in self.limits:
+            if (methods is None or method in methods) and pattern.search(path):
+                return name
+        return None
+
+    def acquire(self, method:str, path:str):
+        """Wait for a token of the request's endpoint class.
+
+        Returns:
+            The time (in seconds) spent waiting.
+        """
+        name = self.classify(method, path)
+        if name is None:
+            return 0.0
+        return self.buckets[name].acquire()
+
+    def observe(self, method:str, path:str, headers):
+        """Feed the `X-RateLimit-*` headers of a response back to its bucket."""
+        name = self.classify(method, path)
+        if name is None:
+            return
+        self.buckets[name].observe(
+            _intHeader(headers, "X-RateLimit-Limit"),
+            _intHeader(headers, "X-RateLimit-Remaining"),
+            _intHeader(headers, "X-RateLimit-Reset"),
+        )
+
+    def release(self, method:str, path:str):
+        """Tell the request's bucket that a granted call got no response."""
+        name = self.classify(method, path)
+        if name is not None:
+            self.buckets[name].release()
+
+    def pause(self, method:str, path:str, seconds:float):
+        name = self.classify(method, path)
+        if name is not None:
+            self.buckets[name].pause(seconds)
+
+
+def _intHeader(headers, name):
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def retryAfter(headers, default=None):
+    """Parse the `Retry-After` header (in seconds).
+
+    Returns:
+        The delay in seconds, or `default` if missing or invalid.
+    """
+    value = headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else default
+    except ValueError:
+        return default
@@ -0,0 +1,151 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from .metrics import endpointTemplate
+
+# A resource is everything up to its first ID, for example /linode/instances/123.
+_RESOURCE = re.compile(r"^(/images/[^/]+/[^/]+|/linode/kernels/[^/]+/[^/]+|.*?/\d+)(?=/|$)")
+
+
+def requestKey(endpoint:str, params=None, headers=None):
+    """Cache key of a GET request: its path, query parameters and `X-Filter`."""
+    if params:
+        params = tuple(sorted((str(k), str(v)) for k, v in (params.items() if hasattr(params, "items") else params)))
+    xFilter = headers.get("X-Filter") if headers else None
+    return (endpoint, params or (), xFilter)
+
+
+def resourceOf(endpoint:str):
+    """Get the resource a path belongs to.
+
+    Returns:
+        The path up to its first ID, for example `/linode/instances/123` for
+        `/linode/instances/123/disks/4/resize`, or the path itself if it has none.
+    """
+    match = _RESOURCE.match(endpoint)
+    return match.group(1) if match else endpoint
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        """Share one in-flight call between concurrent callers of the same key."""
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key, fn):
+        """Run `fn`, or wait for the identical call already running.
+
+        Returns:
+            The result of `fn` (the exception it raised is raised to every caller).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = [threading.Event(), None, None]
+            else:
+                self.shared += 1
+        if not leader:
+            call[0].wait()
+            if call[2] is not None:
+                raise call[2]
+            return call[1]
+        try:
+            call[1] = fn()
+            return call[1]
+        except BaseException as error:
+            call[2] = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call[0].set()
+
+
+class ReadCache:
+    def __init__(self, ttl=1.0, maxSize=1024, ttls=None) -> None:
+        """Short-lived LRU cache of GET responses.
+
+        Any write (POST/PUT/DELETE) sent through the transport drops the cached
+        reads of the same resource and of its parent collection, so updates,
+        deletes, resizes and reboots are never hidden by the cache.
+
+        Args:
+            ttl: Default seconds a response stays cached (0 disables the default).
+            maxSize: Maximum number of cached responses.
+            ttls: Dictionary of endpoint template (for example
+            `/linode/instances/{id}/disks`) to its own TTL.
+        """
+        self.ttl = ttl
+        self.maxSize = maxSize
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttlOf(self, endpoint:str):
+        return self.ttls.get(endpointTemplate(endpoint), self.ttl)
+
+    def get(self, key):
+        """Get a cached value.
+
+        Returns:
+            The value, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, generation=None):
+        """Cache a value.
+
+        Args:
+            key: The `requestKey`.
+            value: The value to cache.
+            generation: `generation` read before the value was fetched; the
+            value is dropped if a write invalidated the cache meanwhile.
+        """
+        ttl = self.ttlOf(key[0])
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxSize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint:str):
+        """Drop the cached reads affected by a write to `endpoint`.
+
+        Returns:
+            The number of dropped entries.
+        """
+        resource = resourceOf(endpoint)
+        collection = "/images" if resource.startswith("/images/") else resource.rsplit("/", 1)[0]
+        with self._lock:
+            self.generation += 1
+            stale = [key for key in self._entries if key[0] == collection or key[0] == resource or key[0].startswith(resource + "/")]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,342 @@
+import sys
+
+from .graph import InstanceGraph, iterInstanceGraphs, _fetchPart
+from .query import F
+
+# Keys of an instance spec holding sub-resources instead of instance fields.
+_CHILDREN = ("configs", "disks")
+# Fields compared as sets: their order carries no meaning.
+_UNORDERED = ("tags",)
+
+
+def _differs(current, desired, name=None):
+    if isinstance(desired, dict) and isinstance(current, dict):
+        return any(_differs(current.get(k), v, k) for k, v in desired.items())
+    if name in _UNORDERED and isinstance(desired, (list, tuple)) and isinstance(current, (list, tuple)):
+        return sorted(current) != sorted(desired)
+    if isinstance(desired, (list, tuple)) and isinstance(current, (list, tuple)):
+        return len(current) != len(desired) or any(_differs(c, d) for c, d in zip(current, desired))
+    return current != desired
+
+
+def _merge(current, desired):
+    """The value to send for a changed field: nested objects keep their other keys."""
+    if isinstance(desired, dict) and isinstance(current, dict):
+        return {**current, **{k: _merge(current.get(k), v) for k, v in desired.items()}}
+    return desired
+
+
+def diffFields(current:dict, desired:dict):
+    """Get the fields of `desired` that differ from `current`.
+
+    Only the fields present in `desired` are compared; nested objects are
+    compared key by key and `tags` regardless of order.
+
+    Returns:
+        A dictionary of the changed fields to the values to send.
+    """
+    return {k: _merge(current.get(k), v) for k, v in desired.items() if _differs(current.get(k), v, k)}
+
+
+class Step:
+    __slots__ = ("index", "linodeID", "action", "args", "fields", "description", "after", "afterSettled", "waitFor", "status", "result", "error")
+
+    def __init__(self, index, linodeID, action, args=(), fields=None, description="", after=(), waitFor=None, afterSettled=()) -> None:
+        """One mutation of a reconcile plan.
+
+        Args:
+            index: Position of the step in the plan.
+            linodeID: The linode the step changes.
+            action: Name of the `linodeClient` method to call.
+            args: Positional arguments after the linode ID.
+            fields: Keyword arguments (the changed fields).
+            description: Human readable summary.
+            after: Indexes of the steps that have to succeed first.
+            waitFor: `(kind, status)` or `(kind, status, fields)` to wait for
+            once the call returned, for example `("instance", "offline")` or
+            `("disk", "ready", {"size": 2048})` (optional).
+            afterSettled: Indexes of the steps that only have to be over,
+            succeeded or not (for compensating steps such as the boot after
+            a resize).
+        """
+        self.index = index
+        self.linodeID = linodeID
+        self.action = action
+        self.args = tuple(args)
+        self.fields = dict(fields or {})
+        self.description = description
+        self.after = tuple(after)
+        self.afterSettled = tuple(afterSettled)
+        self.waitFor = waitFor
+        self.status = "pending"
+        self.result = None
+        self.error = None
+
+    def __repr__(self):
+        return f"Step({self.index}, {self.description!r}, status={self.status!r})"
+
+
+class Plan:
+    def __init__(self) -> None:
+        """Ordered mutations turning the current state into the desired one.
+
+        Steps of different linodes are independent; within a linode, disk
+        resizes wait for the shutdown and the boot waits for every resize to
+        be over: it runs even if a resize failed, so the linode is not left
+        powered off.
+        """
+        self.steps = []
+
+    def add(self, linodeID, action, args=(), fields=None, description="", after=(), waitFor=None, afterSettled=()):
+        step = Step(len(self.steps), linodeID, action, args, fields, description, after, waitFor, afterSettled)
+        self.steps.append(step)
+        return step
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __iter__(self):
+        return iter(self.steps)
+
+    def failed(self):
+        """Get the steps that failed, for example a resize whose compensating boot still ran."""
+        return [step for step in self.steps if step.status == "failed"]
+
+    def describe(self):
+        """Render the plan, one step per line with its dependencies."""
+        if not self.steps:
+            return "Nothing to change."
+        lines = []
+        for step in self.steps:
+            after = [f"#{i}" for i in step.after] + [f"#{i} (succeeded or not)" for i in step.afterSettled]
+            after = f" (after {', '.join(after)})" if after else ""
+            status = f" [{step.status}]" if step.status != "pending" else ""
+            lines.append(f"#{step.index} linode {step.linodeID}: {step.description}{after}{status}")
+        return "\n".join(lines)
+
+    def execute(self, client, maxInFlight=8, timeout=600):
+        """Run the plan, starting every step as soon as the steps it depends on finished.
+
+        A failed step marks the steps depending on it `skipped`, except the
+        ones that only wait for it to settle; independent steps still run.
+
+        Args:
+            client: The `linodeClient`.
+            maxInFlight: Maximum number of concurrent steps.
+            timeout: Seconds to wait for a status a step waits for.
+
+        Returns:
+            True if every step succeeded.
+        """
+        from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+        def run(step):
+            step.result = getattr(client, step.action)(step.linodeID, *step.args, **step.fields)
+            if step.waitFor is not None:
+                kind, status, expect = (tuple(step.waitFor) + (None,))[:3]
+                if kind == "disk":
+                    client.waiter.waitForDisk(step.linodeID, step.args[0], status, timeout, expect=expect).result()
+                else:
+                    client.waiter.waitForInstance(step.linodeID, status, timeout, expect=expect).result()
+
+        waiting = [step for step in self.steps if step.status == "pending"]
+        running = {}
+        with ThreadPoolExecutor(max_workers=maxInFlight) as executor:
+            while waiting or running:
+                for step in list(waiting):
+                    states = [self.steps[i].status for i in step.after]
+                    settled = all(self.steps[i].status in ("done", "failed", "skipped") for i in step.afterSettled)
+                    if any(state in ("failed", "skipped") for state in states):
+                        step.status = "skipped"
+                        waiting.remove(step)
+                    elif all(state == "done" for state in states) and settled and len(running) < maxInFlight:
+                        step.status = "running"
+                        running[executor.submit(run, step)] = step
+                        waiting.remove(step)
+                if not running:
+                    if waiting:
+                        raise ValueError("The plan has a dependency cycle.")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        future.result()
+                        step.status = "done"
+                    except Exception as error:
+                        step.status = "failed"
+                        step.error = error
+        return all(step.status == "done" for step in self.steps)
+
+
+def _resolve(client, desired):
+    """Key the spec by linode ID, looking up the linodes given by label."""
+    labels = [key for key in desired if isinstance(key, str)]
+    resolved = {key: spec for key, spec in desired.items() if not isinstance(key, str)}
+    if labels:
+        found = {}
+        for start in range(0, len(labels), 100):
+            found.update((i["label"], i["id"]) for i in client.iterLinodes(pageSize=500, filter=F("label").isIn(labels[start:start + 100])))
+        missing = [label for label in labels if label not in found]
+        if missing:
+            raise ValueError(f"Linodes not found: {', '.join(missing)}.")
+        resolved.update({found[label]: desired[label] for label in labels})
+    return resolved
+
+
+def _plain(value):
+    """Dictionary of a model (graphs may come from `iterInstanceGraphs(asModel=True)`)."""
+    if isinstance(value, list):
+        return [_plain(i) for i in value]
+    return value.toDict() if hasattr(value, "toDict") else value
+
+
+def _match(children, key):
+    for child in children or ():
+        if child.get("id") == key or (isinstance(key, str) and child.get("label") == key):
+            return child
+    return None
+
+
+def _planLinode(plan, linodeID, spec, graph):
+    instance, configs, disks = _plain(graph.instance), _plain(graph.configs), _plain(graph.disks)
+    fields = diffFields(instance, {k: v for k, v in spec.items() if k not in _CHILDREN})
+    if fields:
+        plan.add(linodeID, "updateLinode", fields=fields, description=f"update {', '.join(sorted(fields))}")
+    for key, configSpec in (spec.get("configs") or {}).items():
+        config = _match(configs, key)
+        if config is None:
+            raise ValueError(f"Linode {linodeID} has no config {key!r}.")
+        fields = diffFields(config, configSpec)
+        if fields:
+            plan.add(linodeID, "updateConfig", (config["id"],), fields, f"update config {config['label']!r}: {', '.join(sorted(fields))}")
+    resizes = []
+    labels = []
+    for key, diskSpec in (spec.get("disks") or {}).items():
+        disk = _match(disks, key)
+        if disk is None:
+            raise ValueError(f"Linode {linodeID} has no disk {key!r}.")
+        if "size" in diskSpec and diskSpec["size"] != disk["size"]:
+            resizes.append((disk, diskSpec["size"]))
+        fields = diffFields(disk, {k: v for k, v in diskSpec.items() if k != "size"})
+        if fields:
+            labels.append((disk, fields))
+    resizeSteps = {}
+    if resizes:
+        running = instance.get("status") != "offline"
+        shutdown = plan.add(linodeID, "shutDownLinode", description="shut down", waitFor=("instance", "offline")) if running else None
+        for disk, size in resizes:
+            step = plan.add(linodeID, "resizeDisk", (disk["id"], size), description=f"resize disk {disk['label']!r} {disk['size']} -> {size} MB",
+                            after=(shutdown.index,) if shutdown else (), waitFor=("disk", "ready", {"size": size}))
+            resizeSteps[disk["id"]] = step.index
+        if running:
+            # Compensating: boot again even if a resize failed.
+            plan.add(linodeID, "bootLinode", description="boot", after=(shutdown.index,), waitFor=("instance", "running"),
+                     afterSettled=tuple(resizeSteps.values()))
+    for disk, fields in labels:
+        after = (resizeSteps[disk["id"]],) if disk["id"] in resizeSteps else ()
+        plan.add(linodeID, "updateDisk", (disk["id"],), fields, f"update disk {disk['label']!r}: {', '.join(sorted(fields))}", after)
+
+
+def _needed(spec):
+    return ("instance",) + tuple(part for part in _CHILDREN if spec.get(part))
+
+
+def _complete(client, desired, current, maxInFlight):
+    """Fetch the parts a spec needs that were left out of its given graph.
+
+    Returns:
+        `current` with the completed graphs replaced by filled-in copies.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    missing = [(linodeID, part) for linodeID, spec in desired.items() for part in _needed(spec)
+               if getattr(current[linodeID], part) is None and part not in current[linodeID].errors]
+    if not missing:
+        return current
+
+    def fetch(linodeID, part):
+        if part == "instance":
+            return client.findLinode(linodeID)
+        return _fetchPart(client, linodeID, part)
+
+    with ThreadPoolExecutor(max_workers=maxInFlight) as executor:
+        futures = {key: executor.submit(fetch, *key) for key in missing}
+    completed = {}
+    for (linodeID, part), future in futures.items():
+        graph = completed.get(linodeID)
+        if graph is None:
+            given = current[linodeID]
+            graph = completed[linodeID] = InstanceGraph(linodeID)
+            for name in InstanceGraph.__slots__:
+                setattr(graph, name, getattr(given, name))
+            graph.errors = dict(given.errors)
+        try:
+            setattr(graph, part, future.result())
+        except Exception as error:
+            graph.errors[part] = error
+    return {**current, **completed}
+
+
+def planReconcile(client, desired:dict, current=None, maxInFlight=16):
+    """Diff a desired state against the current one and plan the minimal mutations.
+
+    Args:
+        client: The `linodeClient`.
+        desired: Dictionary of linode ID (or label) to its spec: instance
+        fields (`label`, `tags`, `group`, `alerts`, `watchdog_enabled`, ...),
+        plus `configs` and `disks` dictionaries of config/disk ID (or label)
+        to their fields. A disk `size` is applied with a resize.
+        current: Dictionary of linode ID to an `InstanceGraph` to diff against,
+        for example from an earlier `fetchInstanceGraph` (optional, the linodes
+        and parts it lacks are fetched).
+        maxInFlight: Maximum number of concurrent reads.
+
+    Raises:
+        ValueError: If a linode, config or disk of the spec does not exist.
+
+    Returns:
+        The `Plan` (empty if everything already matches).
+    """
+    desired = _resolve(client, desired)
+    current = dict(current or {})
+    plan = Plan()
+    missing = [linodeID for linodeID in desired if linodeID not in current]
+    # Only read the sub-resources a linode's spec mentions.
+    groups = {}
+    for linodeID in missing:
+        groups.setdefault(tuple(part for part in _CHILDREN if desired[linodeID].get(part)), []).append(linodeID)
+    for include, linodeIDs in groups.items():
+        for graph in iterInstanceGraphs(client, linodeIDs, include, maxInFlight):
+            current[graph.linodeID] = graph
+    current = _complete(client, desired, current, maxInFlight)
+    for linodeID, spec in desired.items():
+        graph = current[linodeID]
+        for part in _needed(spec):
+            if part in graph.errors:
+                raise ValueError(f"Could not read the {part} of linode {linodeID}: {graph.errors[part]}")
+        _planLinode(plan, linodeID, spec, graph)
+    return plan
+
+
+def reconcile(client, desired:dict, dryRun=False, current=None, maxInFlight=8, timeout=600, out=None):
+    """Bring linodes to a desired state with the fewest API calls.
+
+    Args:
+        client: The `linodeClient`.
+        desired: The desired state (see `planReconcile`).
+        dryRun: Only print the plan.
+        current: Dictionary of linode ID to `InstanceGraph` to diff against (optional).
+        maxInFlight: Maximum number of concurrent steps (and of reads while planning).
+        timeout: Seconds to wait for a shutdown, resize or boot.
+        out: Stream the plan is printed to on a dry run (default stdout).
+
+    Returns:
+        The `Plan`, with the status of every step if it was executed.
+    """
+    plan = planReconcile(client, desired, current, maxInFlight)
+    if dryRun:
+        (out or sys.stdout).write(plan.describe() + "\n")
+        return plan
+    plan.execute(client, maxInFlight, timeout)
+    return plan
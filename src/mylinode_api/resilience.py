@@ -0,0 +1,338 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+from .errors import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+def _discard(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+_sending = threading.local()
+
+
+def sendingAttempt():
+    """Get the hedged first attempt the calling thread is sending (None outside `Hedger.run`)."""
+    return getattr(_sending, "attempt", None)
+
+
+class _Timers:
+    def __init__(self) -> None:
+        """One daemon thread firing the hedge deadlines of every request."""
+        self._heap = []
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def schedule(self, delay, fn):
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._order), fn))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mylinode-hedge-timer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    self._cond.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                if self._closed:
+                    return
+                fn = heapq.heappop(self._heap)[2]
+            try:
+                fn()
+            except Exception:
+                pass
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            self._cond.notify()
+
+
+class _Attempt:
+    __slots__ = ("hedger", "fn", "lock", "armed", "done", "accepting", "winner", "abandoned", "connection", "abort", "outstanding", "answered")
+
+    def __init__(self, hedger, fn) -> None:
+        """The first attempt of a hedged request, sent by the calling thread."""
+        self.hedger = hedger
+        self.fn = fn
+        self.lock = threading.Lock()
+        self.armed = False
+        self.done = False
+        self.accepting = True
+        self.winner = None
+        self.abandoned = False
+        self.connection = None
+        self.abort = None
+        self.outstanding = 0
+        self.answered = threading.Event()
+
+    def sent(self):
+        """Start the hedge timer; called by the transport as the request goes out."""
+        if not self.armed:
+            self.armed = True
+            self.hedger._timers.schedule(self.hedger.after, self._hedge)
+
+    def claim(self, connection, abort):
+        """Register the connection the request is in flight on, and how to
+        interrupt it if a duplicate answers first."""
+        with self.lock:
+            self.connection = connection
+            self.abort = abort
+
+    def release(self, connection=None):
+        """Forget the connection once its send returned, before it goes back
+        to the pool (None forgets whichever connection is claimed)."""
+        with self.lock:
+            if connection is None or connection is self.connection:
+                self.connection = None
+                self.abort = None
+
+    def _hedge(self):
+        hedger = self.hedger
+        with self.lock:
+            if self.done or self.outstanding >= hedger.maxHedges:
+                return
+        if not hedger._mayHedge():
+            return
+        with self.lock:
+            if self.done:
+                return
+            self.outstanding += 1
+            hedges = self.outstanding
+            future = hedger._submit(self.fn)
+        future.add_done_callback(self._settle)
+        if hedges < hedger.maxHedges:
+            hedger._timers.schedule(hedger.after, self._hedge)
+
+    def _settle(self, future):
+        ok = not future.cancelled() and future.exception() is None
+        with self.lock:
+            self.outstanding -= 1
+            take = ok and self.accepting and self.winner is None
+            if take:
+                self.winner = future.result()
+                if not self.done:
+                    self.abandoned = True
+                    # Under the lock: the connection cannot be released to
+                    # another request while it is being shut down.
+                    if self.abort is not None:
+                        self.abort()
+                        self.connection = self.abort = None
+            if self.winner is not None or self.outstanding == 0:
+                self.answered.set()
+        if ok and not take:
+            future.result().close()
+
+
+class Hedger:
+    def __init__(self, after=0.5, maxHedges=1, budget=0.1, maxWorkers=16) -> None:
+        """Send a duplicate of a slow idempotent request and take the first answer.
+
+        The first attempt is sent by the calling thread; only requests still
+        unanswered `after` seconds after they went out are duplicated, and at
+        most `budget` of all requests, so a degraded API does not get twice
+        the load. When a duplicate answers first, the connection of the first
+        attempt is shut down so the caller returns at once.
+
+        Args:
+            after: Seconds to wait for an answer before sending a duplicate.
+            maxHedges: Maximum duplicates of one request.
+            budget: Maximum share of requests that may be hedged (0 to 1).
+            maxWorkers: Threads sending the duplicates.
+        """
+        self.after = after
+        self.maxHedges = maxHedges
+        self.budget = budget
+        self.maxWorkers = maxWorkers
+        self.requests = 0
+        self.hedged = 0
+        self.wins = 0
+        self._executor = None
+        self._timers = _Timers()
+        self._lock = threading.Lock()
+
+    def _submit(self, fn):
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.maxWorkers, thread_name_prefix="mylinode-hedge")
+        return self._executor.submit(fn)
+
+    def _mayHedge(self):
+        with self._lock:
+            if self.hedged >= self.budget * self.requests + 1:
+                return False
+            self.hedged += 1
+            return True
+
+    def run(self, fn):
+        """Call `fn` on the calling thread, hedging it if it is slow.
+
+        `fn` has to call `sendingAttempt().sent()` as its request goes out,
+        which is what `Transport` does.
+
+        Returns:
+            The first response (the slower ones are closed as they finish).
+        """
+        with self._lock:
+            self.requests += 1
+        attempt = _Attempt(self, fn)
+        _sending.attempt = attempt
+        response = error = None
+        try:
+            response = fn()
+        except Exception as exc:
+            error = exc
+        finally:
+            _sending.attempt = None
+        with attempt.lock:
+            attempt.done = True
+            if error is None and attempt.winner is None:
+                attempt.accepting = False
+            waiting = error is not None and attempt.winner is None and attempt.outstanding > 0
+        if waiting:
+            # The first attempt failed: a duplicate still in flight may yet answer.
+            attempt.answered.wait()
+        with attempt.lock:
+            attempt.accepting = False
+            winner = attempt.winner
+        if winner is None:
+            if error is not None:
+                raise error
+            return response
+        if response is not None:
+            response.close()
+        with self._lock:
+            self.wins += 1
+        return winner
+
+    def snapshot(self):
+        return {"requests": self.requests, "hedged": self.hedged, "wins": self.wins}
+
+    def close(self):
+        self._timers.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+class _Circuit:
+    __slots__ = ("state", "failures", "openedAt", "probing")
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.openedAt = 0.0
+        self.probing = False
+
+
+class CircuitBreaker:
+    def __init__(self, failureThreshold=5, resetTimeout=30.0, fallback=True, maxFallbacks=1024) -> None:
+        """Per-endpoint circuit breaker of GET requests.
+
+        After `failureThreshold` consecutive 5xx answers or connection errors
+        (counted after the transport's own retries) the endpoint template's
+        circuit opens: GETs fail fast with `CircuitOpenError`, or are
+        answered with the last good response of the same request if
+        `fallback` is on. After `resetTimeout` seconds a single probe request
+        goes through; its success closes the circuit, its failure opens it again.
+
+        Args:
+            failureThreshold: Consecutive failures opening a circuit.
+            resetTimeout: Seconds a circuit stays open before it is probed.
+            fallback: Serve the last good response while open.
+            maxFallbacks: Maximum number of last good responses kept.
+        """
+        self.failureThreshold = failureThreshold
+        self.resetTimeout = resetTimeout
+        self.fallback = fallback
+        self.maxFallbacks = maxFallbacks
+        self.opened = 0
+        self.rejected = 0
+        self.fallbacks = 0
+        self._circuits = {}
+        self._lastGood = OrderedDict()
+        self._lock = threading.Lock()
+
+    def state(self, template:str):
+        """Get the state (`closed`, `open` or `half-open`) of an endpoint template."""
+        circuit = self._circuits.get(template)
+        return circuit.state if circuit is not None else CLOSED
+
+    def allow(self, template:str, key):
+        """Check the circuit before sending a request.
+
+        Args:
+            template: The endpoint template.
+            key: The `requestKey` of the request.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and there is no fallback.
+
+        Returns:
+            None to send the request, or the last good response to answer with.
+        """
+        with self._lock:
+            circuit = self._circuits.get(template)
+            if circuit is None or circuit.state == CLOSED:
+                return None
+            if circuit.state == OPEN and time.monotonic() - circuit.openedAt >= self.resetTimeout:
+                circuit.state = HALF_OPEN
+            if circuit.state == HALF_OPEN and not circuit.probing:
+                circuit.probing = True
+                return None
+            cached = self._lastGood.get(key) if self.fallback else None
+            if cached is not None:
+                self.fallbacks += 1
+                return cached
+            self.rejected += 1
+        raise CircuitOpenError([f"The circuit of {template} is open."], None)
+
+    def success(self, template:str, key, response=None):
+        """Record a good answer (and keep it as the fallback of its request)."""
+        with self._lock:
+            circuit = self._circuits.get(template)
+            if circuit is not None:
+                circuit.state = CLOSED
+                circuit.failures = 0
+                circuit.probing = False
+            if response is not None and self.fallback:
+                self._lastGood[key] = response
+                self._lastGood.move_to_end(key)
+                while len(self._lastGood) > self.maxFallbacks:
+                    self._lastGood.popitem(last=False)
+
+    def failure(self, template:str):
+        """Record a failed request, opening the circuit at the threshold."""
+        with self._lock:
+            circuit = self._circuits.get(template)
+            if circuit is None:
+                circuit = self._circuits[template] = _Circuit()
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or (circuit.state == CLOSED and circuit.failures >= self.failureThreshold):
+                circuit.state = OPEN
+                circuit.openedAt = time.monotonic()
+                circuit.probing = False
+                self.opened += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "fallbacks": self.fallbacks,
+                "open": sorted(template for template, circuit in self._circuits.items() if circuit.state != CLOSED),
+            }
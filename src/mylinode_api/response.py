@@ -0,0 +1,73 @@
+from .errors import errorForStatus
+
+_loads = None
+
+
+def jsonLoads():
+    """Get the JSON decoder, picking the backend on first use.
+
+    orjson is used when installed, the standard library otherwise; the import
+    is deferred so importing the package does not pay for it.
+
+    Returns:
+        The `loads` function of the backend.
+    """
+    global _loads
+    if _loads is None:
+        try:
+            import orjson
+            _loads = orjson.loads
+        except ImportError:
+            import json
+            _loads = json.loads
+    return _loads
+
+
+def requestID(headers):
+    """Get the request ID header of a response, if any."""
+    return headers.get("X-Request-Id")
+
+
+def handlePayload(status:int, payload, headers=None):
+    """Turn a decoded response into its result, or raise its error.
+
+    Args:
+        status: The HTTP status code.
+        payload: The decoded body.
+        headers: The response headers (optional).
+
+    Raises:
+        A `LinodeError` subclass matching the status, carrying every error reason.
+
+    Returns:
+        The decoded body.
+    """
+    errors = payload.get('errors') if isinstance(payload, dict) else None
+    if status >= 400 or errors:
+        errors = errors or []
+        reasons = [str(i.get('reason', i)) for i in errors]
+        raise errorForStatus(status)(reasons, status, requestID(headers or {}), errors)
+    return payload
+
+
+def decodeBody(content):
+    """Decode a response body once with the fastest available JSON backend.
+
+    Returns:
+        The decoded body, an empty dictionary for an empty body.
+    """
+    if not content:
+        return {}
+    try:
+        return (_loads or jsonLoads())(content)
+    except ValueError:
+        return {"errors": [{"reason": content[:200].decode("utf-8", "replace") if isinstance(content, bytes) else content[:200]}]}
+
+
+def handleResponse(response):
+    """Decode a `requests.Response` and return its result or raise its error.
+
+    Returns:
+        The decoded body (an empty dictionary for action endpoints).
+    """
+    return handlePayload(response.status_code, decodeBody(response.content), response.headers)
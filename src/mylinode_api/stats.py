@@ -0,0 +1,187 @@
+from .bulk import bulk
+
+
+def _importNumpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Vectorized statistics require numpy: pip install mylinode_api[stats]") from None
+    return numpy
+
+
+def _flatten(data, prefix=""):
+    for name, value in data.items():
+        key = prefix + name
+        if isinstance(value, dict):
+            yield from _flatten(value, key + ".")
+        elif isinstance(value, list):
+            yield key, value
+
+
+class StatsFrame:
+    __slots__ = ("timestamps", "columns")
+
+    def __init__(self, timestamps, columns) -> None:
+        """Timestamp-aligned statistics of one linode.
+
+        Args:
+            timestamps: int64 array of sample times (milliseconds).
+            columns: Dictionary of metric name to a float64 array aligned on
+            `timestamps` (NaN where a metric has no sample).
+        """
+        self.timestamps = timestamps
+        self.columns = columns
+
+    @classmethod
+    def fromPayload(cls, payload:dict):
+        """Decode a `/stats` response into arrays.
+
+        Nested series are flattened to dotted names, for example `cpu`,
+        `io.io`, `io.swap`, `netv4.in` and `netv6.private_out`.
+
+        Args:
+            payload: The json returned by `statisticsLinode`.
+
+        Returns:
+            A `StatsFrame`.
+        """
+        np = _importNumpy()
+        series = {}
+        for name, points in _flatten(payload.get('data', payload)):
+            array = np.asarray(points, dtype=np.float64).reshape(-1, 2) if points else np.empty((0, 2))
+            series[name] = array
+        if not series:
+            return cls(np.empty(0, dtype=np.int64), {})
+        arrays = list(series.values())
+        first = arrays[0][:, 0]
+        if all(a.shape[0] == first.shape[0] and np.array_equal(a[:, 0], first) for a in arrays[1:]):
+            return cls(first.astype(np.int64), {name: a[:, 1] for name, a in series.items()})
+        timestamps = np.unique(np.concatenate([a[:, 0] for a in arrays]))
+        columns = {}
+        for name, a in series.items():
+            column = np.full(timestamps.shape[0], np.nan)
+            column[np.searchsorted(timestamps, a[:, 0])] = a[:, 1]
+            columns[name] = column
+        return cls(timestamps.astype(np.int64), columns)
+
+    def __len__(self):
+        return self.timestamps.shape[0]
+
+    def __getitem__(self, metric):
+        return self.columns[metric]
+
+    def __repr__(self):
+        return f"StatsFrame({len(self)} samples, metrics={sorted(self.columns)})"
+
+
+class FleetStats:
+    def __init__(self, frames:dict, errors=None) -> None:
+        """Statistics of many linodes with vectorized aggregations.
+
+        Args:
+            frames: Dictionary of linode ID to `StatsFrame`.
+            errors: Dictionary of linode ID to the error its fetch raised.
+        """
+        self.frames = frames
+        self.errors = errors or {}
+
+    @classmethod
+    def fetch(cls, client, linodeIDs, maxInFlight=16):
+        """Fetch and decode the statistics of many linodes concurrently.
+
+        Args:
+            client: The `linodeClient`.
+            linodeIDs: Iterable of linode IDs.
+            maxInFlight: Maximum number of concurrent requests.
+
+        Returns:
+            A `FleetStats`.
+        """
+        frames, errors = {}, {}
+        for result in bulk(client.statisticsLinode, linodeIDs, maxInFlight):
+            if result.ok:
+                frames[result.linodeID] = StatsFrame.fromPayload(result.result)
+            else:
+                errors[result.linodeID] = result.error
+        return cls(frames, errors)
+
+    def matrix(self, metric:str):
+        """Stack one metric of every linode into a 2D array.
+
+        Returns:
+            A tuple of the linode IDs and a (linodes x samples) float64 array,
+            NaN padded where a linode has fewer samples.
+        """
+        np = _importNumpy()
+        ids = [i for i, frame in self.frames.items() if metric in frame.columns]
+        width = max((len(self.frames[i]) for i in ids), default=0)
+        matrix = np.full((len(ids), width), np.nan)
+        for row, linodeID in enumerate(ids):
+            column = self.frames[linodeID].columns[metric]
+            matrix[row, :column.shape[0]] = column
+        return np.asarray(ids), matrix
+
+    def perInstance(self, metric:str, percentiles=(50, 95, 99)):
+        """Per-linode mean, max and percentiles of a metric.
+
+        Args:
+            metric: The metric name, for example `cpu`.
+            percentiles: The percentiles to compute.
+
+        Returns:
+            A dictionary of arrays aligned on `ids`: `ids`, `mean`, `max` and `p<N>`.
+        """
+        np = _importNumpy()
+        ids, matrix = self.matrix(metric)
+        result = {"ids": ids}
+        if matrix.size == 0:
+            result.update(mean=np.empty(0), max=np.empty(0))
+            result.update({f"p{p}": np.empty(0) for p in percentiles})
+            return result
+        result["mean"] = np.nanmean(matrix, axis=1)
+        result["max"] = np.nanmax(matrix, axis=1)
+        if percentiles:
+            values = np.nanpercentile(matrix, percentiles, axis=1)
+            result.update({f"p{p}": values[i] for i, p in enumerate(percentiles)})
+        return result
+
+    def rollup(self, metric:str, percentiles=(50, 95, 99)):
+        """Fleet-wide aggregation of every sample of a metric.
+
+        Returns:
+            A dictionary with `instances`, `samples`, `mean`, `max` and `p<N>`.
+        """
+        np = _importNumpy()
+        _, matrix = self.matrix(metric)
+        values = matrix[~np.isnan(matrix)]
+        result = {"instances": matrix.shape[0], "samples": int(values.size)}
+        if values.size == 0:
+            return result
+        result["mean"] = float(values.mean())
+        result["max"] = float(values.max())
+        for p, value in zip(percentiles, np.percentile(values, percentiles)):
+            result[f"p{p}"] = float(value)
+        return result
+
+    def topN(self, metric:str, n=10, stat="mean"):
+        """Get the hottest linodes of a metric.
+
+        Args:
+            metric: The metric name.
+            n: Number of linodes to return (at most every linode, none if not positive).
+            stat: `mean`, `max` or `p<N>` of every linode to rank by.
+
+        Returns:
+            A list of `(linodeID, value)` tuples, highest first.
+        """
+        np = _importNumpy()
+        percentiles = (int(stat[1:]),) if stat.startswith("p") else ()
+        stats = self.perInstance(metric, percentiles)
+        ids, values = stats["ids"], stats[stat]
+        if n <= 0 or values.size == 0:
+            return []
+        values = np.where(np.isnan(values), -np.inf, values)
+        n = min(n, values.size)
+        top = np.argpartition(values, -n)[-n:]
+        top = top[np.argsort(values[top])[::-1]]
+        return [(ids[i].item(), float(values[i])) for i in top]
@@ -0,0 +1,218 @@
+import codecs
+import json
+
+from .pagination import MAX_PAGE_SIZE
+from .query import toQuery
+from .response import handleResponse
+
+STREAM_CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\n\r"
+_NUMBER = "0123456789+-.eE"
+_decoder = json.JSONDecoder()
+
+
+class JSONStream:
+    def __init__(self, chunks) -> None:
+        """Incremental parser of a JSON object arriving as chunks of bytes.
+
+        Only the part of the body being parsed is buffered: one record of the
+        streamed array plus at most one chunk, whatever the size of the body.
+        Top-level values that are not streamed are kept in `fields` (for
+        example `page`, `pages` and `results` of a list response).
+
+        Args:
+            chunks: Iterable of bytes, for example `response.iter_content(...)`.
+        """
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._started = False
+        self.fields = {}
+
+    def _fill(self):
+        if self._eof:
+            return False
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            text = self._decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._decode(b"", True)
+        self._eof = True
+        return False
+
+    def _peek(self):
+        """Skip whitespace and return the next character ("" at the end of the body)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars):
+        char = self._peek()
+        if char == "" or char not in chars:
+            raise ValueError(f"Malformed JSON: expected one of {chars!r}, got {char or 'end of body'!r}.")
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """Decode one complete JSON value, reading more chunks until it is whole."""
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            # A number running to the end of the buffer (even as a dangling
+            # `.`, `e` or sign the decoder stopped before) may continue in the next chunk.
+            if (isinstance(value, (int, float)) and not isinstance(value, bool) and not self._eof
+                    and all(char in _NUMBER for char in self._buffer[end:]) and self._fill()):
+                continue
+            self._pos = end
+            return value
+
+    def _members(self):
+        """Walk the members of the object at the cursor, yielding their keys.
+
+        The caller consumes the value of every yielded key.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def _elements(self, path, flatten):
+        """Yield every element of the array (or `(path, element)` of nested arrays) at the cursor."""
+        char = self._peek()
+        if char == "[":
+            self._pos += 1
+            if self._peek() == "]":
+                self._pos += 1
+                return
+            while True:
+                value = self._value()
+                yield (path, value) if flatten else value
+                if self._expect(",]") == "]":
+                    return
+        elif char == "{" and flatten:
+            for key in self._members():
+                yield from self._elements(f"{path}.{key}" if path else key, flatten)
+        else:
+            value = self._value()
+            if flatten:
+                yield (path, value)
+
+    def items(self, key="data"):
+        """Yield the elements of the top-level array `key` one at a time.
+
+        Yields:
+            Every element; the other top-level values end up in `fields`.
+        """
+        return self._stream(key, False)
+
+    def series(self, key="data"):
+        """Yield the points of every array nested under the top-level object `key`.
+
+        Suits `/stats` responses, whose `data` maps metric names (nested for
+        `io`, `netv4` and `netv6`) to lists of `[timestamp, value]` points.
+
+        Yields:
+            `(metric, point)` tuples, where `metric` is a dotted name such as `netv4.in`.
+        """
+        return self._stream(key, True)
+
+    def _stream(self, key, flatten):
+        if self._started:
+            raise ValueError("A JSON stream can only be read once.")
+        self._started = True
+        for name in self._members():
+            if name == key:
+                yield from self._elements("" if flatten else None, flatten)
+            else:
+                self.fields[name] = self._value()
+
+
+def streamResponse(response, key="data", series=False, chunkSize=STREAM_CHUNK_SIZE):
+    """Parse a response opened with `stream=True` incrementally.
+
+    Error responses are small, so they are read whole and raised as usual.
+
+    Args:
+        response: The streamed `requests.Response`.
+        key: The top-level key to stream.
+        series: Yield `(metric, point)` pairs of a nested object instead of array elements.
+        chunkSize: Bytes read from the socket at a time.
+
+    Raises:
+        A `LinodeError` subclass if the request failed.
+
+    Returns:
+        A tuple of the `JSONStream` (its `fields` fill in while it is read) and the generator.
+    """
+    if response.status_code >= 400:
+        try:
+            handleResponse(response)
+        finally:
+            response.close()
+    stream = JSONStream(response.iter_content(chunkSize))
+
+    def generate():
+        try:
+            yield from (stream.series(key) if series else stream.items(key))
+        finally:
+            response.close()
+
+    return stream, generate()
+
+
+def iterStreamedRecords(transport, path:str, pageSize=MAX_PAGE_SIZE, params=None, headers=None, query=None, chunkSize=STREAM_CHUNK_SIZE):
+    """Walk every record of a list endpoint, parsing each page as it arrives.
+
+    Unlike `iterRecords`, no page is ever held whole in memory: peak memory is
+    about one record plus one chunk. Pages are fetched one after another.
+
+    Args:
+        transport: The `Transport` to send the requests through.
+        path: The list endpoint, for example `/linode/instances`.
+        pageSize: Results per page (25 to 500).
+        params: Extra query parameters (optional).
+        headers: Extra headers (optional).
+        query: A `Query`, filter expression or raw `X-Filter` dictionary (optional).
+        chunkSize: Bytes read from the socket at a time.
+
+    Yields:
+        Every (matching) record of every page.
+    """
+    if not 25 <= pageSize <= MAX_PAGE_SIZE:
+        raise ValueError(f"Page size has to be between 25 and {MAX_PAGE_SIZE}.")
+    query = toQuery(query)
+    if query is not None:
+        headers = dict(headers or {}, **query.headers())
+    params = dict(params or {})
+
+    def records():
+        page = pages = 1
+        while page <= pages:
+            response = transport.get(path, params=dict(params, page=page, page_size=pageSize), headers=headers, stream=True)
+            stream, items = streamResponse(response, chunkSize=chunkSize)
+            yield from items
+            pages = stream.fields.get("pages", 1)
+            page += 1
+
+    yield from (query.apply(records()) if query is not None else records())
@@ -0,0 +1,327 @@
+import random
+import socket
+import time
+
+from .metrics import endpointTemplate
+from .ratelimit import RateLimiter, retryAfter
+from .readcache import SingleFlight, requestKey
+from .resilience import sendingAttempt
+
+BASE_URL = "https://api.linode.com/v4"
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+RETRY_STATUSES = frozenset((500, 502, 503, 504))
+
+
+def _shutdown(connection):
+    sock = getattr(connection, "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+def _abortable(poolClass):
+    """Subclass a urllib3 connection pool so a hedged first attempt can be interrupted.
+
+    The attempt only holds the connection between taking it from the pool
+    and putting it back, so a late abort never hits a connection another
+    request owns by then.
+    """
+    class Pool(poolClass):
+        def _get_conn(self, timeout=None):
+            connection = super()._get_conn(timeout=timeout)
+            hedged = sendingAttempt()
+            if hedged is not None:
+                hedged.claim(connection, lambda: _shutdown(connection))
+            return connection
+
+        def _put_conn(self, conn):
+            hedged = sendingAttempt()
+            if hedged is not None:
+                hedged.release(conn)
+            return super()._put_conn(conn)
+    return Pool
+
+
+class Transport:
+    def __init__(self, token=None, baseURL=BASE_URL, poolSize=10, timeout=30, rateLimiter=None, maxRetries=3, backoffBase=0.5, backoffCap=30, metrics=None, coalesce=False, readCache=None, hedger=None, breaker=None) -> None:
+        """Pooled HTTP transport shared by every client method.
+
+        A single keep-alive `requests.Session` is kept open so consecutive calls
+        reuse the TCP+TLS connection to the API instead of handshaking again.
+
+        Args:
+            token: Token from cloud manager, sent once as the session auth header.
+            baseURL: The API base URL that request paths are joined to.
+            poolSize: Number of keep-alive connections kept per host.
+            timeout: Default timeout (in seconds) of every request.
+            rateLimiter: The `RateLimiter` pacing requests; a default one is
+            created if None, pass False to disable client-side limiting.
+            maxRetries: Retries of a 429 (any method) or of a 5xx/connection
+            error (idempotent methods only).
+            backoffBase: First retry delay in seconds, doubled every attempt.
+            backoffCap: Maximum retry delay in seconds.
+            metrics: A `Metrics` recording every request (optional, None costs nothing).
+            coalesce: Let concurrent identical GETs share one in-flight request.
+            readCache: A `ReadCache` of GET responses, invalidated by writes (optional).
+            hedger: A `Hedger` duplicating slow GETs (optional).
+            breaker: A `CircuitBreaker` failing GETs fast while an endpoint is degraded (optional).
+        """
+        # requests is imported on first use so importing the package stays cheap.
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        self.baseURL = baseURL.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize)
+        adapter.poolmanager.pool_classes_by_scheme = {"http": _abortable(HTTPConnectionPool), "https": _abortable(HTTPSConnectionPool)}
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        if rateLimiter is None:
+            rateLimiter = RateLimiter()
+        self.rateLimiter = rateLimiter or None
+        self.maxRetries = maxRetries
+        self.backoffBase = backoffBase
+        self.backoffCap = backoffCap
+        self.metrics = metrics
+        self.singleFlight = SingleFlight() if coalesce else None
+        self.readCache = readCache
+        self.hedger = hedger
+        self.breaker = breaker
+
+    def url(self, path:str):
+        """Join a request path to the base URL.
+
+        Args:
+            path: The API path, for example `/linode/instances`.
+
+        Returns:
+            The absolute URL.
+        """
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return self.baseURL + "/" + path.lstrip("/")
+
+    def request(self, method:str, path:str, **kwargs):
+        """Send a request over the pooled session.
+
+        Args:
+            method: The HTTP method.
+            path: The API path (or an absolute URL).
+            kwargs: Passed on to `requests.Session.request`.
+
+        Returns:
+            The `requests.Response`.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        method = method.upper()
+        url = self.url(path)
+        endpoint = self.endpoint(url)
+        if method == "GET":
+            if (self.readCache is not None or self.singleFlight is not None) and not kwargs.get("stream"):
+                return self._cachedGet(url, endpoint, kwargs)
+            return self._get(url, endpoint, kwargs)
+        response = self._perform(method, url, endpoint, kwargs)
+        if self.readCache is not None:
+            self.readCache.invalidate(endpoint)
+        return response
+
+    def _cachedGet(self, url, endpoint, kwargs):
+        key = requestKey(endpoint, kwargs.get("params"), kwargs.get("headers"))
+        cache = self.readCache
+        generation = None
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            generation = cache.generation
+
+        def fetch():
+            response = self._get(url, endpoint, kwargs)
+            if cache is not None and response.status_code < 300:
+                cache.put(key, response, generation)
+            return response
+
+        if self.singleFlight is not None:
+            return self.singleFlight.do(key, fetch)
+        return fetch()
+
+    def _get(self, url, endpoint, kwargs):
+        if (self.hedger is None and self.breaker is None) or kwargs.get("stream"):
+            return self._perform("GET", url, endpoint, kwargs)
+        breaker = self.breaker
+        if breaker is not None:
+            template = endpointTemplate(endpoint)
+            key = requestKey(endpoint, kwargs.get("params"), kwargs.get("headers"))
+            fallback = breaker.allow(template, key)
+            if fallback is not None:
+                return fallback
+        try:
+            if self.hedger is not None:
+                response = self.hedger.run(lambda: self._perform("GET", url, endpoint, kwargs))
+            else:
+                response = self._perform("GET", url, endpoint, kwargs)
+        except Exception:
+            if breaker is not None:
+                breaker.failure(template)
+            raise
+        if breaker is not None:
+            if response.status_code >= 500:
+                breaker.failure(template)
+            else:
+                breaker.success(template, key, response if response.status_code < 300 else None)
+        return response
+
+    def _perform(self, method, url, endpoint, kwargs):
+        if self.metrics is None:
+            return self._send(method, url, endpoint, kwargs, None)
+        trace = [0, 0.0]
+        status = error = response = None
+        start = time.perf_counter()
+        try:
+            response = self._send(method, url, endpoint, kwargs, trace)
+            status = response.status_code
+            return response
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            self._record(method, endpoint, kwargs, response, status, error, time.perf_counter() - start, trace)
+
+    def _send(self, method, url, endpoint, kwargs, trace):
+        import requests
+
+        idempotent = method in IDEMPOTENT_METHODS
+        hedged = sendingAttempt()
+        attempt = 0
+        while True:
+            if hedged is not None and hedged.abandoned:
+                raise requests.ConnectionError("Abandoned: a hedged duplicate answered first.")
+            if self.rateLimiter is not None:
+                waited = self.rateLimiter.acquire(method, endpoint)
+                if trace is not None:
+                    trace[1] += waited
+            if hedged is not None:
+                hedged.sent()
+            try:
+                response = self._request(method, url, endpoint, kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if hedged is not None:
+                    hedged.release()
+                if not idempotent or attempt >= self.maxRetries or (hedged is not None and hedged.abandoned):
+                    raise
+                time.sleep(self.backoff(attempt))
+                attempt += 1
+                if trace is not None:
+                    trace[0] = attempt
+                continue
+            if hedged is not None:
+                hedged.release()
+            status = response.status_code
+            if attempt >= self.maxRetries or not (status == 429 or (idempotent and status in RETRY_STATUSES)):
+                return response
+            delay = retryAfter(response.headers, self.backoff(attempt))
+            if status == 429 and self.rateLimiter is not None:
+                self.rateLimiter.pause(method, endpoint, delay)
+            else:
+                time.sleep(delay)
+                if status == 429 and trace is not None:
+                    trace[1] += delay
+            response.close()
+            attempt += 1
+            if trace is not None:
+                trace[0] = attempt
+
+    def _request(self, method, url, endpoint, kwargs):
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except BaseException:
+            if self.rateLimiter is not None:
+                self.rateLimiter.release(method, endpoint)
+            raise
+        if self.rateLimiter is not None:
+            self.rateLimiter.observe(method, endpoint, response.headers)
+        return response
+
+    def _record(self, method, endpoint, kwargs, response, status, error, seconds, trace):
+        requestBytes = responseBytes = 0
+        if response is not None:
+            body = response.request.body if response.request is not None else None
+            if isinstance(body, (bytes, str)):
+                requestBytes = len(body)
+            if kwargs.get("stream"):
+                responseBytes = int(response.headers.get("Content-Length") or 0)
+            else:
+                responseBytes = len(response.content or b"")
+        self.metrics.record({
+            "method": method,
+            "endpoint": endpoint,
+            "template": endpointTemplate(endpoint),
+            "status": status,
+            "seconds": seconds,
+            "requestBytes": requestBytes,
+            "responseBytes": responseBytes,
+            "retries": trace[0],
+            "rateLimitedSeconds": trace[1],
+            "error": error,
+        })
+
+    def backoff(self, attempt:int):
+        """Jittered exponential backoff delay of a retry.
+
+        Args:
+            attempt: Number of retries already made.
+
+        Returns:
+            A random delay between 0 and `backoffBase * 2**attempt` (capped).
+        """
+        return random.uniform(0, min(self.backoffCap, self.backoffBase * (2 ** attempt)))
+
+    def endpoint(self, url:str):
+        """Get the API path of a URL, without query string."""
+        if url.startswith(self.baseURL):
+            url = url[len(self.baseURL):]
+        return url.split("?", 1)[0]
+
+    def get(self, path:str, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path:str, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path:str, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path:str, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        """Close every pooled connection."""
+        if self.hedger is not None:
+            self.hedger.close()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_publicTransport = None
+
+def publicTransport():
+    """Shared unauthenticated transport used by the module level helpers.
+
+    Returns:
+        The `Transport` instance.
+    """
+    global _publicTransport
+    if _publicTransport is None:
+        _publicTransport = Transport()
+    return _publicTransport
@@ -0,0 +1,242 @@
+import io
+import mmap
+import os
+import random
+import time
+import zlib
+
+from .errors import errorForStatus
+
+CHUNK_SIZE = 1 << 20
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _fileChunks(path, chunkSize):
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(0, size, chunkSize):
+                    yield bytes(view[start:start + chunkSize])
+            finally:
+                view.release()
+
+
+def _readerChunks(reader, chunkSize):
+    while True:
+        chunk = reader.read(chunkSize)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _bytesChunks(data, chunkSize):
+    view = memoryview(data)
+    for start in range(0, len(view), chunkSize):
+        yield bytes(view[start:start + chunkSize])
+
+
+class UploadSource:
+    def __init__(self, source, chunkSize=CHUNK_SIZE) -> None:
+        """A local file, bytes, readable file object or iterator of bytes to upload.
+
+        Paths are memory-mapped and read chunk by chunk, so memory stays
+        bounded to about one chunk whatever the image size.
+
+        Args:
+            source: Path, bytes, binary file object or iterable of bytes.
+            chunkSize: Bytes read per chunk.
+        """
+        self.source = source
+        self.chunkSize = chunkSize
+        self.size = None
+        self._start = None
+        if isinstance(source, (str, os.PathLike)):
+            self.size = os.path.getsize(source)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self.size = len(source)
+        elif hasattr(source, "seek") and hasattr(source, "tell"):
+            try:
+                position = source.tell()
+                self.size = source.seek(0, io.SEEK_END) - position
+                source.seek(position)
+                self._start = position
+            except (OSError, ValueError):
+                self.size = None
+                self._start = None
+        self._consumed = False
+
+    @property
+    def rewindable(self):
+        """Whether the source can be read again to retry an upload."""
+        if isinstance(self.source, (str, os.PathLike, bytes, bytearray, memoryview)):
+            return True
+        return self._start is not None
+
+    def chunks(self):
+        """Yields the source as chunks of bytes (from the start on every call if rewindable)."""
+        source = self.source
+        if isinstance(source, (str, os.PathLike)):
+            return _fileChunks(source, self.chunkSize)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return _bytesChunks(source, self.chunkSize)
+        if hasattr(source, "read"):
+            if self._start is not None:
+                source.seek(self._start)
+            elif self._consumed:
+                raise ValueError("The upload source can not be read twice.")
+            self._consumed = True
+            return _readerChunks(source, self.chunkSize)
+        if self._consumed:
+            raise ValueError("The upload source can not be read twice.")
+        self._consumed = True
+        return iter(source)
+
+
+def gzipChunks(chunks, level=6):
+    """Gzip a stream of chunks on the fly.
+
+    Yields:
+        The compressed chunks.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def peekChunks(chunks):
+    """Read the first non-empty chunk of a stream without losing it.
+
+    Returns:
+        A tuple of the first chunk (empty bytes for an empty stream) and an
+        iterator over the whole stream, that chunk included.
+    """
+    chunks = iter(chunks)
+    for first in chunks:
+        if first:
+            def rest():
+                yield first
+                yield from chunks
+            return first, rest()
+    return b"", iter(())
+
+
+def countedChunks(chunks, progress, total):
+    """Pass a stream of chunks through, reporting progress after each one.
+
+    Args:
+        chunks: Iterable of bytes.
+        progress: Called with `(bytesSent, total)` after every chunk.
+        total: Total size to report (None if unknown).
+
+    Yields:
+        The chunks, unchanged.
+    """
+    sent = 0
+    for chunk in chunks:
+        sent += len(chunk)
+        yield chunk
+        progress(sent, total)
+
+
+class _SizedStream:
+    """File-like view of a chunk generator with a known length, so requests
+    sends a Content-Length instead of chunked encoding."""
+
+    def __init__(self, chunks, length) -> None:
+        self._chunks = chunks
+        self._current = b""
+        self._offset = 0
+        self.len = length
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            rest = [self._current[self._offset:]]
+            rest.extend(self._chunks)
+            self._current, self._offset = b"", 0
+            return b"".join(rest)
+        pieces = []
+        while size > 0:
+            if self._offset >= len(self._current):
+                self._current = next(self._chunks, None)
+                self._offset = 0
+                if self._current is None:
+                    self._current = b""
+                    break
+            piece = self._current[self._offset:self._offset + size]
+            self._offset += len(piece)
+            size -= len(piece)
+            pieces.append(piece)
+        return b"".join(pieces)
+
+
+def uploadImageData(session, uploadTo:str, source, compress=None, level=6, chunkSize=CHUNK_SIZE, progress=None, retries=3, timeout=300):
+    """Stream an image to the `upload_to` URL returned by `/images/upload`.
+
+    The source is gzipped on the fly unless it already is gzip (or
+    `compress` is False). Already compressed sized sources are sent with a
+    Content-Length, on-the-fly compressed ones with chunked encoding. The
+    upload URL is pre-signed, so a failed PUT is retried from the start of a
+    rewindable source against the same URL; no new image is created.
+    Keep the URL to resume after the process itself failed.
+
+    Args:
+        session: The `requests.Session` to send with (its auth header is not sent).
+        uploadTo: The pre-signed upload URL.
+        source: Path, bytes, binary file object or iterable of bytes.
+        compress: Gzip the source (None detects it from the gzip magic bytes).
+        level: Gzip compression level.
+        chunkSize: Bytes read per chunk.
+        progress: Called with `(bytesRead, totalBytes)` of the source after every chunk (optional).
+        retries: Retries of a failed PUT (rewindable sources only).
+        timeout: Socket timeout in seconds.
+
+    Raises:
+        A `LinodeError` subclass if the upload URL rejects the image.
+
+    Returns:
+        The number of source bytes uploaded.
+    """
+    import requests
+
+    upload = source if isinstance(source, UploadSource) else UploadSource(source, chunkSize)
+    attempt = 0
+    while True:
+        head, chunks = peekChunks(upload.chunks())
+        gzip = compress if compress is not None else not head.startswith(GZIP_MAGIC)
+        sent = [0]
+
+        def track(done, total):
+            sent[0] = done
+            if progress is not None:
+                progress(done, total)
+
+        chunks = countedChunks(chunks, track, upload.size)
+        if gzip:
+            body = gzipChunks(chunks, level)
+        elif upload.size is not None:
+            body = _SizedStream(chunks, upload.size)
+        else:
+            body = chunks
+        try:
+            response = session.put(uploadTo, data=body, timeout=timeout, headers={
+                "Authorization": None,
+                "Content-Type": "application/octet-stream",
+            })
+            if response.status_code < 400:
+                return sent[0]
+            if response.status_code < 500:
+                raise errorForStatus(response.status_code)([response.text[:200] or "Upload rejected."], response.status_code)
+            error = errorForStatus(response.status_code)([response.text[:200] or "Upload failed."], response.status_code)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            error = exc
+        if attempt >= retries or not upload.rewindable:
+            raise error
+        attempt += 1
+        time.sleep(random.uniform(0, min(30, 2 ** attempt)))
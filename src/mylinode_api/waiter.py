@@ -0,0 +1,200 @@
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+from .errors import NotFoundError, RateLimitError, ServerError
+from .pagination import iterRecords, MAX_PAGE_SIZE
+
+# IDs per filtered list call, keeps the X-Filter header a sane size.
+FILTER_CHUNK = 100
+
+
+class _Target:
+    __slots__ = ("kind", "linodeID", "diskID", "status", "expect", "deadline", "future", "missing")
+
+    def __init__(self, kind, linodeID, diskID, status, expect, deadline, future) -> None:
+        self.kind = kind
+        self.linodeID = linodeID
+        self.diskID = diskID
+        self.status = status
+        self.expect = expect or {}
+        self.deadline = deadline
+        self.future = future
+        self.missing = 0
+
+
+class Waiter:
+    def __init__(self, client, minInterval=1.0, maxInterval=15.0, backoff=1.5, missingTicks=3) -> None:
+        """Multiplexed poller resolving many "reach status" targets at once.
+
+        Every tick, all pending instances are checked with one filtered list
+        call (per 100 IDs) and pending disks with one list call per linode,
+        instead of one polling loop per target. The tick interval starts at
+        `minInterval`, grows by `backoff` while nothing settles and drops back
+        as soon as a target settles or a new one is added.
+
+        Args:
+            client: The `linodeClient` to poll through.
+            minInterval: Shortest delay between ticks, in seconds.
+            maxInterval: Longest delay between ticks, in seconds.
+            backoff: Interval growth factor of an idle tick.
+            missingTicks: Fail a target whose resource is absent this many ticks in a row.
+        """
+        self.client = client
+        self.minInterval = minInterval
+        self.maxInterval = maxInterval
+        self.backoff = backoff
+        self.missingTicks = missingTicks
+        self.interval = minInterval
+        self.polls = 0
+        self._targets = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def waitForInstance(self, linodeID:int, status="running", timeout=None, callback=None, expect=None):
+        """Wait for a linode to reach a status.
+
+        Args:
+            linodeID: The ID of the linode.
+            status: The status to wait for, for example `running` or `offline`.
+            timeout: Seconds before the future fails with `TimeoutError` (optional).
+            callback: Called with the future once it settles (optional).
+            expect: Dictionary of other fields that have to match too, for
+            example `{"type": "g6-standard-2"}` after a resize (optional).
+
+        Returns:
+            A `concurrent.futures.Future` resolving to the linode json.
+        """
+        return self._add("instance", linodeID, None, status, timeout, callback, expect)
+
+    def waitForDisk(self, linodeID:int, diskID:int, status="ready", timeout=None, callback=None, expect=None):
+        """Wait for a disk to reach a status.
+
+        A disk still reads `ready` right after a resize was accepted, so pass
+        the new size as `expect={"size": size}` to wait for the resize itself.
+
+        Args:
+            linodeID: The ID of the linode the disk is in.
+            diskID: The ID of the disk.
+            status: The status to wait for, usually `ready`.
+            timeout: Seconds before the future fails with `TimeoutError` (optional).
+            callback: Called with the future once it settles (optional).
+            expect: Dictionary of other fields that have to match too (optional).
+
+        Returns:
+            A `concurrent.futures.Future` resolving to the disk json.
+        """
+        return self._add("disk", linodeID, diskID, status, timeout, callback, expect)
+
+    def _add(self, kind, linodeID, diskID, status, timeout, callback, expect=None):
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._lock:
+            self._targets.append(_Target(kind, linodeID, diskID, status, expect, deadline, future))
+            self.interval = self.minInterval
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="mylinode-waiter", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return future
+
+    def pending(self):
+        """Returns the number of targets still waiting."""
+        with self._lock:
+            return len(self._targets)
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            with self._lock:
+                if not self._targets:
+                    self._thread = None
+                    return
+            settled = self.tick()
+            with self._lock:
+                self.interval = self.minInterval if settled else min(self.maxInterval, self.interval * self.backoff)
+                interval = self.interval
+            self._wake.wait(interval)
+
+    def tick(self):
+        """Poll every pending target once.
+
+        Returns:
+            The number of targets that settled.
+        """
+        with self._lock:
+            targets = [i for i in self._targets if not i.future.done()]
+        settled = 0
+        instances = [i for i in targets if i.kind == "instance"]
+        ids = sorted({i.linodeID for i in instances})
+        for start in range(0, len(ids), FILTER_CHUNK):
+            chunk = ids[start:start + FILTER_CHUNK]
+            found = self._poll("/linode/instances", [{"id": i} for i in chunk])
+            if found is None:
+                continue
+            chunk = set(chunk)
+            settled += self._settle([i for i in instances if i.linodeID in chunk], found, lambda target: target.linodeID)
+        disks = {}
+        for target in targets:
+            if target.kind == "disk":
+                disks.setdefault(target.linodeID, []).append(target)
+        for linodeID, pending in disks.items():
+            found = self._poll(f"/linode/instances/{linodeID}/disks", [{"id": i} for i in sorted({t.diskID for t in pending})])
+            if found is None:
+                continue
+            settled += self._settle(pending, found, lambda target: target.diskID)
+        now = time.monotonic()
+        for target in targets:
+            if target.deadline is not None and now >= target.deadline and not target.future.done():
+                target.future.set_exception(TimeoutError(f"{target.kind} did not reach {target.status!r} in time."))
+                settled += 1
+        with self._lock:
+            self._targets = [i for i in self._targets if not i.future.done()]
+        return settled
+
+    def _poll(self, path, clauses):
+        """List the resources matching the clauses.
+
+        Returns:
+            A dictionary of ID to json, None after a transient error (polled
+            again next tick) or the exception of any other error.
+        """
+        import requests
+
+        self.polls += 1
+        query = clauses[0] if len(clauses) == 1 else {"+or": clauses}
+        try:
+            return {i['id']: i for i in iterRecords(self.client.transport, path, MAX_PAGE_SIZE, prefetch=False, headers={"X-Filter": json.dumps(query)})}
+        except NotFoundError:
+            return {}
+        except (ServerError, RateLimitError, requests.ConnectionError, requests.Timeout):
+            return None
+        except Exception as error:
+            return error
+
+    def _settle(self, targets, found, key):
+        settled = 0
+        for target in targets:
+            if target.future.done():
+                continue
+            if isinstance(found, Exception):
+                # A 400/401/403 (or a bug) will not go away by polling again.
+                target.future.set_exception(found)
+                settled += 1
+                continue
+            data = found.get(key(target))
+            if data is None:
+                target.missing += 1
+                if target.missing >= self.missingTicks:
+                    target.future.set_exception(NotFoundError([f"{target.kind} not found."], 404))
+                    settled += 1
+                continue
+            target.missing = 0
+            if data.get('status') == target.status and all(data.get(k) == v for k, v in target.expect.items()):
+                target.future.set_result(data)
+                settled += 1
+        return settled
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from mylinode_api import linodeClient  # noqa: E402
+from mylinode_api.mock import MockLinodeAPI  # noqa: E402
+
+
+@pytest.fixture
+def api():
+    """A fresh `MockLinodeAPI`."""
+    return MockLinodeAPI(seed=1)
+
+
+@pytest.fixture
+def client(api):
+    """A `linodeClient` routed through the `api` fixture in-process, without client-side rate limiting."""
+    client = linodeClient("token")
+    client.transport.rateLimiter = None
+    api.mount(client)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def served(api):
+    """The `api` fixture served over HTTP, as `(api, baseURL)`."""
+    server = api.serve()
+    yield api, server.url
+    server.shutdown()
@@ -0,0 +1,68 @@
+import asyncio
+import gzip
+import hashlib
+
+import pytest
+
+pytest.importorskip("aiohttp")
+from mylinode_api.aio import AsyncLinodeClient  # noqa: E402
+
+
+def test_concurrent_creates_fetch_each_catalog_once(served):
+    api, url = served
+
+    async def main():
+        async with AsyncLinodeClient("token", baseURL=url) as client:
+            await asyncio.gather(*(client.createLinode("us-east", "g6-nanode-1", "linode/debian12", "Secret-pass-123", label=f"n{i}") for i in range(50)))
+
+    asyncio.run(main())
+    assert api.requests == 53
+
+
+def test_invalidation_drops_a_catalog_fetch_in_flight(served):
+    api, url = served
+    api.latency = 0.2
+
+    async def main():
+        async with AsyncLinodeClient("token", baseURL=url) as client:
+            validation = asyncio.ensure_future(client.validateCatalog(image="linode/debian12"))
+            await asyncio.sleep(0.05)
+            api.images["private/42"] = api._image("private/42", False)
+            client._invalidateCatalog("images")
+            await validation
+            assert "images" not in client._catalogs
+            api.latency = 0
+            requests = api.requests
+            await client.validateCatalog(image="private/42")
+            assert api.requests == requests + 1
+            await client.validateCatalog(image="private/42")
+            assert api.requests == requests + 1
+
+    asyncio.run(main())
+
+
+def test_rate_limited_requests_wait_for_retry_after(served):
+    api, url = served
+    api.rateLimit = (5, 1)
+
+    async def main():
+        async with AsyncLinodeClient("token", baseURL=url) as client:
+            return await asyncio.gather(*(client.getKernels() for _ in range(8)))
+
+    assert len(asyncio.run(main())) == 8
+
+
+def test_upload_image_streams_and_retries_the_source(served):
+    api, url = served
+    api.failUploads = 1
+    data = gzip.compress(b"disk image " * 100000)
+
+    async def main():
+        async with AsyncLinodeClient("token", baseURL=url) as client:
+            return await client.uploadImage("img", "us-east", source=data)
+
+    upload = asyncio.run(main())
+    received = api.uploads[upload["image"]["id"]]
+    assert received["bytes"] == len(data)
+    assert received["sha256"] == hashlib.sha256(data).hexdigest()
+    assert received["gzip"]
@@ -0,0 +1,22 @@
+import importlib.util
+import os
+import tracemalloc
+
+_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "bench_client.py")
+_spec = importlib.util.spec_from_file_location("bench_client", _PATH)
+bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench)
+
+
+def test_calls_are_timed_without_tracemalloc():
+    traced = []
+    counter = iter(range(0, 100, 10))
+    result = bench.measure("probe", 3, lambda i: traced.append(tracemalloc.is_tracing()), counter=lambda: next(counter))
+    assert traced == [False] * 3 + [True] * 3
+    assert result["api_requests"] == 10
+    assert result["calls"] == 3 and result["calls_per_sec"] > 0
+
+
+def test_benchmark_runs_against_the_mock(capsys):
+    assert bench.main(["--instances", "30", "--calls", "10", "--bulk", "5", "--creates", "3", "--json"]) == 0
+    assert "createLinode" in capsys.readouterr().out
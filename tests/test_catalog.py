@@ -0,0 +1,73 @@
+import collections
+
+import pytest
+
+from mylinode_api import linodeClient
+
+NODE = {"region": "us-east", "type": "g6-nanode-1", "image": "linode/debian12", "root_pass": "secret"}
+
+
+@pytest.fixture
+def counted(api):
+    """Count the requests `api` answers by method and path."""
+    handle = api.handle
+    counts = collections.Counter()
+
+    def counting(method, path, headers=None, body=b""):
+        counts[method, path.split("?")[0].replace("/v4", "", 1)] += 1
+        return handle(method, path, headers, body)
+
+    api.handle = counting
+    return counts
+
+
+def _catalogFetches(counts):
+    return sum(counts["GET", path] for path in ("/regions", "/linode/types", "/images"))
+
+
+def test_batch_costs_one_fetch_per_catalog(client, counted):
+    for _ in range(20):
+        client.createLinode(**NODE)
+    assert counted["POST", "/linode/instances"] == 20
+    assert _catalogFetches(counted) == 3
+    assert isinstance(client.catalog.regions(), set)
+
+
+def test_expired_and_invalidated_catalogs_are_fetched_again(client, counted):
+    client.validateCatalog(**{k: NODE[k] for k in ("region", "type", "image")})
+    client.catalog.invalidate("regions")
+    client.validateCatalog(region="us-east")
+    assert counted["GET", "/regions"] == 2
+
+    fetched, ids = client.catalog._entries["types"]
+    client.catalog._entries["types"] = (fetched - client.catalog.ttl, ids)
+    client.validateCatalog(type="g6-nanode-1")
+    assert counted["GET", "/linode/types"] == 2
+    assert counted["GET", "/images"] == 1
+
+
+def test_miss_refreshes_once_before_failing(client, counted):
+    client.validateCatalog(region="us-east")
+    with pytest.raises(ValueError):
+        client.createLinode(**dict(NODE, region="mars-north"))
+    assert counted["GET", "/regions"] == 2
+    assert counted["POST", "/linode/instances"] == 0
+
+
+def test_new_private_image_is_picked_up_after_a_miss(api, client, counted):
+    client.validateCatalog(image="linode/debian12")
+    api.images["private/42"] = api._image("private/42", False)
+    client.validateCatalog(image="private/42")
+    assert counted["GET", "/images"] == 2
+
+
+def test_snapshot_starts_new_clients_warm(api, counted, tmp_path):
+    path = str(tmp_path / "cache" / "catalog.json")
+    for _ in range(2):
+        client = linodeClient("token", catalogSnapshot=path)
+        client.transport.rateLimiter = None
+        api.mount(client)
+        client.createLinode(**NODE)
+        client.close()
+    assert _catalogFetches(counted) == 3
+    assert counted["POST", "/linode/instances"] == 2
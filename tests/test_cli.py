@@ -0,0 +1,28 @@
+import json
+
+import mylinode_api
+from mylinode_api.cli import main
+
+
+def test_global_options_after_the_command(served, capsys):
+    api, url = served
+    api.addInstances(3, region="us-east")
+    api.addInstances(2, region="eu-west")
+    status = main(["list", "--filter", "region=us-east", "--format", "ndjson", "--token", "token", "--base-url", url, "--no-cache"])
+    lines = capsys.readouterr().out.splitlines()
+    assert status == 0
+    assert len(lines) == 3
+    assert all(json.loads(line)["region"] == "us-east" for line in lines)
+
+
+def test_global_options_before_the_command(served, capsys):
+    api, url = served
+    (linodeID,) = api.addInstances(1)
+    assert main(["--format", "ndjson", "--token", "token", "--base-url", url, "find", str(linodeID)]) == 0
+    assert json.loads(capsys.readouterr().out)["id"] == linodeID
+
+
+def test_all_lists_lazy_exports():
+    for name in ("AsyncLinodeClient", "Inventory", "StatsFrame", "FleetStats", "Waiter", "uploadImageData", "UploadSource", "linodeClient"):
+        assert name in mylinode_api.__all__
+    assert all(hasattr(mylinode_api, name) for name in mylinode_api.__all__ if name not in mylinode_api._LAZY)
@@ -0,0 +1,93 @@
+import collections
+import threading
+import time
+
+import pytest
+
+from mylinode_api.errors import NotFoundError, ServerError
+from mylinode_api.models import Config, Disk, Instance
+
+
+@pytest.fixture
+def tracked(api):
+    """Count the requests `api` answers by path kind and record the peak concurrency."""
+    handle = api.handle
+    lock = threading.Lock()
+    stats = {"inFlight": 0, "peak": 0, "paths": collections.Counter()}
+
+    def tracking(method, path, headers=None, body=b""):
+        with lock:
+            stats["inFlight"] += 1
+            stats["peak"] = max(stats["peak"], stats["inFlight"])
+            stats["paths"][path.split("?")[0].rstrip("/").split("/")[-1]] += 1
+        try:
+            time.sleep(0.01)
+            return handle(method, path, headers, body)
+        finally:
+            with lock:
+                stats["inFlight"] -= 1
+
+    api.handle = tracking
+    return stats
+
+
+def test_graphs_are_assembled_in_order(api, client, tracked):
+    ids = api.addInstances(5)
+    graphs = client.fetchInstanceGraph(reversed(ids))
+    assert list(graphs) == ids[::-1]
+    for linodeID, graph in graphs.items():
+        assert graph.ok, graph.errors
+        assert graph.instance == api.instances[linodeID]
+        assert [disk["id"] for disk in graph.disks] == list(api.disks[linodeID])
+        assert [config["id"] for config in graph.configs] == list(api.configs[linodeID])
+        assert graph.volumes == [] and graph.firewalls == []
+        assert graph.ips["ipv4"]["public"]
+        assert "automatic" in graph.backups
+    assert tracked["paths"]["instances"] == 1
+    assert sum(tracked["paths"].values()) == 1 + 5 * 6
+
+
+def test_requests_share_the_concurrency_budget(api, client, tracked):
+    ids = api.addInstances(20)
+    graphs = list(client.iterInstanceGraphs(ids, include=("disks", "configs"), maxInFlight=4))
+    assert sorted(graph.linodeID for graph in graphs) == ids
+    assert 1 < tracked["peak"] <= 4
+
+
+def test_instances_are_looked_up_in_batches(api, client, tracked):
+    ids = api.addInstances(250)
+    graphs = client.fetchInstanceGraph(ids, include=())
+    assert all(graph.instance["id"] == linodeID for linodeID, graph in graphs.items())
+    assert tracked["paths"]["instances"] == 3
+
+
+def test_failures_stay_with_their_graph(api, client):
+    ids = api.addInstances(2)
+    handle = api.handle
+
+    def failDisks(method, path, headers=None, body=b""):
+        if path.split("?")[0].endswith(f"/{ids[0]}/disks"):
+            return 500, {"Content-Type": "application/json"}, b'{"errors": [{"reason": "Internal server error"}]}'
+        return handle(method, path, headers, body)
+
+    api.handle = failDisks
+    client.transport.backoffBase = 0.001
+    graphs = client.fetchInstanceGraph([*ids, 999999], include=("disks", "configs"))
+    assert isinstance(graphs[ids[0]].errors["disks"], ServerError)
+    assert graphs[ids[0]].disks is None and graphs[ids[0]].configs is not None
+    assert graphs[ids[1]].ok
+    assert isinstance(graphs[999999].errors["instance"], NotFoundError)
+    assert graphs[999999].toDict()["errors"]["instance"] == "Not found"
+
+
+def test_models_and_validation(api, client):
+    (linodeID,) = api.addInstances(1)
+    graph = client.fetchInstanceGraph([linodeID], include=("disks", "configs"), asModel=True)[linodeID]
+    assert isinstance(graph.instance, Instance)
+    assert all(isinstance(disk, Disk) for disk in graph.disks)
+    assert all(isinstance(config, Config) for config in graph.configs)
+    assert graph.toDict()["disks"][0]["id"] == graph.disks[0].id
+    with pytest.raises(ValueError):
+        client.fetchInstanceGraph([linodeID], include=("disks", "nics"))
+    with pytest.raises(ValueError):
+        client.fetchInstanceGraph([linodeID], maxInFlight=0)
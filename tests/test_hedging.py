@@ -0,0 +1,87 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mylinode_api import linodeClient
+from mylinode_api.mock import MockLinodeAPI
+
+
+def _client(api, **kwargs):
+    client = linodeClient("token", poolSize=64, **kwargs)
+    client.transport.rateLimiter = None
+    api.mount(client)
+    return client
+
+
+def _concurrentGets(client, count):
+    start = time.monotonic()
+    with ThreadPoolExecutor(count) as executor:
+        for response in executor.map(lambda _: client.transport.get("/regions"), range(count)):
+            assert response.status_code == 200
+    return time.monotonic() - start
+
+
+def test_hedging_does_not_cap_concurrent_gets():
+    api = MockLinodeAPI(latency=0.2, seed=1)
+    with _client(api, hedgeAfter=5, hedgeWorkers=4) as client:
+        elapsed = _concurrentGets(client, 64)
+        assert client.resilience()["hedging"] == {"requests": 64, "hedged": 0, "wins": 0}
+    # 64 GETs of 0.2 s each, all sent by their own threads: about one round trip.
+    assert elapsed < 0.6
+
+
+def test_stalled_first_attempt_is_abandoned_for_the_duplicate():
+    api = MockLinodeAPI(seed=1)
+    handle, calls = api.handle, []
+
+    def stallFirst(*args, **kwargs):
+        calls.append(args[1])
+        if len(calls) == 1:
+            time.sleep(2)
+        return handle(*args, **kwargs)
+
+    api.handle = stallFirst
+    server = api.serve()
+    try:
+        with linodeClient("token", baseURL=server.url, hedgeAfter=0.1) as client:
+            client.transport.rateLimiter = None
+            start = time.monotonic()
+            assert client.transport.get("/regions").status_code == 200
+            elapsed = time.monotonic() - start
+            assert client.resilience()["hedging"] == {"requests": 1, "hedged": 1, "wins": 1}
+    finally:
+        server.shutdown()
+    assert elapsed < 1
+    assert len(calls) == 2
+
+
+def test_abandoning_the_first_attempt_spares_a_reused_connection():
+    api = MockLinodeAPI(seed=1)
+    handle, gets = api.handle, []
+
+    def answer(method, path, headers=None, body=b""):
+        if method == "GET" and path.startswith("/v4/regions"):
+            gets.append(path)
+            if len(gets) == 1:
+                return 503, {"Content-Type": "application/json"}, b'{"errors": [{"reason": "Busy"}]}'
+        if method == "POST":
+            time.sleep(0.5)
+        return handle(method, path, headers, body)
+
+    api.handle = answer
+    server = api.serve()
+    try:
+        with linodeClient("token", baseURL=server.url, poolSize=1, hedgeAfter=0.1) as client:
+            client.transport.rateLimiter = None
+            # The first attempt sleeps in its retry backoff while its connection is reused by the POST.
+            client.transport.backoff = lambda attempt: 1.0
+            with ThreadPoolExecutor(2) as executor:
+                get = executor.submit(client.transport.get, "/regions")
+                time.sleep(0.05)
+                post = executor.submit(client.transport.post, "/linode/instances", json={
+                    "region": "us-east", "type": "g6-nanode-1", "image": "linode/debian12", "root_pass": "Secret-pass-123", "label": "web1"})
+                assert get.result().status_code == 200
+                assert post.result().status_code == 200
+            assert client.resilience()["hedging"]["wins"] == 1
+    finally:
+        server.shutdown()
+    assert len(api.instances) == 1
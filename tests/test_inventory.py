@@ -0,0 +1,92 @@
+import hashlib
+import json
+
+import pytest
+
+from mylinode_api import Inventory
+
+
+@pytest.fixture
+def conditional(api):
+    """Give list responses an `ETag` and answer a matching `If-None-Match` with 304, recording every list request."""
+    handle = api.handle
+    sent = []
+
+    def respond(method, path, headers=None, body=b""):
+        status, responseHeaders, content = handle(method, path, headers, body)
+        if method != "GET" or not path.split("?")[0].endswith("/linode/instances") or status != 200:
+            return status, responseHeaders, content
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        etag = '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+        sent.append({"filter": json.loads(headers.get("x-filter", "null")), "ifNoneMatch": headers.get("if-none-match"), "status": 304 if headers.get("if-none-match") == etag else 200})
+        if sent[-1]["status"] == 304:
+            return 304, {"ETag": etag}, b""
+        return status, dict(responseHeaders, ETag=etag), content
+
+    api.handle = respond
+    return sent
+
+
+def test_unchanged_fleet_costs_one_conditional_request(api, client, conditional):
+    api.addInstances(3)
+    inventory = Inventory(client, fullRefreshEvery=0)
+    assert inventory.refresh() == 3
+    assert conditional[-1]["filter"] is None
+
+    assert inventory.refresh() == 0
+    assert conditional[-1]["filter"] == {"updated": {"+gte": inventory.lastUpdated}}
+    assert conditional[-1]["ifNoneMatch"] is None
+    assert conditional[-1]["status"] == 200
+
+    assert inventory.refresh() == 0
+    assert conditional[-1]["ifNoneMatch"] is not None
+    assert conditional[-1]["status"] == 304
+    assert len(inventory) == 3
+
+
+def test_updated_rows_are_merged(api, client, conditional):
+    ids = api.addInstances(3, tags=["web"])
+    inventory = Inventory(client, fullRefreshEvery=0)
+    inventory.refresh()
+    client.updateLinode(ids[0], label="renamed", tags=["db"])
+    (newID,) = api.addInstances(1, region="eu-west")
+
+    assert inventory.refresh() == 2
+    assert conditional[-1]["filter"] is not None
+    assert inventory.findByLabel("renamed").id == ids[0]
+    assert {i.id for i in inventory.filter(tag="web")} == set(ids[1:])
+    assert [i.id for i in inventory.filter(tag="db")] == [ids[0]]
+    assert newID in inventory
+    assert newID in {i.id for i in inventory.filter(region="eu-west")}
+    assert len(inventory) == 4
+
+
+def test_full_refresh_catches_deletions_and_status_only_changes(api, client, conditional):
+    ids = api.addInstances(3, status="running")
+    inventory = Inventory(client, fullRefreshEvery=3)
+    inventory.refresh()
+    del api.instances[ids[0]]
+    api.instances[ids[1]]["status"] = "offline"
+
+    inventory.refresh()
+    inventory.refresh()
+    assert ids[0] in inventory
+    assert inventory.get(ids[1]).status == "running"
+    assert all(request["filter"] is not None for request in conditional[1:])
+
+    assert inventory.refresh() == 2
+    assert conditional[-1]["filter"] is None
+    assert ids[0] not in inventory
+    assert inventory.get(ids[1]).status == "offline"
+    assert [i.id for i in inventory.filter(status="offline")] == [ids[1]]
+    assert {i.id for i in inventory.filter(status="running")} == {ids[2]}
+
+
+def test_forced_full_refresh(api, client, conditional):
+    ids = api.addInstances(2)
+    inventory = Inventory(client, fullRefreshEvery=0)
+    inventory.refresh()
+    del api.instances[ids[1]]
+    assert inventory.refresh(full=True) == 1
+    assert list(inventory.instances) == [ids[0]]
+    assert inventory.findByLabel(api.instances[ids[0]]["label"]).id == ids[0]
@@ -0,0 +1,21 @@
+import logging
+
+from mylinode_api import linodeClient, Metrics
+from mylinode_api.mock import MockLinodeAPI
+
+
+def test_failing_hook_does_not_replace_the_result(caplog):
+    def broken(event):
+        raise RuntimeError("backend down")
+
+    events = []
+    api = MockLinodeAPI(seed=1)
+    with linodeClient("token", metrics=Metrics(hooks=[broken, events.append])) as client:
+        api.mount(client)
+        with caplog.at_level(logging.ERROR, logger="mylinode_api.metrics"):
+            linode = client.createLinode("us-east", "g6-nanode-1", "linode/debian12", "Secret-pass-123", label="web1")
+    assert linode["label"] == "web1"
+    assert len(api.instances) == 1
+    assert events[-1]["method"] == "POST" and events[-1]["status"] == 200
+    assert "backend down" in caplog.text
+    assert client.metrics.snapshot()["POST /linode/instances"]["count"] == 1
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from mylinode_api import NotFoundError, ServerError
+
+
+def test_list_is_paginated(api, client):
+    api.addInstances(120)
+    first = client.transport.get("/linode/instances", params={"page": 1, "page_size": 50}).json()
+    assert (first["page"], first["pages"], first["results"], len(first["data"])) == (1, 3, 120, 50)
+    assert len(list(client.iterLinodes(pageSize=50))) == 120
+
+
+def test_x_filter_and_order(api, client):
+    api.addInstances(3, region="us-east")
+    api.addInstances(2, region="eu-west")
+    query = {"region": "us-east", "+order_by": "id", "+order": "desc"}
+    data = client.transport.get("/linode/instances", headers={"X-Filter": json.dumps(query)}).json()["data"]
+    assert [i["region"] for i in data] == ["us-east"] * 3
+    assert [i["id"] for i in data] == sorted((i["id"] for i in data), reverse=True)
+
+
+def test_rate_limit_headers_and_429(api, client):
+    api.rateLimit = (2, 60)
+    client.transport.maxRetries = 0
+    assert client.transport.get("/regions").headers["X-RateLimit-Remaining"] == "1"
+    client.transport.get("/regions")
+    response = client.transport.get("/regions")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_injected_errors_and_state(api, client):
+    client.transport.maxRetries = 0
+    api.failNext = 1
+    with pytest.raises(ServerError):
+        client.findLinode(1)
+    linode = client.createLinode("us-east", "g6-nanode-1", "linode/debian12", "Secret-pass-123", label="web1")
+    assert client.findLinode(linode["id"])["label"] == "web1"
+    client.deleteLinode(linode["id"])
+    with pytest.raises(NotFoundError):
+        client.findLinode(linode["id"])
@@ -0,0 +1,80 @@
+import copy
+import sys
+
+import pytest
+
+from mylinode_api.models import Backup, Config, Instance, Record, Specs
+
+
+def test_models_have_no_instance_dict(api, client):
+    instance = client.findLinode(*api.addInstances(1), asModel=True)
+    assert not hasattr(instance, "__dict__")
+    with pytest.raises(AttributeError):
+        instance.unknown = 1
+
+
+def test_nested_fields_decode_lazily(api, client):
+    (linodeID,) = api.addInstances(1, tags=["web", "prod"])
+    instance = client.findLinode(linodeID, asModel=True)
+    assert type(instance._specs) is dict
+    assert type(instance._tags) is list
+    assert isinstance(instance.specs, Specs)
+    assert instance.specs is instance.specs
+    assert instance.specs.memory == api.instances[linodeID]["specs"]["memory"]
+    assert instance.tags == ("web", "prod")
+    assert isinstance(instance.alerts, Record)
+    assert instance.alerts.cpu == api.instances[linodeID]["alerts"]["cpu"]
+
+
+def test_common_strings_are_interned(api, client):
+    api.addInstances(2, region="us-east")
+    first, second = client.getLinodes(asModel=True)
+    assert first.region is second.region
+    assert first.status is second.status
+
+
+def test_raw_payload_is_optional(api, client):
+    (linodeID,) = api.addInstances(1)
+    assert client.findLinode(linodeID, asModel=True).raw is None
+    kept = client.findLinode(linodeID, asModel=True, keepRaw=True)
+    assert kept.raw == api.instances[linodeID]
+    assert kept.toDict() is kept.raw
+
+
+def test_to_dict_rebuilds_the_json(api, client):
+    (linodeID,) = api.addInstances(1, tags=["a"])
+    data = copy.deepcopy(api.instances[linodeID])
+    rebuilt = Instance(data).toDict()
+    assert {key: rebuilt[key] for key in ("id", "label", "region", "status", "ipv4", "tags")} == {key: data[key] for key in ("id", "label", "region", "status", "ipv4", "tags")}
+    assert rebuilt["specs"] == {field: data["specs"].get(field) for field in Specs._fields}
+
+    config = Config({"id": 1, "label": "c", "devices": {"sda": {"disk_id": 2}}, "interfaces": [{"purpose": "public"}]})
+    assert config.devices.sda == {"disk_id": 2}
+    assert config.toDict()["interfaces"] == [{"purpose": "public"}]
+    assert Backup({"id": 1, "configs": ["c"], "disks": [{"label": "root"}]}).toDict()["disks"] == [{"label": "root"}]
+
+
+def test_dict_mode_is_kept(api, client):
+    ids = api.addInstances(3)
+    assert client.getLinodes() == ids
+    assert client.findLinode(ids[0]) == api.instances[ids[0]]
+    assert [i.id for i in client.getLinodes(asModel=True)] == ids
+
+
+def _footprint(value):
+    """Bytes of `value` and the containers it holds (strings and numbers are shared either way)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(_footprint(i) for i in value.values())
+    if isinstance(value, (list, tuple)):
+        return size + sum(_footprint(i) for i in value)
+    if hasattr(type(value), "__slots__"):
+        slots = {name for cls in type(value).__mro__ for name in getattr(cls, "__slots__", ())}
+        return size + sum(_footprint(getattr(value, name)) for name in slots)
+    return 0 if isinstance(value, (str, int, float, bool, type(None))) else size
+
+
+def test_models_are_smaller_than_the_json(api):
+    records = [api.instances[i] for i in api.addInstances(100)]
+    models = [Instance(i) for i in records]
+    assert sum(map(_footprint, models)) < sum(map(_footprint, records))
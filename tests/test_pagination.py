@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from mylinode_api.pagination import collect, iterPages
+
+
+class PagedTransport:
+    """Serve `pages` pages of `size` integers, recording the page of every request."""
+
+    def __init__(self, pages, size=25) -> None:
+        self.pages = pages
+        self.size = size
+        self.requested = []
+        self.fetched = threading.Condition()
+
+    def get(self, path, params=None, headers=None):
+        page = params["page"]
+        with self.fetched:
+            self.requested.append(page)
+            self.fetched.notify_all()
+        start = (page - 1) * self.size
+        return {"data": list(range(start, start + self.size)), "page": page, "pages": self.pages}
+
+    def waitFor(self, page):
+        with self.fetched:
+            return self.fetched.wait_for(lambda: page in self.requested, timeout=5)
+
+
+def test_walks_every_page(api, client):
+    ids = api.addInstances(260)
+    assert client.getLinodes() == ids
+    assert [i["id"] for i in client.iterLinodes(pageSize=25)] == ids
+    assert [i["id"] for i in client.iterLinodes(pageSize=25, prefetch=False)] == ids
+    assert [i["id"] for i in client.iterLinodes(pageSize=25, stream=True)] == ids
+
+
+def test_prefetches_one_page_ahead():
+    transport = PagedTransport(4)
+    pages = iterPages(transport, "/things", 25, handler=lambda response: response)
+    assert next(pages) == list(range(25))
+    assert transport.waitFor(2)
+    time.sleep(0.05)
+    assert transport.requested == [1, 2]
+    assert next(pages) == list(range(25, 50))
+    assert transport.waitFor(3)
+    assert [len(data) for data in pages] == [25, 25]
+    assert transport.requested == [1, 2, 3, 4]
+
+
+def test_without_prefetch_pages_are_fetched_on_demand():
+    transport = PagedTransport(3)
+    pages = iterPages(transport, "/things", 25, prefetch=False, handler=lambda response: response)
+    next(pages)
+    time.sleep(0.05)
+    assert transport.requested == [1]
+    assert sum(1 for _ in pages) == 2
+    assert transport.requested == [1, 2, 3]
+
+
+def test_collect_merges_every_page():
+    response = collect(PagedTransport(3, size=500), "/things", handler=lambda response: response)
+    assert response["data"] == list(range(1500))
+    assert (response["page"], response["pages"], response["results"]) == (1, 1, 1500)
+
+
+@pytest.mark.parametrize("pageSize", [24, 501])
+def test_page_size_is_bounded(pageSize):
+    with pytest.raises(ValueError):
+        next(iterPages(PagedTransport(1), "/things", pageSize))
@@ -0,0 +1,93 @@
+import sys
+import types
+
+import pytest
+import requests
+
+from mylinode_api.provision import idempotencyLabel
+
+SPECS = [
+    {"region": "us-east", "type": "g6-nanode-1", "image": "linode/debian12", "root_pass": "secret"},
+    {"region": "us-east", "type": "g6-nanode-1", "image": "linode/debian12", "root_pass": "secret"},
+    {"region": "eu-west", "type": "g6-standard-1", "image": "linode/arch", "root_pass": "other", "label": "named"},
+]
+
+
+def _creates(api):
+    """Wrap `api.handle` to record the create requests it answers."""
+    handle = api.handle
+    sent = []
+
+    def recording(method, path, headers=None, body=b""):
+        if method == "POST" and path.split("?")[0].endswith("/linode/instances"):
+            sent.append(body)
+        return handle(method, path, headers, body)
+
+    api.handle = recording
+    return sent
+
+
+def test_labels_are_deterministic_per_occurrence():
+    spec = SPECS[0]
+    assert idempotencyLabel(spec) == idempotencyLabel(dict(spec, root_pass="changed"))
+    assert idempotencyLabel(spec, occurrence=0) != idempotencyLabel(spec, occurrence=1)
+    assert len(idempotencyLabel(spec, prefix="x" * 100)) == 64
+
+
+def test_rerunning_a_batch_returns_the_existing_nodes(api, client):
+    first = client.provisionLinodes(SPECS)
+    assert [result.status for result in first] == ["created"] * 3
+    assert len({result.label for result in first}) == 3
+    assert first[2].label == "named"
+
+    sent = _creates(api)
+    second = client.provisionLinodes(SPECS)
+    assert [result.status for result in second] == ["existing"] * 3
+    assert [result.linodeID for result in second] == [result.linodeID for result in first]
+    assert sent == []
+    assert len(api.instances) == 3
+
+
+@pytest.mark.parametrize("failure", ["server error", "timeout"])
+def test_lost_create_response_is_looked_up_not_resent(api, client, failure):
+    handle = api.handle
+    sent = []
+
+    def createThenFail(method, path, headers=None, body=b""):
+        response = handle(method, path, headers, body)
+        if method == "POST" and path.split("?")[0].endswith("/linode/instances"):
+            sent.append(body)
+            if failure == "timeout":
+                raise requests.Timeout("Read timed out.")
+            return 500, {"Content-Type": "application/json"}, b'{"errors": [{"reason": "Internal server error"}]}'
+        return response
+
+    api.handle = createThenFail
+    (result,) = client.provisionLinodes(SPECS[:1])
+    assert result.ok
+    assert result.status == "created"
+    assert result.attempts == 1
+    assert len(sent) == 1
+    assert len(api.instances) == 1
+    assert result.linodeID in api.instances
+    assert api.instances[result.linodeID]["label"] == result.label
+
+
+def test_create_that_did_not_happen_is_retried(api, client, monkeypatch):
+    monkeypatch.setattr(sys.modules["mylinode_api.provision"], "time", types.SimpleNamespace(sleep=lambda seconds: None))
+    sent = _creates(api)
+    handle = api.handle
+    failures = [1]
+
+    def failOnce(method, path, headers=None, body=b""):
+        if method == "POST" and path.split("?")[0].endswith("/linode/instances") and failures:
+            failures.pop()
+            return 503, {"Content-Type": "application/json"}, b'{"errors": [{"reason": "Unavailable"}]}'
+        return handle(method, path, headers, body)
+
+    api.handle = failOnce
+    (result,) = client.provisionLinodes(SPECS[:1])
+    assert result.status == "created"
+    assert result.attempts == 2
+    assert len(sent) == 1
+    assert len(api.instances) == 1
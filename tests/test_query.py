@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from mylinode_api import F, Query, Where
+from mylinode_api.query import matchesFilter
+
+RECORDS = [
+    {"id": 1, "region": "us-east", "tags": ["prod"], "specs": {"vcpus": 1}},
+    {"id": 2, "region": "us-east", "tags": [], "specs": {"vcpus": 4}},
+    {"id": 3, "region": "eu-west", "tags": ["prod", "db"], "specs": {"vcpus": 8}},
+]
+
+
+def test_conditions_compile_to_x_filter():
+    query = Query((F("region") == "us-east") & (F("id") >= 2) & F("tags").contains("prod"), orderBy="id", order="desc")
+    assert query.toFilter() == {
+        "+and": [{"region": "us-east"}, {"id": {"+gte": 2}}, {"tags": {"+contains": "prod"}}],
+        "+order_by": "id",
+        "+order": "desc",
+    }
+    assert query.clientPredicate is None
+    assert json.loads(query.headers()["X-Filter"]) == query.toFilter()
+
+
+def test_or_and_is_in_compile():
+    assert Query((F("region") == "us-east") | (F("region") == "eu-west")).toFilter() == {"+or": [{"region": "us-east"}, {"region": "eu-west"}]}
+    assert Query(F("id").isIn([1])).toFilter() == {"id": 1}
+    assert Query(F("id").isIn([1, 3])).toFilter() == {"+or": [{"id": 1}, {"id": 3}]}
+
+
+def test_is_in_rejects_no_values():
+    with pytest.raises(ValueError):
+        F("id").isIn([])
+
+
+def test_unsupported_parts_fall_back_to_the_client():
+    query = Query((F("region") == "us-east") & (F("specs.vcpus") > 2))
+    assert query.toFilter() == {"region": "us-east"}
+    assert [i["id"] for i in query.apply(r for r in RECORDS if r["region"] == "us-east")] == [2]
+
+
+def test_or_with_a_client_side_part_is_client_side_entirely():
+    query = Query((F("region") == "eu-west") | Where(lambda record: record["id"] == 1))
+    assert query.toFilter() is None
+    assert [i["id"] for i in query.apply(RECORDS)] == [1, 3]
+
+
+def test_server_fields_restrict_what_is_sent():
+    query = Query((F("region") == "us-east") & (F("tags") != ["x"]), serverFields={"region"})
+    assert query.toFilter() == {"region": "us-east"}
+    assert [i["id"] for i in query.apply(RECORDS[:2])] == [1, 2]
+
+
+def test_matches_filter_operators():
+    assert matchesFilter(RECORDS[2], {"+or": [{"region": "us-east"}, {"tags": "db"}]})
+    assert not matchesFilter(RECORDS[0], {"id": {"+gt": 1}})
+    assert matchesFilter(RECORDS[0], {"region": {"+neq": "eu-west"}, "id": {"+lte": 1}})
+
+
+def test_client_sends_the_server_part_and_filters_the_rest(api, client):
+    api.addInstances(4, region="us-east", type="g6-nanode-1")
+    api.addInstances(2, region="us-east", type="g6-standard-4")
+    api.addInstances(3, region="eu-west", type="g6-standard-4")
+    handle, sent = api.handle, []
+
+    def record(method, path, headers=None, body=b""):
+        sent.append((headers or {}).get("X-Filter"))
+        return handle(method, path, headers, body)
+
+    api.handle = record
+    found = list(client.iterLinodes(pageSize=25, filter=(F("region") == "us-east") & (F("specs.vcpus") >= 4)))
+    assert len(found) == 2
+    assert all(i["region"] == "us-east" and i["specs"]["vcpus"] >= 4 for i in found)
+    assert {json.dumps(json.loads(i)) for i in sent} == {json.dumps({"region": "us-east"})}
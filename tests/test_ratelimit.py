@@ -0,0 +1,30 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mylinode_api import linodeClient
+from mylinode_api.mock import MockLinodeAPI
+from mylinode_api.ratelimit import TokenBucket
+
+
+def test_observe_derives_the_rate_from_limit_and_reset():
+    bucket = TokenBucket(1600, 60)
+    bucket.observe(limit=50, remaining=49, resetAt=time.time() + 5)
+    assert bucket.capacity == 50
+    assert 9 < bucket.rate <= 10.5
+
+
+def test_concurrent_calls_stay_under_the_advertised_limit():
+    api = MockLinodeAPI(rateLimit=(20, 2), seed=1)
+    handle, statuses = api.handle, []
+
+    def record(*args, **kwargs):
+        answer = handle(*args, **kwargs)
+        statuses.append(answer[0])
+        return answer
+
+    api.handle = record
+    client = linodeClient("token")
+    api.mount(client)
+    with client, ThreadPoolExecutor(16) as executor:
+        list(executor.map(lambda _: client.transport.get("/regions"), range(60)))
+    assert statuses.count(429) == 0
@@ -0,0 +1,147 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from mylinode_api import linodeClient, ReadCache, SingleFlight
+from mylinode_api.readcache import requestKey, resourceOf
+
+readcache = sys.modules["mylinode_api.readcache"]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(readcache, "time", clock)
+    return clock
+
+
+def key(path):
+    return requestKey(path)
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = ReadCache(ttl=1.0, ttls={"/linode/instances/{id}/stats": 60})
+    cache.put(key("/linode/instances/1"), "instance")
+    cache.put(key("/linode/instances/1/stats"), "stats")
+    clock.now += 0.5
+    assert cache.get(key("/linode/instances/1")) == "instance"
+    clock.now += 1.0
+    assert cache.get(key("/linode/instances/1")) is None
+    assert cache.get(key("/linode/instances/1/stats")) == "stats"
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_zero_ttl_is_not_cached(clock):
+    cache = ReadCache(ttl=0)
+    cache.put(key("/regions"), "regions")
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ReadCache(ttl=10, maxSize=2)
+    cache.put(key("/a/1"), 1)
+    cache.put(key("/a/2"), 2)
+    assert cache.get(key("/a/1")) == 1
+    cache.put(key("/a/3"), 3)
+    assert cache.get(key("/a/2")) is None
+    assert cache.get(key("/a/1")) == 1 and cache.get(key("/a/3")) == 3
+
+
+def test_write_drops_resource_sub_paths_and_collection(clock):
+    cache = ReadCache(ttl=10)
+    kept = ["/linode/instances/2", "/linode/instances/2/disks", "/regions"]
+    dropped = ["/linode/instances", "/linode/instances/1", "/linode/instances/1/disks", "/linode/instances/1/disks/5"]
+    for path in kept + dropped:
+        cache.put(key(path), path)
+    assert resourceOf("/linode/instances/1/disks/5/resize") == "/linode/instances/1"
+    assert cache.invalidate("/linode/instances/1/disks/5/resize") == len(dropped)
+    assert [cache.get(key(path)) for path in kept] == kept
+    assert all(cache.get(key(path)) is None for path in dropped)
+
+
+def test_filtered_and_paged_lists_are_distinct_keys_dropped_together(clock):
+    cache = ReadCache(ttl=10)
+    cache.put(requestKey("/linode/instances", {"page": 1}), "page1")
+    cache.put(requestKey("/linode/instances", {"page": 2}, {"X-Filter": '{"region": "us-east"}'}), "filtered")
+    assert cache.get(requestKey("/linode/instances", {"page": 2})) is None
+    cache.invalidate("/linode/instances")
+    assert len(cache) == 0
+
+
+def test_fill_started_before_a_write_is_dropped(clock):
+    cache = ReadCache(ttl=10)
+    generation = cache.generation
+    cache.invalidate("/linode/instances/1")
+    cache.put(key("/linode/instances/1"), "stale", generation)
+    assert cache.get(key("/linode/instances/1")) is None
+    cache.put(key("/linode/instances/1"), "fresh", cache.generation)
+    assert cache.get(key("/linode/instances/1")) == "fresh"
+
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    started, release, calls = threading.Event(), threading.Event(), []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "answer"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(5)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while flight.shared < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert calls == [1]
+    assert results == ["answer"] * 5
+    assert flight.do("k", lambda: "again") == "again"
+
+
+def test_single_flight_raises_the_error_to_every_caller():
+    flight = SingleFlight()
+    with pytest.raises(KeyError):
+        flight.do("k", lambda: {}["missing"])
+
+
+def test_client_serves_reads_from_cache_until_a_write(api, client):
+    client.transport.readCache = ReadCache(ttl=60)
+    (linodeID,) = api.addInstances(1, label="web1")
+    before = api.requests
+    assert client.findLinode(linodeID)["label"] == "web1"
+    assert client.findLinode(linodeID)["label"] == "web1"
+    assert api.requests - before == 1
+    client.updateLinode(linodeID, label="web2")
+    assert client.findLinode(linodeID)["label"] == "web2"
+
+
+def test_concurrent_identical_gets_are_coalesced(api):
+    api.latency = 0.2
+    client = linodeClient("token", coalesce=True)
+    client.transport.rateLimiter = None
+    api.mount(client)
+    with client:
+        before = api.requests
+        threads = [threading.Thread(target=client.transport.get, args=("/regions",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        assert api.requests - before == 1
+        assert client.transport.singleFlight.shared == 7
@@ -0,0 +1,76 @@
+import sys
+
+import pytest
+
+from mylinode_api import linodeClient
+from mylinode_api.mock import MockLinodeAPI
+
+
+@pytest.fixture
+def mocked():
+    api = MockLinodeAPI(seed=1)
+    client = linodeClient("token")
+    client.transport.rateLimiter = None
+    api.mount(client)
+    (linodeID,) = api.addInstances(1, status="offline", label="web1")
+    disk = client.createDisk(linodeID, 1000, label="root")
+    yield api, client, linodeID, disk
+    client.close()
+
+
+def test_model_graphs_are_diffed(mocked):
+    api, client, linodeID, disk = mocked
+    current = client.fetchInstanceGraph([linodeID], include=("disks",), asModel=True)
+    plan = client.planReconcile({linodeID: {"label": "web2", "disks": {"root": {"size": 2000}}}}, current=current)
+    assert [step.action for step in plan] == ["updateLinode", "resizeDisk"]
+
+
+def test_parts_missing_from_current_graphs_are_fetched(mocked):
+    api, client, linodeID, disk = mocked
+    current = client.fetchInstanceGraph([linodeID], include=())
+    plan = client.planReconcile({linodeID: {"disks": {"root": {"size": 2000, "label": "data"}}}}, current=current)
+    assert [step.action for step in plan] == ["resizeDisk", "updateDisk"]
+    assert current[linodeID].disks is None
+
+
+def test_resize_waits_for_the_new_size(mocked):
+    api, client, linodeID, disk = mocked
+    plan = client.planReconcile({linodeID: {"disks": {"root": {"size": 2000}}}})
+    (step,) = plan
+    assert step.waitFor == ("disk", "ready", {"size": 2000})
+    waiter = client.waiter
+    waiter.minInterval = waiter.interval = 0.01
+    future = waiter.waitForDisk(linodeID, disk["id"], "ready", timeout=5, expect={"size": 2000})
+    waiter.tick()
+    assert not future.done()
+    assert plan.execute(client, timeout=5)
+    assert future.result(5)["size"] == 2000
+
+
+def test_failed_resize_still_boots_the_linode(mocked):
+    api, client, linodeID, disk = mocked
+    client.bootLinode(linodeID)
+    handle = api.handle
+
+    def failResize(method, path, headers=None, body=b""):
+        if path.endswith("/resize"):
+            return 500, {"Content-Type": "application/json"}, b'{"errors": [{"reason": "Resize failed"}]}'
+        return handle(method, path, headers, body)
+
+    api.handle = failResize
+    client.transport.maxRetries = 0
+    client.waiter.minInterval = client.waiter.interval = 0.01
+    plan = client.reconcile({linodeID: {"disks": {"root": {"size": 2000}}}}, timeout=5)
+    assert [(step.action, step.status) for step in plan] == [("shutDownLinode", "done"), ("resizeDisk", "failed"), ("bootLinode", "done")]
+    assert plan.failed() == [plan.steps[1]]
+    assert client.findLinode(linodeID)["status"] == "running"
+
+
+def test_reconcile_passes_max_in_flight_to_planning(mocked, monkeypatch):
+    api, client, linodeID, disk = mocked
+    reconcile = sys.modules["mylinode_api.reconcile"]
+    seen = []
+    plan = reconcile.planReconcile
+    monkeypatch.setattr(reconcile, "planReconcile", lambda *args: seen.append(args[3]) or plan(*args))
+    client.reconcile({linodeID: {"label": "web1"}}, maxInFlight=2)
+    assert seen == [2]
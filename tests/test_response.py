@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+import requests
+
+from mylinode_api import handleRequestError
+from mylinode_api.errors import (
+    BadRequestError, ForbiddenError, LinodeError, NotFoundError, RateLimitError, ServerError, UnauthorizedError,
+)
+from mylinode_api.response import decodeBody, handlePayload
+
+
+class OnceResponse(requests.Response):
+    """A response that fails if its body is decoded through `json()`."""
+
+    def json(self, **kwargs):
+        raise AssertionError("The body was decoded through Response.json().")
+
+
+def _response(status, body, headers=None):
+    response = OnceResponse()
+    response.status_code = status
+    response._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.mark.parametrize("status, error", [
+    (400, BadRequestError), (401, UnauthorizedError), (403, ForbiddenError), (404, NotFoundError),
+    (429, RateLimitError), (500, ServerError), (503, ServerError), (409, LinodeError),
+])
+def test_status_picks_the_error_type(status, error):
+    with pytest.raises(error) as raised:
+        handleRequestError(_response(status, {"errors": [{"reason": "nope"}]}))
+    assert type(raised.value) is error
+    assert raised.value.status == status
+    assert isinstance(raised.value, ValueError)
+
+
+def test_error_keeps_every_reason_and_the_request_id():
+    body = {"errors": [{"reason": "label is taken", "field": "label"}, {"reason": "region is not valid", "field": "region"}, {"reason": "general"}]}
+    with pytest.raises(BadRequestError) as raised:
+        handleRequestError(_response(400, body, {"X-Request-Id": "abc123"}))
+    error = raised.value
+    assert error.reasons == ["label is taken", "region is not valid", "general"]
+    assert error.fields == ["label", "region", None]
+    assert error.requestID == "abc123"
+    assert error.errors == body["errors"]
+    assert str(error) == "label is taken; region is not valid; general"
+
+
+def test_status_alone_raises_without_an_errors_list():
+    with pytest.raises(ServerError) as raised:
+        handleRequestError(_response(502, b"<html>Bad Gateway</html>"))
+    assert raised.value.reasons == ["<html>Bad Gateway</html>"]
+    with pytest.raises(NotFoundError) as raised:
+        handleRequestError(_response(404, b""))
+    assert str(raised.value) == "HTTP 404"
+
+
+def test_success_bodies():
+    assert handleRequestError(_response(200, {"id": 1, "label": "web"})) == {"id": 1, "label": "web"}
+    assert handleRequestError(_response(200, b"")) == {}
+    with pytest.raises(LinodeError):
+        handlePayload(200, {"errors": [{"reason": "partial failure"}]})
+    assert decodeBody(b"[1, 2]") == [1, 2]
+
+
+def test_client_errors_come_from_the_api(api, client):
+    with pytest.raises(NotFoundError):
+        client.findLinode(999999)
+    api.addInstances(1, label="web")
+    with pytest.raises(BadRequestError) as raised:
+        client.createLinode("us-east", "g6-nanode-1", "linode/debian12", "secret", label="web")
+    assert raised.value.status == 400
+    assert raised.value.fields == ["label"]
+
+
+def test_json_backend_is_imported_on_first_decode(tmp_path):
+    (tmp_path / "orjson.py").write_text("import json\n\ndef loads(content):\n    return {'backend': 'orjson', **json.loads(content)}\n")
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    script = (
+        "import sys\n"
+        "import mylinode_api\n"
+        "from mylinode_api.response import decodeBody\n"
+        "print('orjson' in sys.modules)\n"
+        "print(decodeBody(b'{\"id\": 1}'))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], env=dict(os.environ, PYTHONPATH=os.pathsep.join([src, str(tmp_path)])), capture_output=True, text=True, check=True).stdout
+    assert output.splitlines() == ["False", "{'backend': 'orjson', 'id': 1}"]
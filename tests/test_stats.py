@@ -0,0 +1,35 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mylinode_api.stats import FleetStats, StatsFrame  # noqa: E402
+
+
+@pytest.fixture
+def fleet():
+    cpu = {1: [10.0, 20.0], 2: [50.0, 70.0], 3: [5.0, 5.0], 4: []}
+    frames = {linodeID: StatsFrame.fromPayload({"data": {"cpu": [[1000 * (i + 1), value] for i, value in enumerate(values)]}}) for linodeID, values in cpu.items()}
+    return FleetStats(frames)
+
+
+def test_top_n_ranks_highest_first(fleet):
+    assert fleet.topN("cpu", 2) == [(2, 60.0), (1, 15.0)]
+    assert fleet.topN("cpu", 1, stat="max") == [(2, 70.0)]
+
+
+@pytest.mark.parametrize("n", [0, -1])
+def test_top_n_without_rows(fleet, n):
+    assert fleet.topN("cpu", n) == []
+
+
+def test_top_n_is_clamped_to_the_fleet(fleet):
+    top = fleet.topN("cpu", 10)
+    assert [linodeID for linodeID, _ in top] == [2, 1, 3, 4]
+    assert top[-1][1] == -np.inf
+
+
+def test_frames_align_on_timestamps():
+    frame = StatsFrame.fromPayload({"data": {"cpu": [[1000, 1.0], [2000, 2.0]], "netv4": {"in": [[2000, 5.0]]}}})
+    assert frame.timestamps.tolist() == [1000, 2000]
+    assert frame["cpu"].tolist() == [1.0, 2.0]
+    assert np.isnan(frame["netv4.in"][0]) and frame["netv4.in"][1] == 5.0
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from mylinode_api.streaming import JSONStream
+
+BODY = (
+    '{"data": ['
+    '{"id": 123, "label": "web-1", "ipv4": ["192.0.2.1"], "specs": {"memory": 1024, "transfer": 1.5e3}}, '
+    '{"id": -7, "label": "café 日本 \U0001f600", "escaped": "quote \\" slash \\\\ tab \\t \\u00e9\\u20ac", "ratio": -0.25}, '
+    '{"id": 9, "on": true, "off": false, "nothing": null, "big": 12345678901234567890, "small": 6.02e-23}, '
+    '[], {}'
+    '], "page": 1, "pages": 1, "results": 5}'
+).encode()
+
+STATS = json.dumps({
+    "data": {"cpu": [[1700000000000, 0.5], [1700000300000, 12.25]], "netv4": {"in": [[1700000000000, 1e3]], "out": []}},
+    "title": "linode.com - web-1 (123) - day (5 min avg)",
+}).encode()
+
+
+def _split(body, *cuts):
+    bounds = [0, *cuts, len(body)]
+    return [body[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def test_every_single_split_parses_like_json():
+    expected = json.loads(BODY)
+    for cut in range(len(BODY) + 1):
+        stream = JSONStream(_split(BODY, cut))
+        assert list(stream.items()) == expected["data"], cut
+        assert stream.fields == {"page": 1, "pages": 1, "results": 5}
+
+
+def test_byte_at_a_time_parses_like_json():
+    stream = JSONStream(BODY[i:i + 1] for i in range(len(BODY)))
+    assert list(stream.items()) == json.loads(BODY)["data"]
+
+
+@pytest.mark.parametrize("token", [b"1.5e3", b"-0.25", b"6.02e-23", b"\\\"", b"\\u00e9", "\U0001f600".encode(), "日".encode()])
+def test_splits_inside_tokens(token):
+    start = BODY.index(token)
+    for offset in range(1, len(token)):
+        for size in (1, 2, 3):
+            assert list(JSONStream(_split(BODY, start + offset, start + offset + size)).items()) == json.loads(BODY)["data"]
+
+
+def test_bare_numbers_split_anywhere():
+    body = b'{"data": [1.5, -0.25, 2e3, 6.02E-23, 10, -4, 0]}'
+    for cut in range(len(body) + 1):
+        assert list(JSONStream(_split(body, cut)).items()) == [1.5, -0.25, 2000.0, 6.02e-23, 10, -4, 0], cut
+
+
+def test_series_flattens_nested_metrics():
+    for cut in range(len(STATS) + 1):
+        stream = JSONStream(_split(STATS, cut))
+        assert list(stream.series()) == [
+            ("cpu", [1700000000000, 0.5]),
+            ("cpu", [1700000300000, 12.25]),
+            ("netv4.in", [1700000000000, 1000.0]),
+        ]
+        assert stream.fields == {"title": "linode.com - web-1 (123) - day (5 min avg)"}
+
+
+def test_truncated_body_raises():
+    for end in range(len(BODY)):
+        with pytest.raises(ValueError):
+            list(JSONStream([BODY[:end]]).items())
+
+
+@pytest.mark.parametrize("body", [
+    b'{"data": [1 2]}',
+    b'{"data": [1,, 2]}',
+    b'{"data": [tru]}',
+    b'{"data": [{"id": 1}',
+    b'{"data" [1]}',
+    b'["data"]',
+    b'{"data": ["unterminated]}',
+    b'{"data": ["\xff"]}',
+])
+def test_invalid_body_raises(body):
+    with pytest.raises(ValueError):
+        list(JSONStream(_split(body, len(body) // 2)).items())
+
+
+def test_stream_reads_once():
+    stream = JSONStream([b'{"data": []}'])
+    assert list(stream.items()) == []
+    with pytest.raises(ValueError):
+        list(stream.items())
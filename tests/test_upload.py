@@ -0,0 +1,56 @@
+import gzip
+import hashlib
+import io
+
+import pytest
+
+from mylinode_api import linodeClient
+from mylinode_api.mock import MockLinodeAPI
+from mylinode_api.upload import countedChunks, peekChunks
+
+
+@pytest.fixture
+def mocked():
+    api = MockLinodeAPI(seed=1)
+    client = linodeClient("token")
+    api.mount(client)
+    yield api, client
+    client.close()
+
+
+def _uploaded(api, upload):
+    return api.uploads[upload["image"]["id"]]
+
+
+def test_upload_sized_gzip_file_object_through_mount(mocked):
+    api, client = mocked
+    data = gzip.compress(b"disk image " * 50000)
+    upload = client.uploadImage("img2", "us-east", source=io.BytesIO(data))
+    received = _uploaded(api, upload)
+    assert received["bytes"] == len(data)
+    assert received["sha256"] == hashlib.sha256(data).hexdigest()
+    assert received["gzip"]
+
+
+def test_upload_uncompressed_bytes_through_mount(mocked):
+    api, client = mocked
+    data = b"\x00raw" * 100000
+    upload = client.uploadImage("img3", "us-east", source=data, compress=False)
+    received = _uploaded(api, upload)
+    assert received["bytes"] == len(data)
+    assert received["sha256"] == hashlib.sha256(data).hexdigest()
+    assert not received["gzip"]
+
+
+def test_peek_keeps_the_first_chunk():
+    head, chunks = peekChunks(iter([b"", b"ab", b"cd"]))
+    assert head == b"ab"
+    assert list(chunks) == [b"ab", b"cd"]
+    head, chunks = peekChunks([])
+    assert head == b"" and list(chunks) == []
+
+
+def test_counted_reports_progress_per_chunk():
+    reports = []
+    assert list(countedChunks([b"ab", b"cde"], lambda sent, total: reports.append((sent, total)), 5)) == [b"ab", b"cde"]
+    assert reports == [(2, 5), (5, 5)]
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from mylinode_api import linodeClient, ForbiddenError
+from mylinode_api.mock import MockLinodeAPI
+
+
+@pytest.fixture
+def mocked():
+    api = MockLinodeAPI(seed=1)
+    client = linodeClient("token")
+    client.transport.rateLimiter = None
+    client.transport.maxRetries = 0
+    api.mount(client)
+    yield api, client
+    client.close()
+
+
+def _answer(api, status, failures):
+    handle = api.handle
+
+    def answer(method, path, headers=None, body=b""):
+        if path.startswith("/linode/instances?") and failures:
+            failures.pop()
+            return status, {"Content-Type": "application/json"}, json.dumps({"errors": [{"reason": "Nope"}]}).encode()
+        return handle(method, path, headers, body)
+
+    api.handle = answer
+
+
+def test_permanent_error_fails_the_targets(mocked):
+    api, client = mocked
+    ids = api.addInstances(2, status="offline")
+    _answer(api, 403, [1])
+    waiter = client.waiter
+    waiter.minInterval = waiter.interval = 0.01
+    futures = [waiter.waitForInstance(i, "running", timeout=5) for i in ids]
+    for future in futures:
+        with pytest.raises(ForbiddenError):
+            future.result(5)
+
+
+def test_transient_errors_keep_polling(mocked):
+    api, client = mocked
+    (linodeID,) = api.addInstances(1, status="running")
+    _answer(api, 503, [1, 1])
+    waiter = client.waiter
+    waiter.minInterval = waiter.interval = 0.01
+    assert waiter.waitForInstance(linodeID, "running", timeout=5).result(5)["id"] == linodeID